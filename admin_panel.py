@@ -0,0 +1,35 @@
+"""Hidden admin sidebar panel: per-stage timings of recent reruns and trace export.
+
+Rendered only when the page is opened with ?admin=1 or the server runs
+with POSITIVE_PAY_ADMIN=1, so analysts never see it.
+"""
+import streamlit as st
+
+from config import ADMIN_PANEL
+
+
+def admin_enabled():
+    return ADMIN_PANEL or st.query_params.get("admin") == "1"
+
+
+def render(instrumentation, last=50):
+    if not admin_enabled():
+        return
+    with st.sidebar.expander("🩺 Instrumentation"):
+        traces = instrumentation.traces()
+        if not traces:
+            st.caption("No reruns traced yet.")
+            return
+        summary = instrumentation.summary()
+        st.caption(f"{len(traces)} traced runs · p95 of the slowest stage: {summary['P95'].max() * 1000:.1f} ms")
+        st.dataframe(
+            summary.style.format({"Mean": "{:.4f}", "P50": "{:.4f}", "P95": "{:.4f}", "Max": "{:.4f}", "Rows/s": "{:,.0f}"}),
+            hide_index=True,
+        )
+        st.caption("Recent stages (newest first)")
+        st.dataframe(instrumentation.history(last), hide_index=True)
+        c1, c2 = st.columns(2)
+        c1.download_button("JSON", instrumentation.to_json(), "traces.json", mime="application/json")
+        c2.download_button("Prometheus", instrumentation.to_prometheus(), "metrics.prom", mime="text/plain")
+        if st.button("Clear traces"):
+            instrumentation.clear()
@@ -1,18 +1,24 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
+
+import admin_panel
+import sample_data
+import services
+from money import format_cents, to_cents
 
 st.set_page_config(page_title="Fraud Control Center", layout="wide")
 
-# --- INITIALIZE SESSION STATE ---
-if 'ach_rules' not in st.session_state:
-    st.session_state.ach_rules = pd.DataFrame([
-        {"Vendor": "AWS Cloud", "Company ID": "98765", "Max Amount": 1500.00},
-        {"Vendor": "Verizon", "Company ID": "54321", "Max Amount": 250.00}
-    ])
+# Stores and the compiled ACH rules are built once per process (see services.py).
+instrumentation = services.get_instrumentation()
+instrumentation.start_trace("Fraud Control Center")
+
+decision_store = services.get_decision_store()
+analyst = st.sidebar.text_input("Analyst", value="analyst")
 
-if 'decisions' not in st.session_state:
-    st.session_state.decisions = {}
+# The decision store is shared with the other apps; this demo only reads and resets its own items.
+DEMO_ITEMS = ([f"check_{check}" for check in sample_data.checks("presented")["Check #"]]
+              + [f"ach_{company}" for company in sample_data.incoming_ach()["ID"]])
+decisions = decision_store.decisions(DEMO_ITEMS)
 
 st.title("🛡️ Fraud Control Center")
 
@@ -27,17 +33,13 @@ with tab1:
     # --- MAIN PAGE SAMPLE DOWNLOAD ---
     with st.expander("🚀 New to the Demo? Start here", expanded=True):
         st.write("To simulate a business workflow, download our sample check register and then upload it below.")
-        
-        sample_data = pd.DataFrame([
-            {"Check #": "5001", "Amount": 1000.00, "Payee": "Office Depot"},
-            {"Check #": "5002", "Amount": 50.00, "Payee": "Local Cafe"},
-        ])
-        
+
         st.download_button(
             label="📥 Download Sample Check Register (CSV)",
-            data=sample_data.to_csv(index=False),
+            data=sample_data.csv_text("register"),
             file_name="daily_checks_template.csv",
-            mime="text/csv"
+            mime="text/csv",
+            on_click="ignore",
         )
     
     st.divider()
@@ -45,50 +47,50 @@ with tab1:
     # --- UPLOAD SECTION ---
     uploaded_file = st.file_uploader("Step 2: Upload your Register to compare against Bank activity", type="csv")
 
-    # Stubbed data representing checks presented at the bank
-    presented_checks = [
-        {"Check #": "5001", "Amount": 1000.00, "Payee": "Office Depot"}, # Match
-        {"Check #": "5002", "Amount": 500.00, "Payee": "Local Cafe"},    # Amount mismatch
-        {"Check #": "5003", "Amount": 2400.00, "Payee": "Unknown LLC"}   # Not in register
-    ]
-
     if uploaded_file:
-        issued = pd.read_csv(uploaded_file)
-        issued['Check #'] = issued['Check #'].astype(str)
+        with instrumentation.stage("read register") as stage:
+            issued = pd.read_csv(uploaded_file)
+            issued['Check #'] = issued['Check #'].astype(str)
+            issued['Amount Cents'] = to_cents(issued['Amount'])
+            stage.rows = len(issued)
+        # Stubbed data representing checks presented at the bank
+        presented = sample_data.checks("presented").copy()
+        presented['Amount Cents'] = to_cents(presented['Amount'])
         
         st.subheader("🚩 Detected Exceptions")
         
-        for p in presented_checks:
-            match = issued[issued['Check #'] == p['Check #']]
+        with instrumentation.stage("match checks", rows=len(presented)):
+            for p in presented.to_dict("records"):
+                match = issued[issued['Check #'] == p['Check #']]
             
-            reason = None
-            if match.empty:
-                reason = "Item not in Issue File (Possible Forgery)"
-            elif float(match.iloc[0]['Amount']) != float(p['Amount']):
-                reason = f"Amount Mismatch (Issued: ${match.iloc[0]['Amount']})"
-            elif match.iloc[0]['Payee'].lower() != p['Payee'].lower():
-                reason = f"Payee Mismatch (Issued: {match.iloc[0]['Payee']})"
-
-            if reason:
-                item_id = f"check_{p['Check #']}"
-                with st.container(border=True):
-                    c1, c2, c3 = st.columns([2, 2, 1])
-                    with c1:
-                        st.error(f"**Check #{p['Check #']}**")
-                        st.caption(f"Error: {reason}")
-                    with c2:
-                        st.write(f"**Payee:** {p['Payee']}")
-                        st.write(f"**Presented Amount:** ${p['Amount']}")
-                    with c3:
-                        if item_id not in st.session_state.decisions:
-                            if st.button("✅ Pay", key=f"pay_{item_id}"):
-                                st.session_state.decisions[item_id] = "PAID"
-                                st.rerun()
-                            if st.button("🚫 Return", key=f"ret_{item_id}"):
-                                st.session_state.decisions[item_id] = "RETURNED"
-                                st.rerun()
-                        else:
-                            st.info(f"Status: {st.session_state.decisions[item_id]}")
+                reason = None
+                if match.empty:
+                    reason = "Item not in Issue File (Possible Forgery)"
+                elif match.iloc[0]['Amount Cents'] != p['Amount Cents']:
+                    reason = f"Amount Mismatch (Issued: {format_cents(match.iloc[0]['Amount Cents'])})"
+                elif match.iloc[0]['Payee'].lower() != p['Payee'].lower():
+                    reason = f"Payee Mismatch (Issued: {match.iloc[0]['Payee']})"
+
+                if reason:
+                    item_id = f"check_{p['Check #']}"
+                    with st.container(border=True):
+                        c1, c2, c3 = st.columns([2, 2, 1])
+                        with c1:
+                            st.error(f"**Check #{p['Check #']}**")
+                            st.caption(f"Error: {reason}")
+                        with c2:
+                            st.write(f"**Payee:** {p['Payee']}")
+                            st.write(f"**Presented Amount:** {format_cents(p['Amount Cents'])}")
+                        with c3:
+                            if item_id not in decisions:
+                                if st.button("✅ Pay", key=f"pay_{item_id}"):
+                                    decision_store.record(item_id, "PAID", analyst)
+                                    st.rerun()
+                                if st.button("🚫 Return", key=f"ret_{item_id}"):
+                                    decision_store.record(item_id, "RETURNED", analyst)
+                                    st.rerun()
+                            else:
+                                st.info(f"Status: {decisions[item_id]}")
     else:
         st.info("Use the download button above to get a file, then upload it here.")
 
@@ -98,52 +100,49 @@ with tab1:
 with tab2:
     st.header("ACH Debit Review")
     
-    incoming_ach = [
-        {"Vendor": "Verizon", "ID": "54321", "Amount": 280.00},
-        {"Vendor": "Suspicious Inc", "ID": "99999", "Amount": 500.00}
-    ]
+    incoming_ach = sample_data.incoming_ach()
 
-    for ach in incoming_ach:
-        rule = st.session_state.ach_rules[st.session_state.ach_rules['Company ID'] == ach['ID']]
-        
-        ach_reason = None
-        if rule.empty:
-            ach_reason = "Unauthorized Vendor"
-        elif ach['Amount'] > rule.iloc[0]['Max Amount']:
-            ach_reason = f"Exceeds Limit (${rule.iloc[0]['Max Amount']})"
-
-        if ach_reason:
-            item_id = f"ach_{ach['ID']}"
-            with st.container(border=True):
-                col_a, col_b, col_c = st.columns([2, 2, 1])
-                with col_a:
-                    st.warning(f"**ACH: {ach['Vendor']}**")
-                    st.caption(f"ID: {ach['ID']}")
-                with col_b:
-                    st.write(f"**Amount:** ${ach['Amount']}")
-                    st.write(f"**Flag:** {ach_reason}")
-                with col_c:
-                    if item_id not in st.session_state.decisions:
-                        if st.button("✅ Accept", key=f"acc_{item_id}"):
-                            st.session_state.decisions[item_id] = "ACCEPTED"
-                            st.rerun()
-                        if st.button("🚫 Reject", key=f"rej_{item_id}"):
-                            st.session_state.decisions[item_id] = "REJECTED"
-                            st.rerun()
-                    else:
-                        st.info(f"Status: {st.session_state.decisions[item_id]}")
+    ach_engine = services.get_ach_engine()
+    with instrumentation.stage("ACH rules", rows=len(incoming_ach)):
+        ach_exceptions = ach_engine.evaluate(incoming_ach)
+    st.caption(f"{len(ach_engine)} compiled rules · {ach_engine.items_evaluated} debits screened · "
+               f"{ach_engine.throughput():,.0f} debits/sec")
+
+    for _, ach in ach_exceptions.iterrows():
+        item_id = f"ach_{ach['ID']}"
+        with st.container(border=True):
+            col_a, col_b, col_c = st.columns([2, 2, 1])
+            with col_a:
+                st.warning(f"**ACH: {ach['Vendor']}**")
+                st.caption(f"ID: {ach['ID']}")
+            with col_b:
+                st.write(f"**Amount:** {format_cents(ach['Amount Cents'])}")
+                st.write(f"**Flag:** {ach['Reason']}")
+            with col_c:
+                if item_id not in decisions:
+                    if st.button("✅ Accept", key=f"acc_{item_id}"):
+                        decision_store.record(item_id, "ACCEPTED", analyst)
+                        st.rerun()
+                    if st.button("🚫 Reject", key=f"rej_{item_id}"):
+                        decision_store.record(item_id, "REJECTED", analyst)
+                        st.rerun()
+                else:
+                    st.info(f"Status: {decisions[item_id]}")
 
 # ---------------------------------------------------------
 # AUDIT LOG & RESET
 # ---------------------------------------------------------
 st.divider()
-if st.session_state.decisions:
-    st.subheader("📜 Session Audit Log")
-    history = [{"Time": datetime.now().strftime("%H:%M"), "Item": k, "Decision": v} 
-               for k, v in st.session_state.decisions.items()]
-    st.table(history)
-    
-    if st.button("🔄 Clear All Decisions & Reset Demo"):
-        st.session_state.decisions = {}
+if len(decisions):
+    st.subheader("📜 Decision Audit Log")
+    st.table(decision_store.audit_log(item_ids=DEMO_ITEMS))
+
+    # Only the demo's own decisions are reset; the audit log keeps them.
+    if st.button("🔄 Clear Demo Decisions & Reset Demo"):
+        decision_store.forget(DEMO_ITEMS)
         st.rerun()
-        
\ No newline at end of file
+        
+
+# --- ADMIN: INSTRUMENTATION (hidden unless ?admin=1) ---
+instrumentation.finish_trace()
+admin_panel.render(instrumentation)
@@ -2,15 +2,13 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 
+import sample_data
+import services
+from money import format_cents
+
 st.set_page_config(page_title="Fraud Control Center", layout="wide")
 
 # --- INITIALIZE SESSION STATE ---
-if 'ach_rules' not in st.session_state:
-    st.session_state.ach_rules = pd.DataFrame([
-        {"Vendor": "AWS Cloud", "Company ID": "98765", "Max Amount": 1500.00},
-        {"Vendor": "Verizon", "Company ID": "54321", "Max Amount": 250.00}
-    ])
-
 if 'decisions' not in st.session_state:
     st.session_state.decisions = {}
 
@@ -21,32 +19,22 @@ tab1, tab2 = st.tabs(["Check Positive Pay", "ACH Debit Filter"])
 with tab1:
     st.header("Sample Data")
     
-    with st.expander("Check Customer Sample File", expanded=False):        
-        sample_data = pd.DataFrame([
-            {"Check #": "5001", "Amount": 1000.00, "Payee": "Office Depot"},
-            {"Check #": "5002", "Amount": 50.00, "Payee": "Local Cafe"},
-            {"Check #": "5003", "Amount": 5010.00, "Payee": "Local Restaurant"},
-        ])
-        
+    with st.expander("Check Customer Sample File", expanded=False):
         st.download_button(
             label="Download Customer Check Register (CSV)",
-            data=sample_data.to_csv(index=False),
+            data=sample_data.csv_text("customer"),
             file_name="customer_checks.csv",
-            mime="text/csv"
+            mime="text/csv",
+            on_click="ignore",
         )
     
     with st.expander("Check Bank Sample File", expanded=False):
-        sample_data = pd.DataFrame([
-            {"Check #": "5001", "Amount": 1000.00, "Payee": "Office Depot"}, # Match
-            {"Check #": "5002", "Amount": 500.00, "Payee": "Local Cafe"},    # Amount mismatch
-            {"Check #": "5003", "Amount": 2400.00, "Payee": "Unknown LLC"}   # Not in register
-        ])
-        
         st.download_button(
             label="Download Bank Check Presenter (CSV)",
-            data=sample_data.to_csv(index=False),
+            data=sample_data.csv_text("presented"),
             file_name="bank_checks.csv",
-            mime="text/csv"
+            mime="text/csv",
+            on_click="ignore",
         )
     st.divider()
 
@@ -110,40 +98,29 @@ with tab1:
 with tab2:
     st.header("ACH Debit Review")
     
-    incoming_ach = [
-        {"Vendor": "Verizon", "ID": "54321", "Amount": 280.00},
-        {"Vendor": "Suspicious Inc", "ID": "99999", "Amount": 500.00}
-    ]
-
-    for ach in incoming_ach:
-        rule = st.session_state.ach_rules[st.session_state.ach_rules['Company ID'] == ach['ID']]
-        
-        ach_reason = None
-        if rule.empty:
-            ach_reason = "Unauthorized Vendor"
-        elif ach['Amount'] > rule.iloc[0]['Max Amount']:
-            ach_reason = f"Exceeds Limit (${rule.iloc[0]['Max Amount']})"
+    # Compiled Company ID index and int64 cents limits, shared with the other apps (see services.py).
+    ach_exceptions = services.get_ach_engine().evaluate(sample_data.incoming_ach())
 
-        if ach_reason:
-            item_id = f"ach_{ach['ID']}"
-            with st.container(border=True):
-                col_a, col_b, col_c = st.columns([2, 2, 1])
-                with col_a:
-                    st.warning(f"**ACH: {ach['Vendor']}**")
-                    st.caption(f"ID: {ach['ID']}")
-                with col_b:
-                    st.write(f"**Amount:** ${ach['Amount']}")
-                    st.write(f"**Flag:** {ach_reason}")
-                with col_c:
-                    if item_id not in st.session_state.decisions:
-                        if st.button("✅ Accept", key=f"acc_{item_id}"):
-                            st.session_state.decisions[item_id] = "ACCEPTED"
-                            st.rerun()
-                        if st.button("🚫 Reject", key=f"rej_{item_id}"):
-                            st.session_state.decisions[item_id] = "REJECTED"
-                            st.rerun()
-                    else:
-                        st.info(f"Status: {st.session_state.decisions[item_id]}")
+    for _, ach in ach_exceptions.iterrows():
+        item_id = f"ach_{ach['ID']}"
+        with st.container(border=True):
+            col_a, col_b, col_c = st.columns([2, 2, 1])
+            with col_a:
+                st.warning(f"**ACH: {ach['Vendor']}**")
+                st.caption(f"ID: {ach['ID']}")
+            with col_b:
+                st.write(f"**Amount:** {format_cents(ach['Amount Cents'])}")
+                st.write(f"**Flag:** {ach['Reason']}")
+            with col_c:
+                if item_id not in st.session_state.decisions:
+                    if st.button("✅ Accept", key=f"acc_{item_id}"):
+                        st.session_state.decisions[item_id] = "ACCEPTED"
+                        st.rerun()
+                    if st.button("🚫 Reject", key=f"rej_{item_id}"):
+                        st.session_state.decisions[item_id] = "REJECTED"
+                        st.rerun()
+                else:
+                    st.info(f"Status: {st.session_state.decisions[item_id]}")
 
 # ---------------------------------------------------------
 # AUDIT LOG & RESET
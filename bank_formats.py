@@ -0,0 +1,324 @@
+"""Native streaming readers for bank and issue file formats.
+
+    BAI2          bank paid files: 16 records with a check-paid type code (475)
+    X9.37         image cash letters: check detail records (type 25), each with
+                  the byte offset of its first image view (type 52)
+    NACHA         ACH entry files: debit entries joined to their batch header
+    fixed-width   customer issue files, sliced by a column layout
+
+Files are memory-mapped instead of read into memory. Fixed-length formats
+(NACHA, fixed-width) are viewed as a 2-D byte array and decoded a column
+at a time with numpy; text columns are decoded once per distinct value.
+Paid-file readers yield the same compact frames as ingest.read_bank_chunks
+(string Check #, categorical Payee, int64 Amount Cents). BAI2 and X9.37
+carry no payee name, so Payee is missing and payee rules do not apply.
+"""
+import io
+import mmap
+import os
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNKSIZE = 100_000
+
+BAI2_CHECK_PAID = frozenset({b"475"})
+
+NACHA_RECORD_LENGTH = 94
+NACHA_DEBIT_CODES = np.array([b"27", b"37"], dtype="S2")  # checking and savings debits
+NACHA_COLUMNS = ["Vendor", "ID", "Amount Cents", "SEC Code", "Effective Date", "Receiver", "Trace Number",
+                 "Transaction Code", "DFI Account", "Individual ID"]
+
+X937_EBCDIC = "cp037"
+X937_CHECK_DETAIL = frozenset({b"25", "25".encode(X937_EBCDIC)})
+X937_IMAGE_DATA = frozenset({b"52", "52".encode(X937_EBCDIC)})
+
+# Column -> (start, end) byte offsets, 0-based and end-exclusive.
+ISSUE_LAYOUT = {
+    "Account": (0, 12),
+    "Check #": (12, 22),
+    "Amount": (22, 32),       # cents, zero- or blank-padded
+    "Issue Date": (32, 40),   # YYYYMMDD
+    "Void": (40, 41),         # "V" when the check was voided
+    "Payee": (41, 91),
+}
+
+
+# --- FORMAT DETECTION ---
+def _head(source, n=8):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source[:n])
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read(n)
+    position = source.tell()
+    head = source.read(n)
+    source.seek(position)
+    return head if isinstance(head, bytes) else head.encode()
+
+
+def detect_format(source):
+    """Sniff "bai2", "x937", "nacha" or "csv" from the first bytes of a file."""
+    head = _head(source)
+    if head.startswith(b"01,"):
+        return "bai2"
+    if len(head) >= 6 and int.from_bytes(head[:4], "big") == 80 and head[4:6] in (b"01", b"\xf0\xf1"):
+        return "x937"
+    if head.startswith(b"101"):
+        return "nacha"
+    return "csv"
+
+
+# --- BUFFERS ---
+def _buffer(source):
+    """Bytes-like view of `source`: a memory map for paths, the existing buffer for in-memory files.
+
+    The map is released once the last numpy view on it is dropped.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(source, "getbuffer"):
+        return source.getbuffer()
+    if hasattr(source, "read"):
+        return source.read()
+    return source
+
+
+def _lines(source):
+    """Object with readline() over `source` without copying the file."""
+    buf = _buffer(source)
+    return buf if isinstance(buf, mmap.mmap) else io.BytesIO(buf)
+
+
+def _records(buf, length=None):
+    """2-D uint8 view (records x width) of fixed-length, optionally newline-terminated records."""
+    data = np.frombuffer(buf, dtype=np.uint8)
+    if not len(data):
+        return np.empty((0, length or 0), dtype=np.uint8)
+    newlines = np.flatnonzero(data[:65536] == ord("\n"))
+    if not len(newlines):
+        if length is None or len(data) % length:
+            raise ValueError("records have no line terminators and no fixed length")
+        return data.reshape(-1, length)
+
+    stride = int(newlines[0]) + 1
+    width = stride - 1 - (stride > 1 and data[stride - 2] == ord("\r"))
+    n_full, remainder = divmod(len(data), stride)
+    terminated = (data[stride - 1::stride][:n_full] == ord("\n")).all()
+    if terminated and remainder in (0, width):
+        n = n_full + (remainder == width and width > 0)
+        return np.lib.stride_tricks.as_strided(data, shape=(n, width), strides=(stride, 1), writeable=False)
+
+    # Ragged lines (e.g. trailing blanks trimmed): pad to the longest line.
+    lines = [line for line in bytes(data).splitlines() if line.strip()]
+    width = max(length or 0, max(map(len, lines), default=0))
+    return np.array(lines, dtype=f"S{width}").view(np.uint8).reshape(len(lines), width)
+
+
+# --- COLUMN DECODERS ---
+def _field(records, start, end):
+    return np.ascontiguousarray(records[:, start:end]).view(f"S{end - start}").ravel()
+
+
+def _text(records, start, end):
+    """Decode a text field once per distinct value; blanks become missing."""
+    codes, uniques = pd.factorize(_field(records, start, end))
+    decoded = pd.Index([value.decode("latin-1").strip() for value in uniques], dtype=object)
+    # Values that differ only in padding collapse to one category.
+    categories = decoded[decoded != ""].unique()
+    return pd.Categorical.from_codes(categories.get_indexer(decoded)[codes], categories=categories)
+
+
+def _digits(records, start, end, name):
+    """Parse a right-aligned numeric field (zero- or blank-padded) into int64."""
+    digits = records[:, start:end].astype(np.int64) - ord("0")
+    digits[digits == ord(" ") - ord("0")] = 0
+    if ((digits < 0) | (digits > 9)).any():
+        raise ValueError(f"non-numeric characters in {name}")
+    return digits @ (10 ** np.arange(end - start - 1, -1, -1, dtype=np.int64))
+
+
+def _serial(value):
+    """Check serial without padding or leading zeros, to match register check numbers."""
+    value = value.strip()
+    return value.lstrip(b"0") or value[-1:]
+
+
+def _missing_payee(n):
+    return pd.Categorical.from_codes(np.full(n, -1), categories=pd.Index([], dtype=object))
+
+
+def _paid_frame(checks, cents, **extra):
+    frame = pd.DataFrame({
+        "Check #": pd.array(checks, dtype="string"),
+        "Payee": _missing_payee(len(checks)),
+        "Amount Cents": np.asarray(cents, dtype=np.int64),
+    })
+    for column, values in extra.items():
+        frame[column] = values
+    return frame
+
+
+# --- BAI2 ---
+def read_bai2_chunks(source, chunksize=DEFAULT_CHUNKSIZE, type_codes=BAI2_CHECK_PAID):
+    """Yield compact frames of paid checks from a BAI2 file, tagged with their Account."""
+    reader = _lines(source)
+    checks, cents, accounts = [], [], []
+    account = ""
+    for line in iter(reader.readline, b""):
+        record = line.strip()
+        if record.startswith(b"03,"):
+            account = record.split(b",", 2)[1].decode("latin-1")
+        elif record.startswith(b"16,"):
+            fields = record.rstrip(b"/").split(b",")
+            if fields[1] not in type_codes:
+                continue
+            # Funds type decides how many availability fields precede the references.
+            refs = 4 + {b"S": 3, b"V": 2}.get(fields[3], 0)
+            if fields[3] == b"D":
+                refs += 1 + 2 * int(fields[4])
+            bank_ref, customer_ref = fields[refs], fields[refs + 1] if len(fields) > refs + 1 else b""
+            checks.append(_serial(customer_ref or bank_ref).decode("latin-1"))
+            cents.append(int(fields[2] or 0))
+            accounts.append(account)
+            if len(checks) >= chunksize:
+                yield _paid_frame(checks, cents, Account=pd.Categorical(accounts))
+                checks, cents, accounts = [], [], []
+    if checks:
+        yield _paid_frame(checks, cents, Account=pd.Categorical(accounts))
+
+
+# --- X9.37 ---
+def _x937_image(record, encoding):
+    """(offset within record, length) of the image data in a type 52 record.
+
+    Fields 14-18: image reference key length (4 digits) and key, digital
+    signature length (5) and signature, image data length (7).
+    """
+    key = int(record[101:105].decode(encoding))
+    signature = int(record[105 + key:110 + key].decode(encoding))
+    data_start = 117 + key + signature
+    return data_start, int(record[110 + key + signature:data_start].decode(encoding))
+
+
+def read_x937_chunks(source, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield compact frames of presented checks from an X9.37 cash letter.
+
+    Image bytes are skipped, not read; "Image Offset" and "Image Length"
+    locate each item's first image view in the file (-1 when absent).
+    """
+    view = memoryview(_buffer(source))
+    size, position = len(view), 0
+    encoding = None
+    checks, cents, sequence, image_offset, image_length = [], [], [], [], []
+    while position + 4 <= size:
+        length = int.from_bytes(view[position:position + 4], "big")
+        start = position + 4
+        kind = bytes(view[start:start + 2])
+        if encoding is None:
+            encoding = X937_EBCDIC if kind[:1] >= b"\xf0" else "ascii"
+        if kind in X937_CHECK_DETAIL:
+            if len(checks) >= chunksize:
+                yield _paid_frame(checks, cents, **{"Item Sequence": sequence,
+                                                    "Image Offset": image_offset, "Image Length": image_length})
+                checks, cents, sequence, image_offset, image_length = [], [], [], [], []
+            record = bytes(view[start:start + 80]).decode(encoding)
+            auxiliary_on_us, on_us = record[2:17].strip(), record[27:47].strip()
+            # Business checks carry the serial in Auxiliary On-Us; personal checks after the "/" in On-Us.
+            serial = auxiliary_on_us or on_us.rsplit("/", 1)[-1]
+            checks.append(_serial(serial.encode()).decode())
+            cents.append(int(record[47:57]))
+            sequence.append(record[57:72].strip())
+            image_offset.append(-1)
+            image_length.append(-1)
+        elif kind in X937_IMAGE_DATA and checks and image_offset[-1] < 0:
+            header = bytes(view[start:start + min(length, 1024)])
+            data_start, data_length = _x937_image(header, encoding)
+            image_offset[-1], image_length[-1] = start + data_start, data_length
+        position = start + length
+    if checks:
+        yield _paid_frame(checks, cents, **{"Item Sequence": sequence,
+                                            "Image Offset": image_offset, "Image Length": image_length})
+
+
+# --- NACHA ---
+def read_nacha_chunks(source, chunksize=DEFAULT_CHUNKSIZE, debits_only=True):
+    """Yield ACH entries joined to their batch header, in the ach_filter debit columns.
+
+    Columns: Vendor (company name), ID (company identification), Amount Cents,
+    SEC Code, Effective Date, Receiver and Trace Number, plus the entry's
+    Transaction Code, DFI Account and Individual ID as written (padding
+    kept) so that a return entry can quote them.
+    """
+    records = _records(_buffer(source), NACHA_RECORD_LENGTH)
+    if records.shape[1] < NACHA_RECORD_LENGTH and len(records):
+        raise ValueError(f"NACHA records must be {NACHA_RECORD_LENGTH} characters")
+    kind = records[:, 0] if len(records) else np.empty(0, dtype=np.uint8)
+    headers = np.flatnonzero(kind == ord("5"))
+    batch = np.cumsum(kind == ord("5")) - 1
+    entries = np.flatnonzero(kind == ord("6"))
+    if debits_only:
+        entries = entries[np.isin(_field(records[entries], 1, 3), NACHA_DEBIT_CODES)]
+    if (batch[entries] < 0).any():
+        raise ValueError("entry detail record before any batch header")
+
+    for begin in range(0, len(entries), chunksize):
+        rows = entries[begin:begin + chunksize]
+        entry, header = records[rows], records[headers[batch[rows]]]
+        cents = _digits(entry, 29, 39, "entry amount")
+        effective = _text(header, 69, 75)
+        yield pd.DataFrame({
+            "Vendor": _text(header, 4, 20),
+            "ID": _text(header, 40, 50),
+            "Amount Cents": cents,
+            "SEC Code": _text(header, 50, 53),
+            "Effective Date": pd.to_datetime(effective.astype(object), format="%y%m%d", errors="coerce"),
+            "Receiver": _text(entry, 54, 76),
+            "Trace Number": _field(entry, 79, 94).astype(str),
+            "Transaction Code": _field(entry, 1, 3).astype(str),
+            "DFI Account": _field(entry, 12, 29).astype(str),
+            "Individual ID": _field(entry, 39, 54).astype(str),
+        })
+
+
+def read_nacha(source, debits_only=True):
+    """All ACH entries of a NACHA file in one frame (see read_nacha_chunks)."""
+    parts = list(read_nacha_chunks(source, debits_only=debits_only))
+    if not parts:
+        return pd.DataFrame(columns=NACHA_COLUMNS)
+    return pd.concat(parts, ignore_index=True)
+
+
+# --- FIXED-WIDTH ISSUE FILES ---
+def read_issue_file(source, layout=ISSUE_LAYOUT):
+    """Issued checks from a fixed-width file as a Check #/Amount Cents/Payee register frame.
+
+    Voided checks (Void == "V") are issued to "VOID" so the void rule applies.
+    """
+    records = _records(_buffer(source))
+    width = max(end for _, end in layout.values())
+    if records.shape[1] < width:
+        padded = np.full((len(records), width), ord(" "), dtype=np.uint8)
+        padded[:, :records.shape[1]] = records
+        records = padded
+
+    frame = pd.DataFrame({
+        "Check #": _digits(records, *layout["Check #"], "Check #").astype(str),
+        "Amount Cents": _digits(records, *layout["Amount"], "Amount"),
+        "Payee": _text(records, *layout["Payee"]).astype(object),
+    })
+    if "Void" in layout:
+        voided = _field(records, *layout["Void"]) == b"V"
+        frame.loc[voided, "Payee"] = "VOID"
+    if "Account" in layout:
+        frame["Account"] = _text(records, *layout["Account"])
+    if "Issue Date" in layout:
+        frame["Issue Date"] = pd.to_datetime(_text(records, *layout["Issue Date"]).astype(object),
+                                             format="%Y%m%d", errors="coerce")
+    return frame
+
+
+PAID_READERS = {"bai2": read_bai2_chunks, "x937": read_x937_chunks}
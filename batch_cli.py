@@ -0,0 +1,184 @@
+"""Headless overnight Positive Pay run across many accounts.
+
+Usage:
+    python batch_cli.py INPUT_DIR OUTPUT_DIR [--workers N] [--ach-rules RULES.csv]
+
+INPUT_DIR holds one sub-directory per account:
+
+    INPUT_DIR/<account>/register.csv     issued checks (Check #, Amount, Payee),
+                  or register.txt        ... as a fixed-width issue file
+    INPUT_DIR/<account>/paid.csv         bank paid file (Check #, Amount, Payee),
+                  or paid.bai / paid.x937 ... as BAI2 or X9.37
+    INPUT_DIR/<account>/ach.csv          optional incoming debits (Vendor, ID, Amount),
+                  or ach.ach             ... as a NACHA file
+    INPUT_DIR/<account>/ach_rules.csv    optional per-account rules (Company ID, Max Amount)
+
+Each account is reconciled in its own worker process and its exceptions,
+with a risk score each, are written to OUTPUT_DIR/<account>/, both as CSV and as an Arrow
+snapshot with current decisions and notes (check_exceptions.arrow). A
+run summary goes to OUTPUT_DIR/summary.csv and per-stage timings of
+every account to OUTPUT_DIR/traces.json; the exit status is non-zero if
+any account failed.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from ach_filter import screen_ach_debits
+from bank_formats import read_issue_file, read_nacha
+from decision_store import DecisionStore
+from exposure_summary import ExposureSummary
+from ingest import load_register, read_bank_chunks, reconcile_file
+from instrumentation import Instrumentation
+from presentment_index import PresentmentIndex, merge_anomalies
+from reconciliation import ACCOUNT_COLUMN, item_ids, paid_file_key, prepare_register, tag_presentments
+from risk_scoring import score, vendor_history
+from snapshot_store import SnapshotStore
+
+# First existing file wins; paid files are format-sniffed, the others go by extension.
+REGISTER_FILES = ("register.csv", "register.txt")
+PAID_FILES = ("paid.csv", "paid.bai", "paid.bai2", "paid.x937")
+ACH_FILES = ("ach.csv", "ach.ach", "ach.txt")
+ACH_RULES_FILE = "ach_rules.csv"
+
+
+def find_file(account_dir, names):
+    for name in names:
+        path = os.path.join(account_dir, name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def discover_accounts(input_dir):
+    """Account directories that contain both a register and a paid file."""
+    accounts = []
+    for name in sorted(os.listdir(input_dir)):
+        account_dir = os.path.join(input_dir, name)
+        if find_file(account_dir, REGISTER_FILES) and find_file(account_dir, PAID_FILES):
+            accounts.append(name)
+    return accounts
+
+
+def run_account(account, input_dir, output_dir, default_rules_path=None):
+    """Reconcile one account's files; runs inside a worker process."""
+    start = time.perf_counter()
+    account_dir = os.path.join(input_dir, account)
+    out_dir = os.path.join(output_dir, account)
+    os.makedirs(out_dir, exist_ok=True)
+    instrumentation = Instrumentation(history=1)
+    trace = instrumentation.start_trace(account)
+
+    register_path = find_file(account_dir, REGISTER_FILES)
+    with instrumentation.stage("read register") as stage:
+        if register_path.endswith(".csv"):
+            register = load_register(register_path)
+        else:
+            register = prepare_register(read_issue_file(register_path))
+        stage.rows = len(register)
+    paid_path = find_file(account_dir, PAID_FILES)
+    with open(paid_path, "rb") as handle:
+        paid_key = paid_file_key(handle.read())
+    with instrumentation.stage("reconcile"):
+        check_exceptions = reconcile_file(register, paid_path)
+
+    # Duplicate presentments and out-of-range serials against this account's history.
+    with instrumentation.stage("presentment screen") as stage:
+        presented = pd.concat(read_bank_chunks(paid_path), ignore_index=True)
+        presentments = PresentmentIndex()
+        anomalies = presentments.screen(presented, register, account=account, source=paid_key)
+        presentments.record(presented, account=account, source=paid_key)
+        check_exceptions = merge_anomalies(check_exceptions, anomalies)
+        stage.rows = len(presented)
+    with instrumentation.stage("risk score", rows=len(check_exceptions)):
+        check_exceptions = score(check_exceptions, vendor_history(register))
+    # Check numbers are only unique within an account, so item ids must carry it.
+    check_exceptions.insert(0, ACCOUNT_COLUMN, account)
+    check_exceptions = tag_presentments(check_exceptions, paid_key)
+    with instrumentation.stage("write exceptions", rows=len(check_exceptions)):
+        ExposureSummary().record_exceptions(check_exceptions, paid_key, account=account, accounts=[account])
+        check_exceptions.to_csv(os.path.join(out_dir, "check_exceptions.csv"), index=False)
+        decisions, ids = DecisionStore(), item_ids(check_exceptions)
+        SnapshotStore(out_dir).write(
+            "check_exceptions", check_exceptions, decisions.decisions(ids), decisions.notes(ids), {"account": account},
+        )
+
+    ach_count = 0
+    ach_path = find_file(account_dir, ACH_FILES)
+    rules_path = os.path.join(account_dir, ACH_RULES_FILE)
+    if not os.path.isfile(rules_path):
+        rules_path = default_rules_path
+    if ach_path and rules_path:
+        with instrumentation.stage("ACH rules") as stage:
+            if ach_path.endswith(".csv"):
+                debits = pd.read_csv(ach_path, dtype={"ID": str})
+            else:
+                debits = read_nacha(ach_path)
+            rules = pd.read_csv(rules_path, dtype={"Company ID": str})
+            ach_exceptions = screen_ach_debits(debits, rules)
+            ach_exceptions.to_csv(os.path.join(out_dir, "ach_exceptions.csv"), index=False)
+            ach_count = len(ach_exceptions)
+            stage.rows = len(debits)
+    instrumentation.finish_trace()
+
+    return {
+        "Account": account,
+        "Check Exceptions": len(check_exceptions),
+        "ACH Exceptions": ach_count,
+        "Seconds": round(time.perf_counter() - start, 3),
+        "Error": "",
+        "Trace": trace.as_dict(),
+    }
+
+
+def run_batch(input_dir, output_dir, workers=None, default_rules_path=None, log=print):
+    accounts = discover_accounts(input_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    results, traces = [], []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(run_account, account, input_dir, output_dir, default_rules_path): account
+            for account in accounts
+        }
+        for future in as_completed(futures):
+            account = futures[future]
+            try:
+                result = future.result()
+                traces.append(result.pop("Trace"))
+            except Exception as e:
+                result = {"Account": account, "Check Exceptions": 0, "ACH Exceptions": 0, "Seconds": 0, "Error": repr(e)}
+            results.append(result)
+            log(f"[{len(results)}/{len(accounts)}] {account}: "
+                + (result["Error"] or f"{result['Check Exceptions']} check / {result['ACH Exceptions']} ACH exceptions"))
+
+    summary = pd.DataFrame(results, columns=["Account", "Check Exceptions", "ACH Exceptions", "Seconds", "Error"])
+    summary = summary.sort_values("Account")
+    summary.to_csv(os.path.join(output_dir, "summary.csv"), index=False)
+    with open(os.path.join(output_dir, "traces.json"), "w") as f:
+        json.dump(sorted(traces, key=lambda trace: trace["trace"]), f, indent=1)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Positive Pay batch reconciliation.")
+    parser.add_argument("input_dir", help="directory with one sub-directory per account")
+    parser.add_argument("output_dir", help="where per-account exception files are written")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--ach-rules", help="ACH rules CSV used when an account has no ach_rules.csv")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    summary = run_batch(args.input_dir, args.output_dir, args.workers, args.ach_rules)
+    failed = int((summary["Error"] != "").sum())
+    print(f"Processed {len(summary)} accounts in {time.perf_counter() - start:.1f}s "
+          f"({failed} failed); summary written to {os.path.join(args.output_dir, 'summary.csv')}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Account-partitioned reconciliation of a skewed multi-client book.
+
+Usage: python benchmarks/bench_accounts.py [--rows 2000000] [--accounts 2000] [--workers N] [--max-rows 250000]
+
+Account sizes follow a Zipf-like law, so the largest client holds a big
+share of all presented checks. For each run the table shows the total
+time, when the median and the 99th-percentile account finished, and when
+the largest account finished. With units capped at --max-rows the small
+clients finish in the first units instead of waiting for the big one, and
+the pool spreads the big one's slices over the remaining cores.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from partitioning import reconcile_accounts
+from synthetic_data import generate_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--accounts", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-rows", type=int, default=250_000)
+    args = parser.parse_args()
+
+    df_cust, df_bank, _ = generate_files(args.rows, n_accounts=args.accounts)
+    largest = df_bank["Account"].value_counts()
+    print(f"{args.rows:,} presented checks over {largest.size:,} accounts; "
+          f"largest {largest.index[0]} has {largest.iloc[0]:,} ({largest.iloc[0] / args.rows:.0%})")
+
+    runs = {
+        "1 process, one unit": dict(workers=1, max_rows=args.rows),
+        f"1 process, units <= {args.max_rows:,}": dict(workers=1, max_rows=args.max_rows),
+        f"pool, units <= {args.max_rows:,}": dict(workers=args.workers, max_rows=args.max_rows),
+    }
+    print(f"{'run':<32} {'total s':>8} {'p50 s':>8} {'p99 s':>8} {'largest s':>10} {'exceptions':>11}")
+    for name, options in runs.items():
+        start = time.perf_counter()
+        exceptions, timings = reconcile_accounts(df_cust, df_bank, **options)
+        elapsed = time.perf_counter() - start
+        finished = timings["Finished"].to_numpy()
+        biggest = timings.loc[timings["Account"] == largest.index[0], "Finished"].iloc[0]
+        print(f"{name:<32} {elapsed:>8.2f} {np.percentile(finished, 50):>8.2f} "
+              f"{np.percentile(finished, 99):>8.2f} {biggest:>10.2f} {len(exceptions):>11,}")
+
+
+if __name__ == "__main__":
+    main()
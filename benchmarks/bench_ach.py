@@ -0,0 +1,79 @@
+"""Throughput of the compiled ACH rules engine vs the per-debit DataFrame scan.
+
+Usage: python benchmarks/bench_ach.py [--rules 50000] [--debits 10000 100000 500000] [--scan-limit 5000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ach_filter import AchRuleSet
+
+
+def make_rules(n_rules, seed=11):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Vendor": [f"Originator {i}" for i in range(n_rules)],
+        "Company ID": (1_000_000 + np.arange(n_rules)).astype(str),
+        "Max Amount": rng.integers(100, 100_000, n_rules).astype(float),
+        "Allowed SEC": rng.choice(["PPD", "CCD", "PPD|CCD", ""], n_rules),
+        "Period": "M",
+        "Period Limit": rng.integers(1_000, 500_000, n_rules).astype(float),
+    })
+
+
+def make_debits(n_debits, n_rules, seed=12):
+    rng = np.random.default_rng(seed)
+    ids = 1_000_000 + rng.integers(0, int(n_rules * 1.05), n_debits)
+    return pd.DataFrame({
+        "Vendor": "Originator",
+        "ID": ids.astype(str),
+        "Amount": rng.integers(100, 120_000, n_debits) / 100 * 10,
+        "SEC Code": rng.choice(["PPD", "CCD", "WEB"], n_debits),
+        "Effective Date": pd.Timestamp("2026-01-01") + pd.to_timedelta(rng.integers(0, 90, n_debits), unit="D"),
+    })
+
+
+def scan(rules, debits):
+    """The original app_v1 loop: one boolean mask over the rules per debit."""
+    flagged = 0
+    for ach in debits.to_dict("records"):
+        rule = rules[rules["Company ID"] == ach["ID"]]
+        if rule.empty or ach["Amount"] > rule.iloc[0]["Max Amount"]:
+            flagged += 1
+    return flagged
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=50_000)
+    parser.add_argument("--debits", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    parser.add_argument("--scan-limit", type=int, default=5_000)
+    args = parser.parse_args()
+
+    rules = make_rules(args.rules)
+    start = time.perf_counter()
+    engine = AchRuleSet(rules)
+    print(f"compiled {len(engine)} rules in {time.perf_counter() - start:.3f}s")
+
+    print(f"{'debits':>10} {'engine debits/s':>16} {'scan debits/s':>14} {'exceptions':>11}")
+    for n in args.debits:
+        debits = make_debits(n, args.rules)
+        before_items, before_seconds = engine.items_evaluated, engine.seconds
+        exceptions = engine.evaluate(debits)
+        engine_rate = (engine.items_evaluated - before_items) / (engine.seconds - before_seconds)
+
+        sample = debits.head(args.scan_limit)
+        start = time.perf_counter()
+        scan(rules, sample)
+        scan_rate = len(sample) / (time.perf_counter() - start)
+        print(f"{n:>10} {engine_rate:>16,.0f} {scan_rate:>14,.0f} {len(exceptions):>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Cut-off export: streaming pay/no-pay and NACHA return files vs building them in memory.
+
+Usage: python benchmarks/bench_decision_files.py [--rows 5000000] [--debits 500000] [--chunksize 100000]
+
+Every check exception gets a decision, then the pay/no-pay file is
+written from the exception snapshot twice: all at once (decisions joined
+onto the full frame, one to_csv) and streamed chunk by chunk with
+decision_files. The NACHA return file is streamed from a synthetic ACH
+file with a third of the originators rejected. Peak memory is traced in
+a second, untimed run.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_ach import make_debits
+from decision_files import write_ach_returns, write_pay_no_pay
+from decision_store import DecisionStore
+from reconciliation import apply_decisions, item_ids, process_reconciliation
+from snapshot_store import SnapshotStore
+from synthetic_data import generate_files, to_nacha
+
+
+def measure(fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--debits", type=int, default=500_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args()
+
+    df_cust, df_bank, _ = generate_files(args.rows)
+    exceptions = process_reconciliation(df_cust, df_bank).drop(columns="Status")
+    del df_cust, df_bank
+    debits = make_debits(args.debits, 5_000)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DecisionStore(os.path.join(tmp, "decisions.db"))
+        ids = item_ids(exceptions)
+        rng = np.random.default_rng(3)
+        returned = rng.random(len(ids)) < 0.3
+        store.record_many(ids[returned], "RETURNED")
+        store.record_many(ids[~returned], "PAID")
+        snapshot = SnapshotStore(tmp).write("bench", exceptions)
+        rejected = debits["ID"].drop_duplicates().sample(frac=1 / 3, random_state=4)
+        store.record_many("ach_" + rejected, "REJECTED")
+        ach_path = os.path.join(tmp, "debits.ach")
+        with open(ach_path, "wb") as handle:
+            handle.write(to_nacha(debits))
+        del debits
+        out = os.path.join(tmp, "out")
+
+        def in_memory():
+            decided = apply_decisions(exceptions, store.decisions())
+            decided.to_csv(out, index=False)
+            return len(decided)
+
+        runs = {
+            "pay/no-pay, in memory": in_memory,
+            "pay/no-pay, streamed": lambda: sum(
+                write_pay_no_pay(snapshot, out, store, chunksize=args.chunksize).values()),
+            "ACH returns, streamed": lambda: write_ach_returns(
+                ach_path, out, "011000015", "011000015", store, chunksize=args.chunksize),
+        }
+        print(f"{len(exceptions):,} check decisions, {len(rejected):,} rejected originators")
+        print(f"{'export':<24} {'seconds':>8} {'peak MB':>9} {'items':>9}")
+        for label, fn in runs.items():
+            elapsed, peak, items = measure(fn)
+            print(f"{label:<24} {elapsed:>8.2f} {peak / 1e6:>9.1f} {items:>9,}")
+
+
+if __name__ == "__main__":
+    main()
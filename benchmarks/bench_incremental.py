@@ -0,0 +1,52 @@
+"""Full vs incremental re-reconciliation after a small correction to large uploads.
+
+Usage: python benchmarks/bench_incremental.py [--rows 500000] [--changed 20]
+
+The second upload is submitted as a correction of the first, the only
+case that is diffed rather than reconciled in full.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_reconciliation import make_files
+from incremental import IncrementalReconciler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--changed", type=int, default=20)
+    args = parser.parse_args()
+
+    df_cust, df_bank = make_files(args.rows)
+    cust_bytes = df_cust.to_csv(index=False).encode()
+    bank_bytes = df_bank.to_csv(index=False).encode()
+
+    corrected = df_bank.copy()
+    rows = np.random.default_rng(3).choice(len(corrected), args.changed, replace=False)
+    corrected.iloc[rows, corrected.columns.get_loc("Amount")] += 1
+    corrected_bytes = corrected.to_csv(index=False).encode()
+
+    reconciler = IncrementalReconciler()
+    start = time.perf_counter()
+    reconciler.update_bytes(cust_bytes, bank_bytes)
+    full = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reconciler.update_bytes(cust_bytes, corrected_bytes, correction=True)
+    incremental = time.perf_counter() - start
+
+    print(f"rows={args.rows} changed={args.changed}")
+    print(f"full reconciliation:    {full * 1000:9.1f} ms")
+    print(f"incremental correction: {incremental * 1000:9.1f} ms "
+          f"({len(reconciler.last_affected)} check numbers re-evaluated)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Peak memory of one-shot pd.read_csv reconciliation vs chunked streaming ingestion.
+
+Usage: python benchmarks/bench_ingest.py [--rows 1000000] [--chunksize 100000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_reconciliation import make_files
+from ingest import load_register, reconcile_file
+from reconciliation import process_reconciliation
+
+
+def measure(fn):
+    # Timed and traced separately: tracemalloc slows allocation-heavy code several-fold.
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args()
+
+    df_cust, df_bank = make_files(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        cust_path = os.path.join(tmp, "register.csv")
+        bank_path = os.path.join(tmp, "paid.csv")
+        df_cust.to_csv(cust_path, index=False)
+        df_bank.to_csv(bank_path, index=False)
+        del df_cust, df_bank
+
+        register = load_register(cust_path)
+        runs = {
+            "read_csv + reconcile": lambda: process_reconciliation(pd.read_csv(cust_path), pd.read_csv(bank_path)),
+            "streaming (paid file only)": lambda: reconcile_file(register, bank_path, args.chunksize),
+        }
+        print(f"{'path':<28} {'seconds':>8} {'peak MB':>9} {'exceptions':>11}")
+        for label, fn in runs.items():
+            elapsed, peak, result = measure(fn)
+            print(f"{label:<28} {elapsed:>8.2f} {peak / 1e6:>9.1f} {len(result):>11}")
+
+
+if __name__ == "__main__":
+    main()
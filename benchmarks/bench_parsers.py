@@ -0,0 +1,73 @@
+"""Throughput of the native bank-format readers vs the CSV path they replace.
+
+Usage: python benchmarks/bench_parsers.py [--rows 1000000] [--chunksize 100000]
+
+Each format is written to a temporary file from the same synthetic data and
+read back through its streaming reader (memory-mapped). The CSV rows show
+the old hand-converted path for comparison.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bank_formats import read_bai2_chunks, read_issue_file, read_nacha_chunks, read_x937_chunks
+from bench_ach import make_debits
+from ingest import load_register, read_bank_chunks
+from synthetic_data import generate_files, to_bai2, to_issue_file, to_nacha, to_x937
+
+
+def measure(path, read):
+    start = time.perf_counter()
+    rows = read(path)
+    return time.perf_counter() - start, rows
+
+
+def count_chunks(reader, chunksize):
+    return lambda path: sum(len(chunk) for chunk in reader(path, chunksize))
+
+
+def read_ach_csv(path):
+    # The hand-converted ACH path: a plain read_csv into ach_filter's columns.
+    return len(pd.read_csv(path, dtype={"ID": str}, parse_dates=["Effective Date"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args()
+
+    df_cust, df_bank, _ = generate_files(args.rows)
+    debits = make_debits(args.rows, max(args.rows // 20, 1))
+    debits["Vendor"] = "Originator " + debits["ID"]
+
+    files = {
+        "paid.csv": (df_bank.to_csv(index=False).encode(), count_chunks(read_bank_chunks, args.chunksize)),
+        "paid.bai2": (to_bai2(df_bank), count_chunks(read_bai2_chunks, args.chunksize)),
+        "paid.x937": (to_x937(df_bank, image_bytes=0), count_chunks(read_x937_chunks, args.chunksize)),
+        "register.csv": (df_cust.to_csv(index=False).encode(), lambda path: len(load_register(path))),
+        "register.txt": (to_issue_file(df_cust), lambda path: len(read_issue_file(path))),
+        "ach.csv": (debits.to_csv(index=False).encode(), read_ach_csv),
+        "ach.nacha": (to_nacha(debits), count_chunks(read_nacha_chunks, args.chunksize)),
+    }
+    del df_cust, df_bank, debits
+
+    print(f"{'file':<14} {'MB':>8} {'seconds':>8} {'rows/s':>12} {'MB/s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (data, read) in files.items():
+            path = os.path.join(tmp, name)
+            with open(path, "wb") as f:
+                f.write(data)
+            elapsed, rows = measure(path, read)
+            size = len(data) / 1e6
+            print(f"{name:<14} {size:>8.1f} {elapsed:>8.2f} {rows / elapsed:>12,.0f} {size / elapsed:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Payee similarity scoring throughput on noisy name pairs.
+
+Usage: python benchmarks/bench_payee.py [--rows 10000 100000 500000] [--distinct 20000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from payee_match import PayeeMatcher
+
+SUFFIXES = ["", " Inc", " LLC", " Corp", " Corporation", ", Inc.", " Co"]
+
+
+def make_pairs(n_rows, n_distinct, seed=5):
+    rng = np.random.default_rng(seed)
+    base = np.array([f"Vendor {i} Services" for i in range(n_distinct)], dtype=object)
+    issued = base[rng.integers(0, n_distinct, n_rows)]
+    presented = issued + np.array(SUFFIXES, dtype=object)[rng.integers(0, len(SUFFIXES), n_rows)]
+    swapped = rng.random(n_rows) < 0.05
+    presented[swapped] = base[rng.integers(0, n_distinct, swapped.sum())]
+    return issued, presented
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    parser.add_argument("--distinct", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'cold pairs/s':>14} {'warm pairs/s':>14} {'likely same':>12}")
+    for n in args.rows:
+        issued, presented = make_pairs(n, args.distinct)
+        matcher = PayeeMatcher()
+        start = time.perf_counter()
+        scores = matcher.score(issued, presented)
+        cold = n / (time.perf_counter() - start)
+        start = time.perf_counter()
+        matcher.score(issued, presented)
+        warm = n / (time.perf_counter() - start)
+        likely = int((matcher.triage(scores) == "LIKELY SAME").sum())
+        print(f"{n:>10} {cold:>14,.0f} {warm:>14,.0f} {likely:>12}")
+
+
+if __name__ == "__main__":
+    main()
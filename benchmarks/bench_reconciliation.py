@@ -0,0 +1,59 @@
+"""Compare the vectorized reconciliation engine against the original iterrows loop.
+
+Usage: python benchmarks/bench_reconciliation.py [--sizes 10000 100000 1000000] [--loop-limit 100000]
+
+The loop is O(bank x register), so sizes above --loop-limit are extrapolated
+from the largest measured loop run instead of being executed.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reconciliation import process_reconciliation, process_reconciliation_loop
+from synthetic_data import generate_files
+
+
+def make_files(n_rows, seed=7):
+    df_cust, df_bank, _ = generate_files(n_rows, seed=seed)
+    return df_cust, df_bank
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--loop-limit", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'vectorized (s)':>15} {'loop (s)':>12} {'speedup':>10} {'exceptions':>11}")
+    last_loop = None
+    for n in args.sizes:
+        df_cust, df_bank = make_files(n)
+        vec_time, vec_result = timed(process_reconciliation, df_cust, df_bank)
+
+        if n <= args.loop_limit:
+            loop_time, loop_result = timed(process_reconciliation_loop, df_cust, df_bank)
+            assert loop_result["Check #"].tolist() == vec_result["Check #"].tolist()
+            last_loop = (n, loop_time)
+            loop_label = f"{loop_time:12.2f}"
+        elif last_loop:
+            # Loop cost grows with bank rows x register rows.
+            loop_time = last_loop[1] * (n / last_loop[0]) ** 2
+            loop_label = f"~{loop_time:11.0f}"
+        else:
+            loop_time, loop_label = None, f"{'skipped':>12}"
+
+        speedup = f"{loop_time / vec_time:9.0f}x" if loop_time else f"{'-':>10}"
+        print(f"{n:>10} {vec_time:>15.3f} {loop_label} {speedup} {len(vec_result):>11}")
+
+
+if __name__ == "__main__":
+    main()
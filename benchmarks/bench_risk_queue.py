@@ -0,0 +1,54 @@
+"""Risk-ordered review queue: scoring pass and top-k ranking vs a full sort.
+
+Usage: python benchmarks/bench_risk_queue.py [--rows 5000000] [--page-size 25]
+
+Reconciles a synthetic book, scores every exception against the
+register's vendor history, then times fetching the first and tenth pages
+of the queue in risk order: with top_k (a partial selection of only the
+rows up to the page) and with a full stable sort_values of the queue.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reconciliation import RISK_COLUMN, find_exceptions, prepare_register
+from review_queue import paginate, top_k
+from risk_scoring import score, vendor_history
+from synthetic_data import generate_files
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--page-size", type=int, default=25)
+    args = parser.parse_args()
+
+    df_cust, df_bank, _ = generate_files(args.rows)
+    register = prepare_register(df_cust)
+    exceptions = find_exceptions(register, df_bank)
+    del df_cust, df_bank
+
+    history_s, history = timed(lambda: vendor_history(register))
+    score_s, scored = timed(lambda: score(exceptions, history))
+    print(f"{len(scored):,} exceptions: vendor history {history_s:.3f}s, scoring {score_s:.3f}s "
+          f"({len(scored) / score_s:,.0f} rows/s)")
+
+    print(f"{'page':>5} {'top_k s':>9} {'full sort s':>12} {'same rows':>10}")
+    for page in (1, 10):
+        ranked_s, ranked = timed(lambda: paginate(top_k(scored, page * args.page_size), page, args.page_size))
+        sorted_s, ordered = timed(lambda: paginate(
+            scored.sort_values(RISK_COLUMN, ascending=False, kind="stable"), page, args.page_size))
+        print(f"{page:>5} {ranked_s:>9.4f} {sorted_s:>12.4f} {str(ranked.index.equals(ordered.index)):>10}")
+
+
+if __name__ == "__main__":
+    main()
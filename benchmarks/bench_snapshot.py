@@ -0,0 +1,59 @@
+"""Handing an exception queue to another process: CSV vs a memory-mapped Arrow snapshot.
+
+Usage: python benchmarks/bench_snapshot.py [--rows 2000000] [--accounts 50]
+
+Reconciles a synthetic book once, then times writing the exceptions and
+reading them back as a reader in another session would: re-parsing CSV,
+or memory-mapping the Arrow IPC snapshot (table only, and as a DataFrame).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from partitioning import reconcile_accounts
+from snapshot_store import SnapshotStore, to_frame
+from synthetic_data import generate_files
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--accounts", type=int, default=50)
+    args = parser.parse_args()
+
+    df_cust, df_bank, _ = generate_files(args.rows, n_accounts=args.accounts)
+    exceptions, _ = reconcile_accounts(df_cust, df_bank, workers=1)
+    del df_cust, df_bank
+    print(f"{len(exceptions):,} exceptions from {args.rows:,} presented checks")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "exceptions.csv")
+        store = SnapshotStore(tmp)
+        write_csv, _ = timed(lambda: exceptions.to_csv(csv_path, index=False))
+        write_arrow, arrow_path = timed(lambda: store.write("bench", exceptions))
+        runs = {
+            "CSV": (write_csv, os.path.getsize(csv_path), lambda: pd.read_csv(csv_path)),
+            "Arrow snapshot (table)": (write_arrow, os.path.getsize(arrow_path), lambda: store.table("bench")),
+            "Arrow snapshot (frame)": (write_arrow, os.path.getsize(arrow_path),
+                                       lambda: to_frame(store.table("bench"))),
+        }
+        print(f"{'format':<24} {'write s':>8} {'MB':>7} {'read s':>8}")
+        for name, (write, size, read) in runs.items():
+            elapsed, _ = timed(read)
+            print(f"{name:<24} {write:>8.3f} {size / 1e6:>7.1f} {elapsed:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
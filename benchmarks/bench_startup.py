@@ -0,0 +1,70 @@
+"""Cold start and per-rerun overhead of the Streamlit apps.
+
+Usage: python benchmarks/bench_startup.py [--scripts app.py app_v1.py app_v10.py] [--reruns 20]
+
+Each script runs in a fresh interpreter under Streamlit's AppTest with an
+empty data directory. "cold" is the first run including every import the
+script triggers; "rerun" is the mean of --reruns further runs of the same
+session with no input changes (what each widget click costs before any
+page-specific work). For app.py the Executive Summary page is timed too.
+"errors" counts exceptions the script raised on its first run (the
+prototype scripts stop early without uploads).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+script, reruns = sys.argv[1], int(sys.argv[2])
+at = AppTest.from_file(script, default_timeout=120)
+first = time.perf_counter()
+at.run()
+result = {"import": first - start, "cold": time.perf_counter() - first, "errors": len(at.exception)}
+def rerun_seconds():
+    begin = time.perf_counter()
+    for _ in range(reruns):
+        at.run()
+    return (time.perf_counter() - begin) / reruns
+result["rerun"] = rerun_seconds()
+if len(at.sidebar.radio) and "Navigation" == at.sidebar.radio[0].label:
+    at.sidebar.radio[0].set_value(at.sidebar.radio[0].options[-1]).run()
+    result["rerun (summary page)"] = rerun_seconds()
+print(json.dumps(result))
+"""
+
+
+def measure(script, reruns):
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = {**os.environ, "POSITIVE_PAY_DATA_DIR": data_dir}
+        output = subprocess.run(
+            [sys.executable, "-c", WORKER, os.path.join(ROOT, script), str(reruns)],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scripts", nargs="+", default=["app.py", "app_v1.py", "app_v10.py"])
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'script':<12} {'streamlit import s':>18} {'cold run s':>11} {'rerun ms':>9} {'summary rerun ms':>17} "
+          f"{'errors':>7}")
+    for script in args.scripts:
+        result = measure(script, args.reruns)
+        summary = result.get("rerun (summary page)")
+        print(f"{script:<12} {result['import']:>18.2f} {result['cold']:>11.2f} {result['rerun'] * 1000:>9.1f} "
+              f"{'' if summary is None else f'{summary * 1000:.1f}':>17} {result['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
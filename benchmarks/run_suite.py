@@ -0,0 +1,190 @@
+"""Benchmark suite: ingestion, reconciliation and rendering on synthetic fraud scenarios.
+
+Usage:
+    python benchmarks/run_suite.py [--sizes 10000 100000 1000000] [--seed 0] [--label NAME]
+    python benchmarks/run_suite.py --compare        # diff the two most recent saved runs
+
+Each (stage, size) runs in a fresh worker process so peak RSS is per stage.
+Results are appended to benchmarks/results/history.jsonl; --compare flags
+stages whose wall time regressed by more than --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+HISTORY_FILE = os.path.join(RESULTS_DIR, "history.jsonl")
+STAGES = ["ingestion", "reconciliation", "rendering"]
+RENDER_PAGE_SIZE = 25
+
+
+def _peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _render_page(rows):
+    import streamlit as st
+    from money import format_cents
+
+    for row in rows:
+        item_id = f"recon_{row['Check #']}"
+        with st.container(border=True):
+            info_col, action_col = st.columns([3, 1])
+            with info_col:
+                st.error(f"**Check #{row['Check #']}** — {row['Reason']}")
+                st.write(f"Bank Data: **{row['Payee']}** for **{format_cents(row['Amount Cents'])}**")
+                st.text_area("Research/Email Notes:", key=f"note_{item_id}", height=70)
+            with action_col:
+                st.button("✅ Pay", key=f"pay_{item_id}")
+                st.button("🚫 Return", key=f"ret_{item_id}")
+
+
+def run_stage(stage, n_rows, seed):
+    """Runs in a worker process: build inputs (untimed), then time one stage."""
+    from ingest import load_register, read_bank_chunks
+    from reconciliation import apply_decisions, find_exceptions, prepare_register
+    from synthetic_data import generate_files
+
+    df_cust, df_bank, _ = generate_files(n_rows, seed=seed)
+    result = {"stage": stage, "rows": n_rows, "seed": seed}
+
+    if stage == "ingestion":
+        with tempfile.TemporaryDirectory() as tmp:
+            cust_path, bank_path = os.path.join(tmp, "register.csv"), os.path.join(tmp, "paid.csv")
+            df_cust.to_csv(cust_path, index=False)
+            df_bank.to_csv(bank_path, index=False)
+            del df_cust, df_bank
+            baseline = _peak_rss_mb()
+            start = time.perf_counter()
+            load_register(cust_path)
+            presented = sum(len(chunk) for chunk in read_bank_chunks(bank_path))
+            wall = time.perf_counter() - start
+        result.update(items=presented)
+    elif stage == "reconciliation":
+        baseline = _peak_rss_mb()
+        start = time.perf_counter()
+        exceptions = find_exceptions(prepare_register(df_cust), df_bank)
+        wall = time.perf_counter() - start
+        result.update(items=len(df_bank), exceptions=len(exceptions))
+    elif stage == "rendering":
+        from streamlit.testing.v1 import AppTest
+
+        exceptions = apply_decisions(find_exceptions(prepare_register(df_cust), df_bank), {})
+        page = exceptions.head(RENDER_PAGE_SIZE).astype(str).to_dict("records")
+        baseline = _peak_rss_mb()
+        start = time.perf_counter()
+        AppTest.from_function(_render_page, args=(page,), default_timeout=60).run()
+        wall = time.perf_counter() - start
+        result.update(items=len(page), exceptions=len(exceptions))
+    else:
+        raise ValueError(f"unknown stage {stage!r}")
+
+    peak = _peak_rss_mb()
+    result.update(
+        wall_s=round(wall, 4),
+        peak_rss_mb=round(peak, 1),
+        stage_rss_mb=round(max(peak - baseline, 0), 1),
+        items_per_s=round(result["items"] / wall, 1) if wall else None,
+    )
+    if "exceptions" in result and stage != "rendering":
+        result["exceptions_per_s"] = round(result["exceptions"] / wall, 1) if wall else None
+    return result
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(sizes, seed, stages, label=None):
+    run = {
+        "label": label,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": [],
+    }
+    context = get_context("spawn")
+    for n_rows in sizes:
+        for stage in stages:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(run_stage, stage, n_rows, seed).result()
+            run["results"].append(result)
+            print(f"{stage:<15} {n_rows:>9} rows  {result['wall_s']:>8.3f}s  "
+                  f"peak {result['peak_rss_mb']:>7.1f} MB (+{result['stage_rss_mb']:.1f})  "
+                  f"{result['items_per_s'] or 0:>12,.0f} items/s"
+                  + (f"  {result['exceptions_per_s']:>10,.0f} exc/s" if "exceptions_per_s" in result else ""))
+    return run
+
+
+def save_run(run):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(HISTORY_FILE, "a") as f:
+        f.write(json.dumps(run) + "\n")
+
+
+def load_history():
+    if not os.path.exists(HISTORY_FILE):
+        return []
+    with open(HISTORY_FILE) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(previous, current, threshold):
+    """Print wall-time deltas per (stage, rows); returns the number of regressions."""
+    before = {(r["stage"], r["rows"]): r for r in previous["results"]}
+    regressions = 0
+    print(f"comparing {previous['revision']} ({previous['timestamp']}) -> {current['revision']} ({current['timestamp']})")
+    for r in current["results"]:
+        old = before.get((r["stage"], r["rows"]))
+        if not old or not old["wall_s"]:
+            continue
+        change = r["wall_s"] / old["wall_s"] - 1
+        flag = "REGRESSION" if change > threshold else ""
+        regressions += bool(flag)
+        print(f"{r['stage']:<15} {r['rows']:>9} rows  {old['wall_s']:>8.3f}s -> {r['wall_s']:>8.3f}s  {change:+7.1%}  {flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--label")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="compare the two most recent saved runs")
+    parser.add_argument("--threshold", type=float, default=0.15, help="wall-time increase flagged as a regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        history = load_history()
+        if len(history) < 2:
+            sys.exit("need at least two saved runs to compare")
+        sys.exit(1 if compare(history[-2], history[-1], args.threshold) else 0)
+
+    run = run_suite(args.sizes, args.seed, args.stages, args.label)
+    if not args.no_save:
+        save_run(run)
+        print(f"saved to {os.path.relpath(HISTORY_FILE, ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
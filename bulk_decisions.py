@@ -0,0 +1,89 @@
+"""Bulk and rule-based decisions for the exception review queue.
+
+A selection is a boolean mask over the exception frame (reason category,
+amount band, payee similarity), built with vectorized column operations.
+Deciding a selection writes every item in one DecisionStore transaction,
+so clearing thousands of similar exceptions costs one write and one
+rerun instead of one per item. Auto-decision rules are named selections
+paired with the decision they imply; only PENDING items are touched, so
+an analyst's explicit decision is never overwritten.
+"""
+import numpy as np
+import pandas as pd
+
+from reconciliation import item_ids
+from review_queue import reason_type
+
+PENDING = "PENDING"
+
+
+# --- SELECTIONS ---
+def select(df_exceptions, reasons=None, min_cents=None, max_cents=None, min_score=None, max_score=None,
+           pending_only=True):
+    """Mask of exceptions in the given reason categories, amount band [min, max] and payee-score band.
+
+    Bounds left as None are open. A score band keeps only scored rows
+    (payee mismatches), since the other reasons carry no similarity.
+    """
+    mask = np.ones(len(df_exceptions), dtype=bool)
+    if reasons:
+        mask &= reason_type(df_exceptions["Reason"]).isin(reasons).to_numpy()
+    cents = df_exceptions["Amount Cents"].to_numpy(dtype="int64")
+    if min_cents is not None:
+        mask &= cents >= min_cents
+    if max_cents is not None:
+        mask &= cents <= max_cents
+    if min_score is not None or max_score is not None:
+        scores = df_exceptions["Payee Score"].to_numpy(dtype=float)
+        lower = -np.inf if min_score is None else min_score
+        upper = np.inf if max_score is None else max_score
+        mask &= (scores >= lower) & (scores <= upper)
+    if pending_only and "Status" in df_exceptions:
+        mask &= (df_exceptions["Status"] == PENDING).to_numpy()
+    return pd.Series(mask, index=df_exceptions.index)
+
+
+def suffix_only_payee(df_exceptions):
+    """Payee mismatches whose names are identical once case, punctuation and trailing legal suffixes are ignored.
+
+    The matcher scores exactly 1.0 when the normalized names agree
+    ("Acme Corp" vs "ACME, Inc."), so no names are re-normalized here.
+    """
+    return select(df_exceptions, reasons=["PAYEE MISMATCH"], min_score=1.0, pending_only=False)
+
+
+# Rule name -> (decision, selection function).
+AUTO_RULES = {
+    "Pay payees that differ only by a legal-entity suffix": ("PAID", suffix_only_payee),
+}
+
+
+# --- WRITES ---
+def decide(store, df_exceptions, mask, decision, analyst=None):
+    """Record `decision` for the selected PENDING exceptions in one transaction; returns the count."""
+    selected = df_exceptions[mask.to_numpy() & _pending(df_exceptions)]
+    if selected.empty:
+        return 0
+    return store.record_many(item_ids(selected).tolist(), decision, analyst)
+
+
+def auto_decide(store, df_exceptions, rules=None, analyst=None):
+    """Apply each auto-decision rule to the PENDING exceptions; returns {rule: items decided}.
+
+    Rules run in order and an item decided by one rule is not offered to
+    the next; each rule is one bulk write.
+    """
+    rules = AUTO_RULES if rules is None else rules
+    open_items = _pending(df_exceptions).copy()
+    decided = {}
+    for name, (decision, rule) in rules.items():
+        mask = rule(df_exceptions).to_numpy() & open_items
+        decided[name] = decide(store, df_exceptions, pd.Series(mask, index=df_exceptions.index), decision, analyst)
+        open_items &= ~mask
+    return decided
+
+
+def _pending(df_exceptions):
+    if "Status" not in df_exceptions:
+        return np.ones(len(df_exceptions), dtype=bool)
+    return (df_exceptions["Status"] == PENDING).to_numpy()
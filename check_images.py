@@ -0,0 +1,157 @@
+"""Check image service: downsampled thumbnails from a local image directory.
+
+Source scans (TIFF, PNG, JPEG) are named `<check id>_front.<ext>` and
+`<check id>_back.<ext>`, where the check id is reconciliation.check_ids:
+the check number, prefixed with `<account>_` for multi-account books,
+since check numbers are only unique within an account. Thumbnails are generated once with Pillow and kept
+on disk next to the scans, so a restart does not re-decode full-size
+images; recently viewed thumbnails are also held in a byte-bounded LRU in
+memory. `prefetch` warms both caches in background threads, e.g. for the
+next page of the review queue.
+"""
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from config import CHECK_IMAGE_DIR
+
+SIDES = ("front", "back")
+IMAGE_EXTENSIONS = (".tif", ".tiff", ".png", ".jpg", ".jpeg")
+THUMBNAIL_DIR = ".thumbnails"
+
+
+class CheckImageService:
+    """Thread-safe thumbnail source shared by all sessions."""
+
+    def __init__(self, image_dir=None, thumb_width=600, max_entries=512, max_bytes=64 * 1024 * 1024, workers=2):
+        self.image_dir = image_dir or CHECK_IMAGE_DIR
+        self.thumb_dir = os.path.join(self.image_dir, THUMBNAIL_DIR)
+        self.thumb_width = thumb_width
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._pending = set()
+        self._sources = {}
+        self._sources_mtime = None
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="check-images")
+
+    # --- SOURCE SCANS ---
+    def _source(self, check_id, side):
+        """Path of the scan for one side of a check; the directory is listed once until it changes."""
+        try:
+            mtime = os.stat(self.image_dir).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            if mtime != self._sources_mtime:
+                sources = {}
+                for entry in os.scandir(self.image_dir):
+                    stem, ext = os.path.splitext(entry.name)
+                    check, _, image_side = stem.rpartition("_")
+                    if ext.lower() in IMAGE_EXTENSIONS and image_side.lower() in SIDES:
+                        sources[(check, image_side.lower())] = entry.path
+                self._sources, self._sources_mtime = sources, mtime
+            return self._sources.get((str(check_id), side))
+
+    # --- THUMBNAILS ---
+    def thumbnail(self, check_id, side="front"):
+        """PNG thumbnail bytes, or None when no scan is on file."""
+        key = (str(check_id), side)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        source = self._source(check_id, side)
+        if source is None:
+            return None
+        data = self._disk_thumbnail(source, key)
+        self._put(key, data)
+        return data
+
+    def _disk_thumbnail(self, source, key):
+        path = os.path.join(self.thumb_dir, f"{key[0]}_{key[1]}_{self.thumb_width}.png")
+        if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(source):
+            with open(path, "rb") as f:
+                return f.read()
+
+        with Image.open(source) as image:
+            # draft() lets JPEG decode at reduced size in its own mode; other formats ignore it.
+            image.draft(image.mode, (self.thumb_width, self.thumb_width))
+            image = image.convert("L") if image.mode in ("1", "L", "I;16") else image.convert("RGB")
+            image.thumbnail((self.thumb_width, self.thumb_width * 2))
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG", optimize=True)
+        data = buffer.getvalue()
+
+        os.makedirs(self.thumb_dir, exist_ok=True)
+        # Write-then-rename so a concurrent reader never sees a partial thumbnail.
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return data
+
+    def _put(self, key, data):
+        with self._lock:
+            if key in self._entries:
+                del self._entries[key]
+                del self._sizes[key]
+            self._entries[key] = data
+            self._sizes[key] = len(data)
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.nbytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                del self._entries[oldest]
+                del self._sizes[oldest]
+                self.evictions += 1
+
+    # --- PREFETCH ---
+    def prefetch(self, check_ids, sides=SIDES):
+        """Warm the caches for these checks in the background; returns the number queued."""
+        queued = 0
+        for check_id in check_ids:
+            for side in sides:
+                key = (str(check_id), side)
+                with self._lock:
+                    if key in self._entries or key in self._pending:
+                        continue
+                    self._pending.add(key)
+                future = self._pool.submit(self._prefetch_one, key)
+                future.add_done_callback(lambda _, key=key: self._done(key))
+                queued += 1
+        return queued
+
+    def _prefetch_one(self, key):
+        source = self._source(*key)
+        if source is not None:
+            self._put(key, self._disk_thumbnail(source, key))
+
+    def _done(self, key):
+        with self._lock:
+            self._pending.discard(key)
+
+    # --- STATS ---
+    @property
+    def nbytes(self):
+        return sum(self._sizes.values())
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,11 @@
+"""Process-wide settings shared by the app, stores and batch tools."""
+import os
+
+# Root for persistent state (register Parquet partitions, decision database, ...).
+DATA_DIR = os.environ.get("POSITIVE_PAY_DATA_DIR", "data")
+
+# Scanned check images, named <check #>_front.<ext> / <check #>_back.<ext>.
+CHECK_IMAGE_DIR = os.environ.get("POSITIVE_PAY_IMAGE_DIR", os.path.join(DATA_DIR, "check_images"))
+
+# Show the instrumentation panel in the sidebar (it can also be opened with ?admin=1).
+ADMIN_PANEL = os.environ.get("POSITIVE_PAY_ADMIN") == "1"
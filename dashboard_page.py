@@ -0,0 +1,391 @@
+"""Processing Dashboard page: reconcile uploads, review and decide exceptions.
+
+Imported by app.py only when the page is first shown; the reconciliation
+job functions run on the shared worker pool and never call st.*.
+"""
+import io
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+import bulk_decisions
+import sample_data
+import services
+from bank_formats import detect_format, read_issue_file
+from check_images import SIDES
+from decision_files import pay_no_pay_bytes
+from incremental import IncrementalReconciler, changed_items
+from ingest import load_register, read_bank_chunks
+from jobs import CANCELLED, FAILED, estimate_rows, reconcile_job
+from money import format_cents
+from partitioning import account_keys, has_accounts, reconcile_accounts, screen_accounts
+from payee_match import default_matcher
+from presentment_index import merge_anomalies
+from recon_cache import content_key
+from reconciliation import apply_decisions, check_ids, item_ids, paid_file_key, tag_presentments
+from review_queue import PAGE_SIZES, filter_exceptions, page_count, paginate, reason_type, top_k
+from risk_scoring import score, vendor_history
+from snapshot_store import to_bytes, to_table
+
+instrumentation = services.get_instrumentation()
+recon_cache = services.get_recon_cache()
+register_store = services.get_register_store()
+decision_store = services.get_decision_store()
+exposure_summary = services.get_exposure_summary()
+snapshot_store = services.get_snapshot_store()
+check_images = services.get_check_images()
+presentment_index = services.get_presentment_index()
+job_manager = services.get_job_manager()
+
+IMAGE_PLACEHOLDERS = {
+    "front": "https://placehold.co/600x300/f8f9fa/333?text=FRONT-{}",
+    "back": "https://placehold.co/600x300/e9ecef/666?text=BACK-{}",
+}
+
+
+def save_note(item_id, analyst):
+    decision_store.set_note(item_id, st.session_state[f"note_{item_id}"], analyst)
+
+def publish(key, exceptions):
+    ids = item_ids(exceptions)
+    snapshot_store.write(key, exceptions, decision_store.decisions(ids), decision_store.notes(ids))
+
+# Job functions run on a worker thread: they report progress through `job` and never call st.*.
+def reconcile_upload(job, key, presentment, cust_bytes, bank_bytes, reconciler, corrects=None):
+    """`corrects` is the tagged exceptions of the upload these files correct (see upload_version)."""
+    with instrumentation.trace("Reconciliation job"):
+        if has_accounts(io.BytesIO(cust_bytes)):
+            exceptions = reconcile_accounts_upload(job, presentment, cust_bytes, bank_bytes)
+        else:
+            exceptions = reconcile_single_upload(job, presentment, cust_bytes, bank_bytes, reconciler,
+                                                 corrects is not None)
+        exceptions = tag_presentments(exceptions, presentment)
+        if corrects is not None:
+            # Same presentment as the corrected upload: only items whose row changed go back to PENDING.
+            changed = changed_items(corrects, exceptions)
+            decision_store.forget(changed)
+            job.message = f"Corrected upload: {len(changed)} changed items are PENDING again"
+        with instrumentation.stage("write snapshot", rows=len(exceptions)):
+            publish(key, exceptions)
+    recon_cache.put(key, exceptions)
+    return exceptions
+
+def reconcile_single_upload(job, presentment, cust_bytes, bank_bytes, reconciler, correction=False):
+    with instrumentation.stage("reconcile") as stage:
+        if detect_format(bank_bytes) == "csv":
+            job.report(message="Parsing and reconciling")
+            exceptions = reconciler.update_bytes(cust_bytes, bank_bytes, on_chunk=job.report, correction=correction)
+            register, presented = reconciler.register, reconciler.presented
+        else:
+            # BAI2 / X9.37 paid files are read natively and reconciled in full.
+            register = load_register(io.BytesIO(cust_bytes))
+            exceptions = reconcile_job(job, register, io.BytesIO(bank_bytes), estimate_rows(bank_bytes))
+            presented = pd.concat(read_bank_chunks(io.BytesIO(bank_bytes)), ignore_index=True)
+        stage.rows = len(presented)
+
+    exceptions = screen_presentments(job, exceptions, presented, register, presentment)
+    with instrumentation.stage("risk score", rows=len(exceptions)):
+        exceptions = score(exceptions, vendor_history(register))
+    return exceptions
+
+def screen_presentments(job, exceptions, presented, register, presentment):
+    """Merge duplicate and out-of-range presentments into the exceptions and record the paid file."""
+    job.report(message=job.message or "Screening presentments")
+    with instrumentation.stage("presentment screen", rows=len(presented)):
+        anomalies = presentment_index.screen(presented, register, source=presentment)
+        presentment_index.record(presented, source=presentment)
+    return merge_anomalies(exceptions, anomalies)
+
+def reconcile_accounts_upload(job, presentment, cust_bytes, bank_bytes):
+    # Multi-client files: each account is reconciled against its own register, in parallel.
+    job.report(message="Reading files")
+    with instrumentation.stage("read upload") as stage:
+        issued = pd.concat(read_bank_chunks(io.BytesIO(cust_bytes)), ignore_index=True)
+        presented = pd.concat(read_bank_chunks(io.BytesIO(bank_bytes)), ignore_index=True)
+        stage.rows = len(issued) + len(presented)
+    job.report(rows_total=len(presented), message="Reconciling accounts")
+    with instrumentation.stage("reconcile accounts", rows=len(presented)):
+        exceptions, timings = reconcile_accounts(issued, presented, on_account=job.report)
+    job.report(message="Screening presentments")
+    with instrumentation.stage("presentment screen", rows=len(presented)):
+        anomalies = screen_accounts(presentment_index, presented, issued, source=presentment)
+    exceptions = merge_anomalies(exceptions, anomalies)
+    with instrumentation.stage("risk score", rows=len(exceptions)):
+        exceptions = score(exceptions, vendor_history(issued))
+    # Kept on the (cached) frame so a cache hit still shows the run's timings.
+    exceptions.attrs["account_timings"] = timings
+    return exceptions
+
+def reconcile_stored(job, register_token, bank_bytes):
+    with instrumentation.trace("Reconciliation job"):
+        with instrumentation.stage("reconcile stored register"):
+            register = register_store.register()
+            exceptions = reconcile_job(job, register, io.BytesIO(bank_bytes), estimate_rows(bank_bytes))
+            presented = pd.concat(read_bank_chunks(io.BytesIO(bank_bytes)), ignore_index=True)
+        exceptions = screen_presentments(job, exceptions, presented, register, paid_file_key(bank_bytes))
+        with instrumentation.stage("risk score", rows=len(exceptions)):
+            exceptions = score(exceptions, vendor_history(register))
+        exceptions = tag_presentments(exceptions, paid_file_key(bank_bytes))
+        with instrumentation.stage("write snapshot", rows=len(exceptions)):
+            publish(content_key(register_token.encode(), bank_bytes), exceptions)
+    recon_cache.put(content_key(register_token.encode(), bank_bytes), exceptions)
+    return exceptions
+
+@st.fragment(run_every=1.0)
+def job_progress(job):
+    if job.done:
+        st.rerun()
+    progress = job.progress
+    st.progress(progress or 0.0, text=f"{job.message or 'Queued'} · {job.rows_done:,} rows · {job.elapsed:.1f}s")
+    partial = job.partial()
+    if partial is not None:
+        st.caption(f"{len(partial):,} exceptions so far (first 100 shown)")
+        preview = partial.head(100).assign(**{"Amount Cents": lambda df: format_cents(df["Amount Cents"])})
+        st.dataframe(preview.rename(columns={"Amount Cents": "Amount"}), use_container_width=True, hide_index=True)
+    if st.button("✖ Cancel", key=f"cancel_{job.key}"):
+        job.cancel()
+        st.session_state.cancelled_jobs.add(job.key)
+        st.rerun()
+
+def job_result(key, fn, *args, label=None):
+    """Submit (or join) the job for `key`; returns its result once done, otherwise shows progress and stops this run."""
+    job = job_manager.submit(key, fn, *args, label=label)
+    if key in st.session_state.cancelled_jobs or job.status in (FAILED, CANCELLED):
+        if job.status == FAILED:
+            st.error(f"Reconciliation failed: {job.error}")
+        else:
+            st.warning("Reconciliation cancelled.")
+        if st.button("↻ Restart"):
+            st.session_state.cancelled_jobs.discard(key)
+            job_manager.submit(key, fn, *args, label=label, retry=True)
+            st.rerun()
+        st.stop()
+    result = job.result
+    if result is not None:
+        if job.message and st.session_state.get('announced_job') != key:
+            st.toast(job.message)
+            st.session_state.announced_job = key
+        return result
+    job_progress(job)
+    st.stop()
+
+def upload_accounts(cust_bytes, bank_bytes):
+    """Every account in a multi-client upload (None for a single-account one), read chunk by chunk."""
+    if not has_accounts(io.BytesIO(cust_bytes)):
+        return None
+    accounts = set()
+    for data in (cust_bytes, bank_bytes):
+        for chunk in read_bank_chunks(io.BytesIO(data)):
+            accounts.update(account_keys(chunk).unique())
+    return sorted(accounts)
+
+def upload_version(bank_name, cust_bytes, bank_bytes):
+    """Cache key and presentment of the uploaded files, and the exceptions they correct (or None).
+
+    A paid file uploaded again under the previous upload's name can be
+    marked as a corrected version: it keeps that upload's presentment, so
+    items whose reason and amount are unchanged keep their decisions.
+    Anything else is a new presentment, reconciled in full.
+    """
+    files_key = content_key(cust_bytes, bank_bytes)
+    previous = st.session_state.get('last_upload')
+    if previous is not None and previous["files_key"] == files_key:
+        return previous
+    upload = {"bank_name": bank_name, "files_key": files_key, "key": files_key,
+              "presentment": paid_file_key(bank_bytes), "corrects": None}
+    if previous is not None and previous["bank_name"] == bank_name and st.checkbox(
+            f"This is a corrected version of the previous {bank_name} (keep decisions on unchanged items)"):
+        presentment = previous["presentment"]
+        upload.update(key=content_key(cust_bytes, bank_bytes, presentment=presentment),
+                      presentment=presentment, corrects=previous["exceptions"])
+    return upload
+
+
+def render(analyst):
+    # --- INCREMENTAL RECONCILIATION (per session: diffs re-uploads against the last version) ---
+    if 'reconciler' not in st.session_state:
+        st.session_state.reconciler = IncrementalReconciler()
+    if 'cancelled_jobs' not in st.session_state:
+        st.session_state.cancelled_jobs = set()
+
+    st.title("🛡️ Positive Pay Management")
+    
+    with st.expander("🛠️ Step 1: Download 20 Fraud Scenarios", expanded=True):
+        st.write("Click both buttons to get the testing files containing varied fraud types.")
+        c1, c2 = st.columns(2)
+        c1.download_button("📥 Download Customer Register", sample_data.FRAUD_REGISTER_CSV, "customer_register.csv",
+                           on_click="ignore")
+        c2.download_button("📥 Download Bank Activity", sample_data.FRAUD_PAID_CSV, "bank_paid_file.csv",
+                           on_click="ignore")
+
+    st.divider()
+    issued_source = st.radio("Issued Checks Source", ["Upload file", "Stored register"], horizontal=True)
+    col_a, col_b = st.columns(2)
+    cust_file = None
+    if issued_source == "Upload file":
+        cust_file = col_a.file_uploader("Upload Customer Issued File", type="csv")
+    else:
+        with col_a:
+            issue_file = st.file_uploader("Append Daily Issue File (CSV or fixed-width)", type=["csv", "txt", "dat"])
+            issue_date = st.date_input("Issue Date")
+            if issue_file and st.button("➕ Append to Register"):
+                issued = pd.read_csv(issue_file) if issue_file.name.lower().endswith(".csv") else read_issue_file(issue_file)
+                added = register_store.append(issued, issue_date=issue_date)
+                st.success(f"Appended {added} issued checks.")
+            st.caption(f"{len(register_store.register())} checks on file in the stored register")
+    bank_file = col_b.file_uploader("Upload Bank Activity File (CSV, BAI2 or X9.37)", type=["csv", "bai", "bai2", "x937", "x9"])
+
+    if bank_file and (cust_file or issued_source == "Stored register"):
+        bank_bytes = bank_file.getvalue()
+        with instrumentation.stage("reconciliation cache") as stage:
+            if cust_file:
+                cust_bytes = cust_file.getvalue()
+                upload = upload_version(bank_file.name, cust_bytes, bank_bytes)
+                key, presentment = upload["key"], upload["presentment"]
+                raw_exceptions = recon_cache.lookup(key)
+            else:
+                register_token = register_store.version()
+                key, presentment = content_key(register_token.encode(), bank_bytes), paid_file_key(bank_bytes)
+                raw_exceptions = recon_cache.lookup(key)
+            if raw_exceptions is None:
+                # Reconciled before by another process (or before a restart): map its snapshot.
+                raw_exceptions = snapshot_store.exceptions(key, statused=False)
+                if raw_exceptions is not None:
+                    recon_cache.put(key, raw_exceptions)
+            stage.rows = None if raw_exceptions is None else len(raw_exceptions)
+        if raw_exceptions is None:
+            # A miss runs on the job pool; this run shows progress and stops until the job is done.
+            if cust_file:
+                raw_exceptions = job_result(key, reconcile_upload, key, presentment, cust_bytes, bank_bytes,
+                                            st.session_state.reconciler, upload["corrects"],
+                                            label=f"{cust_file.name} × {bank_file.name}")
+            else:
+                raw_exceptions = job_result(key, reconcile_stored, register_token, bank_bytes, label=bank_file.name)
+        if cust_file:
+            st.session_state.last_upload = {**upload, "corrects": None, "exceptions": raw_exceptions}
+        # Cache hits return the same frame, so the aggregates are only synced when a result is new.
+        if st.session_state.get('summarized_exceptions') is not raw_exceptions:
+            with instrumentation.stage("exposure sync", rows=len(raw_exceptions)):
+                # Accounts left without exceptions (e.g. after a correction) are cleared too.
+                accounts = upload_accounts(cust_bytes, bank_bytes) if cust_file else None
+                exposure_summary.record_exceptions(raw_exceptions, presentment, accounts=accounts)
+            st.session_state.summarized_exceptions = raw_exceptions
+        with instrumentation.stage("apply decisions", rows=len(raw_exceptions)):
+            df_exceptions = apply_decisions(raw_exceptions, decision_store.decisions(item_ids(raw_exceptions)))
+
+        st.subheader(f"🔍 Found {len(df_exceptions)} Exceptions")
+        e1, e2 = st.columns(2)
+        e1.download_button(
+            "⬇ Snapshot with decisions (.arrow)",
+            lambda: to_bytes(to_table(df_exceptions, notes=decision_store.notes(item_ids(df_exceptions)))),
+            file_name=f"exceptions_{key[:12]}.arrow", mime="application/vnd.apache.arrow.file", on_click="ignore",
+        )
+        # Built from the live decisions when clicked, so the file reflects every decision up to the cut-off.
+        e2.download_button(
+            "📤 Pay/no-pay file (.csv)", lambda: pay_no_pay_bytes(raw_exceptions, decision_store),
+            file_name=f"pay_no_pay_{date.today():%Y%m%d}.csv", mime="text/csv", on_click="ignore",
+        )
+        account_timings = raw_exceptions.attrs.get("account_timings")
+        if account_timings is not None:
+            with st.expander(f"🏦 {len(account_timings)} accounts reconciled"):
+                st.dataframe(account_timings, use_container_width=True, hide_index=True)
+
+        # --- REVIEW QUEUE FILTERS & PAGINATION ---
+        f1, f2, f3 = st.columns([2, 2, 1])
+        reason_filter = f1.multiselect("Reason", sorted(reason_type(df_exceptions['Reason']).unique()))
+        status_filter = f2.multiselect("Status", sorted(df_exceptions['Status'].unique()))
+        page_size = f3.selectbox("Page size", PAGE_SIZES, index=1)
+        account_filter = None
+        if 'Account' in df_exceptions:
+            account_filter = st.multiselect("Account", sorted(df_exceptions['Account'].unique()))
+
+        with instrumentation.stage("review queue", rows=len(df_exceptions)):
+            df_queue = filter_exceptions(df_exceptions, reason_filter, status_filter, account_filter)
+            n_pages = page_count(len(df_queue), page_size)
+            page_num = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, step=1)
+            # Highest risk first: only the rows up to the next page are ranked, not the whole queue.
+            df_ranked = top_k(df_queue, (page_num + 1) * page_size)
+            df_page = paginate(df_ranked, page_num, page_size)
+            st.caption(f"Showing {len(df_page)} of {len(df_queue)} matching exceptions, highest risk first")
+            page_notes = decision_store.notes(item_ids(df_page))
+            if page_num < n_pages:
+                check_images.prefetch(check_ids(paginate(df_ranked, page_num + 1, page_size)))
+
+        # --- BULK DECISIONS (one write and one rerun for a whole selection) ---
+        with st.expander("⚡ Bulk decisions"):
+            st.caption("Applies to the PENDING exceptions matching the filters above, narrowed below.")
+            b1, b2, b3 = st.columns(3)
+            min_amount = b1.number_input("Min amount ($)", min_value=0.0, value=0.0, step=100.0)
+            max_amount = b2.number_input("Max amount ($, 0 = no limit)", min_value=0.0, value=0.0, step=100.0)
+            score_band = b3.slider("Payee similarity", 0.0, 1.0, (0.0, 1.0), step=0.05)
+            scored = score_band != (0.0, 1.0)
+            with instrumentation.stage("bulk selection", rows=len(df_queue)):
+                selection = bulk_decisions.select(
+                    df_queue,
+                    min_cents=round(min_amount * 100) if min_amount else None,
+                    max_cents=round(max_amount * 100) if max_amount else None,
+                    min_score=score_band[0] if scored else None,
+                    max_score=score_band[1] if scored else None,
+                )
+            n_selected = int(selection.sum())
+            selected_cents = int(df_queue['Amount Cents'][selection].sum())
+            st.write(f"**{n_selected:,}** exceptions selected · **{format_cents(selected_cents)}**")
+            p_col, r_col = st.columns(2)
+            for column, decision, label in ((p_col, "PAID", "✅ Pay"), (r_col, "RETURNED", "🚫 Return")):
+                if column.button(f"{label} all {n_selected:,}", key=f"bulk_{decision}", disabled=not n_selected,
+                                 use_container_width=True):
+                    with instrumentation.stage("bulk decision", rows=n_selected):
+                        decided = bulk_decisions.decide(decision_store, df_queue, selection, decision, analyst)
+                    st.toast(f"{decided:,} exceptions marked {decision}")
+                    st.rerun()
+
+            st.markdown("**Auto-decision rules** (whole run, PENDING items only)")
+            for name, (decision, rule) in bulk_decisions.AUTO_RULES.items():
+                matches = int((rule(df_exceptions) & (df_exceptions['Status'] == "PENDING")).sum())
+                st.caption(f"{name}: {matches:,} pending → {decision}")
+            if st.button("🤖 Run auto-decision rules", key="auto_decide"):
+                with instrumentation.stage("auto decision", rows=len(df_exceptions)):
+                    decided = bulk_decisions.auto_decide(decision_store, df_exceptions, analyst=analyst)
+                st.toast(f"{sum(decided.values()):,} exceptions auto-decided")
+                st.rerun()
+
+        with instrumentation.stage("render page", rows=len(df_page)):
+            for item_id, check_id, (_, row) in zip(item_ids(df_page), check_ids(df_page), df_page.iterrows()):
+                check_num = row['Check #']
+
+                with st.container(border=True):
+                    info_col, action_col = st.columns([3, 1])
+                    with info_col:
+                        account_label = f"{row['Account']} · " if 'Account' in row else ""
+                        st.error(f"**{account_label}Check #{check_num}** — {row['Reason']}")
+                        st.write(f"Bank Data: **{row['Payee']}** for **{format_cents(row['Amount Cents'])}** · "
+                                 f"Risk score **{row['Risk Score']:.1f}**")
+                        if pd.notna(row['Payee Score']):
+                            triage = default_matcher.triage([row['Payee Score']])[0]
+                            st.caption(f"Payee similarity: {row['Payee Score']:.2f} ({triage})")
+                    
+                        st.text_area(
+                            "Research/Email Notes:", value=page_notes.get(item_id, ""), key=f"note_{item_id}", height=70,
+                            on_change=save_note, args=(item_id, analyst)
+                        )
+                    
+                        # Images load only once the expander is opened.
+                        with st.expander("👁️ View Check Images", key=f"img_{item_id}", on_change="rerun") as images:
+                            if images.open:
+                                for image_col, side in zip(st.columns(2), SIDES):
+                                    thumb = check_images.thumbnail(check_id, side)
+                                    image_col.image(
+                                        thumb if thumb is not None else IMAGE_PLACEHOLDERS[side].format(check_num),
+                                        use_container_width=True,
+                                    )
+                
+                    with action_col:
+                        if row['Status'] == "PENDING":
+                            if st.button("✅ Pay", key=f"pay_{item_id}", use_container_width=True):
+                                decision_store.record(item_id, "PAID", analyst); st.rerun()
+                            if st.button("🚫 Return", key=f"ret_{item_id}", use_container_width=True):
+                                decision_store.record(item_id, "RETURNED", analyst); st.rerun()
+                        else:
+                            st.info(f"Decision: {row['Status']}")
+
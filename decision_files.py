@@ -0,0 +1,308 @@
+"""Bank decision files for the cut-off: check pay/no-pay and NACHA ACH returns.
+
+Final analyst decisions are joined to the exceptions and written out in
+chunks, so memory stays flat however many items are decided:
+
+    pay/no-pay    CSV, one row per decided check exception (Account,
+                  Check #, Amount, Decision PAY / RETURN, Reason),
+                  read from an exception snapshot or frame
+    ACH returns   NACHA return file: a return entry (transaction code 26
+                  or 36) plus a 99 addenda per rejected debit, read
+                  straight from the original NACHA file
+
+Each chunk looks up its own decisions in the DecisionStore and is
+formatted with vectorized string operations; no per-item Python loop
+runs. Undecided exceptions are left out (the bank applies its default)
+unless `default` names the decision to send for them.
+
+Usage:
+    python decision_files.py pay-no-pay SNAPSHOT.arrow OUT.csv [--default RETURNED]
+    python decision_files.py ach-returns ACH_FILE OUT.ach --routing 011000015 --destination 011000015
+"""
+import argparse
+import io
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from bank_formats import DEFAULT_CHUNKSIZE, NACHA_RECORD_LENGTH, read_nacha_chunks
+from decision_store import DecisionStore
+from reconciliation import ACCOUNT_COLUMN, PRESENTMENT_COLUMN, item_ids
+from register_store import DEFAULT_ACCOUNT
+from snapshot_store import read_table, to_frame
+
+PAY_NO_PAY_COLUMNS = ["Account", "Check #", "Amount", "Decision", "Reason"]
+PAY_NO_PAY_SOURCE_COLUMNS = [ACCOUNT_COLUMN, "Check #", "Amount Cents", "Reason", "Status", PRESENTMENT_COLUMN]
+
+# Review decisions -> bank instructions.
+CHECK_INSTRUCTIONS = {"PAID": "PAY", "RETURNED": "RETURN"}
+ACH_RETURN_DECISION = "REJECTED"
+
+# R29: corporate customer advises the debit is not authorized (the ACH positive pay return).
+DEFAULT_RETURN_REASON = "R29"
+
+NACHA_BLOCKING_FACTOR = 10
+
+
+# --- SHARED ---
+@contextmanager
+def _open_text(dest):
+    if hasattr(dest, "write"):
+        yield dest
+    else:
+        with open(dest, "w", newline="", encoding="ascii", errors="replace") as handle:
+            yield handle
+
+
+def _dollars(cents):
+    """int64 cents as plain "1234.56" text (no symbol or separators), vectorized."""
+    cents = np.asarray(cents, dtype=np.int64)
+    whole = (np.abs(cents) // 100).astype("U")
+    fraction = np.char.zfill((np.abs(cents) % 100).astype("U"), 2)
+    return np.char.add(np.char.add(np.where(cents < 0, "-", ""), whole), np.char.add(".", fraction))
+
+
+def iter_exception_chunks(source, chunksize=DEFAULT_CHUNKSIZE, columns=None):
+    """Exception frames from a snapshot path, an Arrow table or a DataFrame, `chunksize` rows at a time.
+
+    `columns` limits what is converted from a snapshot (missing ones are skipped).
+    """
+    if isinstance(source, (str, os.PathLike)):
+        source = read_table(source)
+    if isinstance(source, pa.Table):
+        if columns is not None:
+            source = source.select([column for column in columns if column in source.column_names])
+        for batch in source.to_batches(max_chunksize=chunksize):
+            yield to_frame(pa.Table.from_batches([batch], schema=source.schema))
+        return
+    for start in range(0, len(source), chunksize):
+        yield source.iloc[start:start + chunksize]
+
+
+# --- CHECK PAY / NO-PAY ---
+def write_pay_no_pay(source, dest, store=None, default=None, account=DEFAULT_ACCOUNT, chunksize=DEFAULT_CHUNKSIZE):
+    """Stream the pay/no-pay file for check exceptions; returns counts per instruction.
+
+    Decisions come from `store` when given (the live DecisionStore at
+    cut-off), otherwise from the Status column of a snapshot. `account`
+    labels exceptions that carry no Account column.
+    """
+    counts = {"PAY": 0, "RETURN": 0, "UNDECIDED": 0}
+    with _open_text(dest) as out:
+        out.write(",".join(PAY_NO_PAY_COLUMNS) + "\n")
+        for chunk in iter_exception_chunks(source, chunksize, PAY_NO_PAY_SOURCE_COLUMNS):
+            ids = item_ids(chunk)
+            if store is not None:
+                status = ids.map(store.decisions(ids)).to_numpy(dtype=object)
+            else:
+                status = chunk["Status"].to_numpy(dtype=object)
+            status = np.where(pd.isna(status) | (status == "PENDING"), default, status)
+            instruction = pd.Series(status).map(CHECK_INSTRUCTIONS).to_numpy(dtype=object)
+            decided = pd.notna(instruction)
+            counts["UNDECIDED"] += int((~decided).sum())
+            if not decided.any():
+                continue
+            rows = chunk[decided]
+            accounts = rows[ACCOUNT_COLUMN].astype(str).to_numpy() if ACCOUNT_COLUMN in rows else account
+            pd.DataFrame({
+                "Account": accounts,
+                "Check #": rows["Check #"].astype(str).to_numpy(),
+                "Amount": _dollars(rows["Amount Cents"]),
+                "Decision": instruction[decided],
+                "Reason": rows["Reason"].astype(str).to_numpy(),
+            }).to_csv(out, header=False, index=False)
+            for value, n in zip(*np.unique(instruction[decided].astype(str), return_counts=True)):
+                counts[value] += int(n)
+    return counts
+
+
+# --- ACH RETURNS (NACHA) ---
+def _check_digit(routing8):
+    """ABA check digit for 8-digit routing prefixes (vectorized over a Series of digit strings)."""
+    digits = np.array([list(map(int, r)) for r in routing8.unique()], dtype=np.int64).reshape(-1, 8)
+    weights = np.array([3, 7, 1, 3, 7, 1, 3, 7])
+    check = (10 - digits @ weights % 10) % 10
+    lookup = dict(zip(routing8.unique(), check.astype(str)))
+    return routing8.map(lookup)
+
+
+def _fixed(values, width, align="<"):
+    text = pd.Series(values, copy=False).astype(str).str.slice(0, width)
+    return text.str.ljust(width) if align == "<" else text.str.rjust(width, "0")
+
+
+class NachaReturnWriter:
+    """Writes a NACHA return file incrementally: batches are closed as the originating batch changes.
+
+    Returned debits keep the order of the original file, where each
+    originator batch is contiguous, so one pass needs only the running
+    batch and file totals.
+    """
+
+    def __init__(self, out, routing, destination, origin_name="RETURNING BANK", destination_name="ACH OPERATOR",
+                 return_reason=DEFAULT_RETURN_REASON, created=None):
+        self.out = out
+        self.routing = str(routing).zfill(9)
+        self.return_reason = return_reason
+        self.created = created or datetime.now()
+        self.batches = 0
+        self.entries = 0
+        self.lines = 0
+        self.entry_hash = 0
+        self.debit_cents = 0
+        self._batch = None
+        self._write([
+            f"101 {str(destination).zfill(9)} {self.routing}{self.created:%y%m%d%H%M}A094101"
+            f"{destination_name[:23]:<23}{origin_name[:23]:<23}{'':8}"
+        ])
+
+    def _write(self, lines):
+        self.out.write("\n".join(lines) + "\n")
+        self.lines += len(lines)
+
+    def write_returns(self, debits):
+        """Append return entries for these debits (NACHA reader columns), in file order."""
+        if debits.empty:
+            return
+        n = len(debits)
+        trace = debits["Trace Number"].astype(str).str.zfill(15)
+        odfi = trace.str.slice(0, 8)
+        sequence = pd.Series(np.arange(self.entries + 1, self.entries + n + 1)).astype(str).str.zfill(7)
+        return_trace = (self.routing[:8] + sequence).to_numpy(dtype=object)
+        code = debits["Transaction Code"].astype(str).map({"27": "26", "37": "36"}).fillna("26").to_numpy(dtype=object)
+        entry = (
+            "6" + pd.Series(code) + odfi.to_numpy(dtype=object) + _check_digit(odfi).to_numpy(dtype=object)
+            + _fixed(debits["DFI Account"].to_numpy(), 17).to_numpy(dtype=object)
+            + _fixed(debits["Amount Cents"].to_numpy(), 10, ">").to_numpy(dtype=object)
+            + _fixed(debits["Individual ID"].to_numpy(), 15).to_numpy(dtype=object)
+            + _fixed(debits["Receiver"].fillna("").to_numpy(), 22).to_numpy(dtype=object)
+            + "  1" + return_trace
+        )
+        addenda = (
+            f"799{self.return_reason:<3}" + trace.to_numpy(dtype=object) + " " * 6 + self.routing[:8]
+            + " " * 44 + return_trace
+        )
+        lines = np.empty(2 * n, dtype=object)
+        lines[0::2] = entry.to_numpy(dtype=object)
+        lines[1::2] = addenda
+
+        # Runs of the same originator batch (company, SEC code, effective date) become one return batch.
+        company = debits["ID"].astype(str)
+        sec = debits["SEC Code"].astype(str)
+        # Formatted once per distinct date; a file has only a handful.
+        codes, dates = pd.factorize(pd.to_datetime(debits["Effective Date"]))
+        effective = pd.Series(np.append(dates.strftime("%y%m%d").to_numpy(dtype=object), "")[codes], dtype=str)
+        keys = (company + "|" + sec + "|" + effective).to_numpy(dtype=object)
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        stops = np.r_[starts[1:], n]
+        hashes = np.add.reduceat(odfi.astype(np.int64).to_numpy(), starts)
+        cents = np.add.reduceat(debits["Amount Cents"].to_numpy(dtype=np.int64), starts)
+        heads = zip(keys[starts], debits["Vendor"].astype(str).to_numpy()[starts], company.to_numpy()[starts],
+                    sec.to_numpy()[starts], effective.to_numpy()[starts])
+        for start, stop, head, run_hash, run_cents in zip(starts, stops, heads, hashes, cents):
+            if self._batch is None or self._batch["key"] != head[0]:
+                self._close_batch()
+                self._open_batch(*head)
+            self._write(lines[2 * start:2 * stop])
+            batch = self._batch
+            batch["entries"] += 2 * (stop - start)
+            batch["hash"] += int(run_hash)
+            batch["cents"] += int(run_cents)
+        self.entries += n
+
+    def _open_batch(self, key, vendor, company, sec, effective):
+        self.batches += 1
+        self._write([
+            f"5225{vendor[:16]:<16}{'':20}{company[:10]:<10}{sec[:3]:<3}"
+            f"{'RETURN':<10}{'':6}{effective:<6}{'':3}1{self.routing[:8]}{self.batches:07d}"
+        ])
+        self._batch = {"key": key, "company": company, "entries": 0, "hash": 0, "cents": 0}
+
+    def _close_batch(self):
+        batch = self._batch
+        if batch is None:
+            return
+        self._write([
+            f"8225{batch['entries']:06d}{batch['hash'] % 10**10:010d}{batch['cents']:012d}{0:012d}"
+            f"{batch['company'][:10]:<10}{'':19}{'':6}{self.routing[:8]}{self.batches:07d}"
+        ])
+        self.entry_hash += batch["hash"]
+        self.debit_cents += batch["cents"]
+        self._batch = None
+
+    def close(self):
+        """Close the open batch, write the file control record and pad to a full block."""
+        self._close_batch()
+        blocks = -(-(self.lines + 1) // NACHA_BLOCKING_FACTOR)
+        self._write([
+            f"9{self.batches:06d}{blocks:06d}{2 * self.entries:08d}{self.entry_hash % 10**10:010d}"
+            f"{self.debit_cents:012d}{0:012d}{'':39}"
+        ])
+        padding = blocks * NACHA_BLOCKING_FACTOR - self.lines
+        if padding:
+            self._write(["9" * NACHA_RECORD_LENGTH] * padding)
+
+
+def write_ach_returns(ach_source, dest, routing, destination, store=None, decisions=None,
+                      return_reason=DEFAULT_RETURN_REASON, chunksize=DEFAULT_CHUNKSIZE, **names):
+    """Stream a NACHA return file for debits whose originator was REJECTED; returns entries written.
+
+    ACH decisions are keyed "ach_<Company ID>" (as in the review screens),
+    so every debit from a rejected originator in `ach_source` is returned.
+    `decisions` (item id -> decision) overrides the DecisionStore lookup.
+    """
+    if decisions is None:
+        store = store or DecisionStore()
+    with _open_text(dest) as out:
+        writer = NachaReturnWriter(out, routing, destination, return_reason=return_reason, **names)
+        for chunk in read_nacha_chunks(ach_source, chunksize):
+            ids = "ach_" + chunk["ID"].astype(str)
+            chunk_decisions = decisions if decisions is not None else store.decisions(ids.unique())
+            rejected = (ids.map(chunk_decisions) == ACH_RETURN_DECISION).to_numpy()
+            writer.write_returns(chunk[rejected].reset_index(drop=True))
+        writer.close()
+    return writer.entries
+
+
+def pay_no_pay_bytes(source, store=None, default=None, account=DEFAULT_ACCOUNT):
+    """The pay/no-pay file in memory (for a download button)."""
+    out = io.StringIO()
+    write_pay_no_pay(source, out, store, default, account)
+    return out.getvalue().encode("ascii", errors="replace")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    checks = commands.add_parser("pay-no-pay", help="check pay/no-pay CSV from an exception snapshot")
+    checks.add_argument("snapshot")
+    checks.add_argument("output")
+    checks.add_argument("--default", choices=sorted(CHECK_INSTRUCTIONS), help="decision for undecided items")
+    checks.add_argument("--account", default=DEFAULT_ACCOUNT)
+    returns = commands.add_parser("ach-returns", help="NACHA return file for rejected originators")
+    returns.add_argument("ach_file")
+    returns.add_argument("output")
+    returns.add_argument("--routing", required=True, help="this bank's routing number (immediate origin)")
+    returns.add_argument("--destination", required=True, help="ACH operator routing number")
+    returns.add_argument("--reason", default=DEFAULT_RETURN_REASON, help="NACHA return reason code")
+    args = parser.parse_args(argv)
+
+    store = DecisionStore()
+    if args.command == "pay-no-pay":
+        counts = write_pay_no_pay(args.snapshot, args.output, store, args.default, args.account)
+        print(f"{counts['PAY']} pay / {counts['RETURN']} return instructions "
+              f"({counts['UNDECIDED']} undecided left out) written to {args.output}")
+    else:
+        entries = write_ach_returns(args.ach_file, args.output, args.routing, args.destination, store,
+                                    return_reason=args.reason)
+        print(f"{entries} ACH return entries written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
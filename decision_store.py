@@ -0,0 +1,144 @@
+"""Durable analyst decisions and notes in an embedded SQLite database.
+
+The database runs in WAL mode so many analyst sessions (and the batch
+tools) can read while one writes. Current decisions and notes are keyed
+by item id; every decision is also appended to an audit log recording
+who decided what and when.
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from config import DATA_DIR
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decisions (
+    item_id    TEXT PRIMARY KEY,
+    decision   TEXT NOT NULL,
+    analyst    TEXT,
+    decided_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS notes (
+    item_id    TEXT PRIMARY KEY,
+    note       TEXT NOT NULL,
+    analyst    TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS decision_log (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    item_id    TEXT NOT NULL,
+    decision   TEXT NOT NULL,
+    analyst    TEXT,
+    decided_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS decision_log_item ON decision_log (item_id);
+"""
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+class DecisionStore:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(DATA_DIR, "decisions.db")
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        # One connection per thread; Streamlit serves each session from its own thread.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # --- WRITES ---
+    def record(self, item_id, decision, analyst=None):
+        self.record_many([item_id], decision, analyst)
+
+    def record_many(self, item_ids, decision, analyst=None):
+        """Apply one decision to many items in a single transaction."""
+        stamp = _now()
+        rows = [(str(item_id), decision, analyst, stamp) for item_id in item_ids]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO decisions (item_id, decision, analyst, decided_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(item_id) DO UPDATE SET decision=excluded.decision, "
+                "analyst=excluded.analyst, decided_at=excluded.decided_at",
+                rows,
+            )
+            conn.executemany(
+                "INSERT INTO decision_log (item_id, decision, analyst, decided_at) VALUES (?, ?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def set_note(self, item_id, note, analyst=None):
+        with self._connect() as conn:
+            if note:
+                conn.execute(
+                    "INSERT INTO notes (item_id, note, analyst, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(item_id) DO UPDATE SET note=excluded.note, "
+                    "analyst=excluded.analyst, updated_at=excluded.updated_at",
+                    (str(item_id), note, analyst, _now()),
+                )
+            else:
+                conn.execute("DELETE FROM notes WHERE item_id = ?", (str(item_id),))
+
+    def forget(self, item_ids):
+        """Drop current decisions and notes for these items (the audit log is kept)."""
+        rows = [(str(item_id),) for item_id in item_ids]
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM decisions WHERE item_id = ?", rows)
+            conn.executemany("DELETE FROM notes WHERE item_id = ?", rows)
+
+    def clear(self):
+        """Drop every current decision and note; the audit log is append-only and kept."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM decisions")
+            conn.execute("DELETE FROM notes")
+
+    # --- READS ---
+    def decisions(self, item_ids=None):
+        """Current decision per item id, as a Series indexed by item id (one bulk query)."""
+        frame = self._lookup("decisions", ["item_id", "decision"], item_ids)
+        return frame.set_index("item_id")["decision"]
+
+    def notes(self, item_ids=None):
+        frame = self._lookup("notes", ["item_id", "note"], item_ids)
+        return frame.set_index("item_id")["note"]
+
+    def audit_log(self, limit=500, item_ids=None):
+        """Most recent decisions first (only for `item_ids` when given): who decided what and when."""
+        where, params = "", (limit,)
+        if item_ids is not None:
+            where = "WHERE item_id IN (SELECT value FROM json_each(?)) "
+            params = (json.dumps(pd.Series(item_ids, copy=False).astype(str).tolist()), limit)
+        return pd.read_sql_query(
+            "SELECT decided_at AS Timestamp, item_id AS Item, decision AS Decision, analyst AS Analyst "
+            f"FROM decision_log {where}ORDER BY id DESC LIMIT ?",
+            self._connect(), params=params,
+        )
+
+    def _lookup(self, table, columns, item_ids):
+        conn = self._connect()
+        select = ", ".join(f"t.{column}" for column in columns)
+        if item_ids is None:
+            rows = conn.execute(f"SELECT {select} FROM {table} t").fetchall()
+        else:
+            # One statement joined against a JSON array of the ids, not one query or insert per item.
+            ids = json.dumps(pd.Series(item_ids, copy=False).astype(str).tolist())
+            rows = conn.execute(
+                f"SELECT {select} FROM json_each(?) j JOIN {table} t ON t.item_id = j.value", (ids,)
+            ).fetchall()
+        # Repeated ids in the request would repeat rows.
+        return pd.DataFrame(rows, columns=columns).drop_duplicates(columns[0])
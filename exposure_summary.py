@@ -0,0 +1,202 @@
+"""Running exposure aggregates for the executive summary.
+
+Every reconciled exception is kept as one row (item, account, day, source
+paid file, reason category, amount, status) in the decision database.
+SQLite triggers fold each insert, update and delete into a small totals
+table keyed by (day, account, reason, status), and triggers on the
+decisions table move items between statuses as analysts decide them.
+Dashboards therefore read a few hundred pre-aggregated rows, whatever the
+history length, and never re-reconcile a file.
+"""
+import os
+import sqlite3
+import threading
+from datetime import date
+
+import pandas as pd
+
+from config import DATA_DIR
+from decision_store import SCHEMA as DECISION_SCHEMA
+from reconciliation import ACCOUNT_COLUMN, item_ids
+from register_store import DEFAULT_ACCOUNT
+from review_queue import reason_type
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS exposure_items (
+    account      TEXT NOT NULL,
+    item_id      TEXT NOT NULL,
+    day          TEXT NOT NULL,
+    reason       TEXT NOT NULL,
+    amount_cents INTEGER NOT NULL,
+    status       TEXT NOT NULL,
+    source       TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (account, item_id)
+);
+CREATE INDEX IF NOT EXISTS exposure_items_day ON exposure_items (account, day);
+CREATE INDEX IF NOT EXISTS exposure_items_item ON exposure_items (item_id);
+CREATE TABLE IF NOT EXISTS exposure_totals (
+    day     TEXT NOT NULL,
+    account TEXT NOT NULL,
+    reason  TEXT NOT NULL,
+    status  TEXT NOT NULL,
+    items   INTEGER NOT NULL,
+    cents   INTEGER NOT NULL,
+    PRIMARY KEY (day, account, reason, status)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS exposure_items_insert AFTER INSERT ON exposure_items BEGIN
+    INSERT INTO exposure_totals VALUES (NEW.day, NEW.account, NEW.reason, NEW.status, 1, NEW.amount_cents)
+    ON CONFLICT DO UPDATE SET items = items + 1, cents = cents + excluded.cents;
+END;
+CREATE TRIGGER IF NOT EXISTS exposure_items_delete AFTER DELETE ON exposure_items BEGIN
+    UPDATE exposure_totals SET items = items - 1, cents = cents - OLD.amount_cents
+    WHERE day = OLD.day AND account = OLD.account AND reason = OLD.reason AND status = OLD.status;
+END;
+CREATE TRIGGER IF NOT EXISTS exposure_items_update AFTER UPDATE ON exposure_items BEGIN
+    UPDATE exposure_totals SET items = items - 1, cents = cents - OLD.amount_cents
+    WHERE day = OLD.day AND account = OLD.account AND reason = OLD.reason AND status = OLD.status;
+    INSERT INTO exposure_totals VALUES (NEW.day, NEW.account, NEW.reason, NEW.status, 1, NEW.amount_cents)
+    ON CONFLICT DO UPDATE SET items = items + 1, cents = cents + excluded.cents;
+END;
+
+CREATE TRIGGER IF NOT EXISTS decisions_exposure_insert AFTER INSERT ON decisions BEGIN
+    UPDATE exposure_items SET status = NEW.decision WHERE item_id = NEW.item_id AND status IS NOT NEW.decision;
+END;
+CREATE TRIGGER IF NOT EXISTS decisions_exposure_update AFTER UPDATE OF decision ON decisions BEGIN
+    UPDATE exposure_items SET status = NEW.decision WHERE item_id = NEW.item_id AND status IS NOT NEW.decision;
+END;
+CREATE TRIGGER IF NOT EXISTS decisions_exposure_delete AFTER DELETE ON decisions BEGIN
+    UPDATE exposure_items SET status = 'PENDING' WHERE item_id = OLD.item_id AND status != 'PENDING';
+END;
+"""
+
+DIMENSIONS = {"Reason": "reason", "Status": "status", "Account": "account", "Day": "day"}
+
+
+class ExposureSummary:
+    """Exposure totals kept in the same SQLite file as the DecisionStore."""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(DATA_DIR, "decisions.db")
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(DECISION_SCHEMA + SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # --- WRITES ---
+    def record_exceptions(self, df_exceptions, source, account=DEFAULT_ACCOUNT, day=None, accounts=None):
+        """Make the stored exceptions of one paid file for each (account, day) match `df_exceptions`.
+
+        `source` names the paid file (its presentment key, see
+        reconciliation.paid_file_key); other paid files reconciled the same
+        day keep their items. Exceptions with an Account column are
+        recorded under their own accounts; `accounts` lists every account
+        the run covered (default: those in the frame, else `account`) so
+        that accounts left with no exceptions are cleared too. Only changed
+        items touch the totals: unchanged rows are skipped and items no
+        longer flagged (e.g. after a corrected upload) are removed.
+        """
+        day = (day or date.today()).isoformat()
+        if ACCOUNT_COLUMN in df_exceptions:
+            row_accounts = df_exceptions[ACCOUNT_COLUMN].astype(str)
+        else:
+            row_accounts = pd.Series(account, index=df_exceptions.index, dtype=object)
+        if accounts is None:
+            accounts = row_accounts.unique() if ACCOUNT_COLUMN in df_exceptions else [account]
+        rows = zip(
+            row_accounts.tolist(), item_ids(df_exceptions), reason_type(df_exceptions["Reason"]),
+            df_exceptions["Amount Cents"].astype("int64").tolist(),
+        )
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS staged_exposure "
+                "(account TEXT, item_id TEXT, reason TEXT, amount_cents INTEGER, PRIMARY KEY (account, item_id))"
+            )
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS staged_accounts (account TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM staged_exposure")
+            conn.execute("DELETE FROM staged_accounts")
+            conn.executemany("INSERT OR REPLACE INTO staged_exposure VALUES (?, ?, ?, ?)", rows)
+            conn.executemany("INSERT OR IGNORE INTO staged_accounts VALUES (?)", ((str(a),) for a in accounts))
+            conn.execute(
+                "DELETE FROM exposure_items WHERE day = ? AND source = ? "
+                "AND account IN (SELECT account FROM staged_accounts) "
+                "AND (account, item_id) NOT IN (SELECT account, item_id FROM staged_exposure)",
+                (day, source),
+            )
+            conn.execute(
+                "INSERT INTO exposure_items (account, item_id, day, reason, amount_cents, status, source) "
+                "SELECT s.account, s.item_id, ?, s.reason, s.amount_cents, COALESCE(d.decision, 'PENDING'), ? "
+                "FROM staged_exposure s LEFT JOIN decisions d USING (item_id) WHERE true "
+                "ON CONFLICT (account, item_id) DO UPDATE SET day = excluded.day, "
+                "reason = excluded.reason, amount_cents = excluded.amount_cents, status = excluded.status, "
+                "source = excluded.source "
+                "WHERE (day, reason, amount_cents, status, source) IS NOT "
+                "(excluded.day, excluded.reason, excluded.amount_cents, excluded.status, excluded.source)",
+                (day, source),
+            )
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM exposure_items")
+            conn.execute("DELETE FROM exposure_totals")
+
+    # --- READS ---
+    def totals(self, by="Reason", start=None, end=None, account=None):
+        """Items and exposure cents grouped by one of DIMENSIONS, from the pre-aggregated table."""
+        column = DIMENSIONS[by]
+        where, params = self._filters(start, end, account)
+        frame = pd.read_sql_query(
+            f"SELECT {column} AS \"{by}\", SUM(items) AS Items, SUM(cents) AS \"Exposure Cents\" "
+            f"FROM exposure_totals WHERE items > 0 {where} GROUP BY {column} ORDER BY {column}",
+            self._connect(), params=params,
+        )
+        return frame.astype({"Items": "int64", "Exposure Cents": "int64"})
+
+    def overview(self, start=None, end=None, account=None):
+        """Total items, exposure cents and pending items over the period."""
+        where, params = self._filters(start, end, account)
+        items, cents, pending = self._connect().execute(
+            "SELECT COALESCE(SUM(items), 0), COALESCE(SUM(cents), 0), "
+            "COALESCE(SUM(CASE WHEN status = 'PENDING' THEN items END), 0) "
+            f"FROM exposure_totals WHERE items > 0 {where}",
+            params,
+        ).fetchone()
+        return {"items": items, "cents": cents, "pending": pending}
+
+    def items(self, start=None, end=None, account=None, reason=None, status=None, limit=1000):
+        """Drill-down: the individual exceptions behind one slice of the totals."""
+        where, params = self._filters(start, end, account)
+        for column, value in (("reason", reason), ("status", status)):
+            if value is not None:
+                where += f" AND {column} = ?"
+                params.append(value)
+        return pd.read_sql_query(
+            "SELECT item_id AS Item, account AS Account, day AS Day, reason AS Reason, "
+            "amount_cents AS \"Amount Cents\", status AS Status "
+            f"FROM exposure_items WHERE true {where} ORDER BY day DESC, amount_cents DESC LIMIT ?",
+            self._connect(), params=[*params, limit],
+        )
+
+    @staticmethod
+    def _filters(start, end, account):
+        where, params = "", []
+        if start is not None:
+            where += " AND day >= ?"
+            params.append(start.isoformat())
+        if end is not None:
+            where += " AND day <= ?"
+            params.append(end.isoformat())
+        if account is not None:
+            where += " AND account = ?"
+            params.append(account)
+        return where, params
@@ -0,0 +1,187 @@
+"""Incremental re-reconciliation for corrected or extended uploads.
+
+Each upload is kept as a multiset of its raw CSV lines next to the parsed
+rows. When the analyst marks an upload as a corrected version of the
+previous one, the line multisets are diffed; only the inserted/removed
+lines are parsed, and only the check numbers they touch are re-matched.
+Every other exception is carried over untouched. Any other upload is
+reconciled in full. Finding the changed lines still splits and hashes
+every line of the new version, so a correction costs time proportional to
+the file size; only parsing and matching are limited to the changes.
+"""
+import io
+import threading
+from collections import Counter
+
+import pandas as pd
+
+from money import to_cents
+from reconciliation import find_exceptions, item_ids, prepare_register
+
+KEY_COLUMNS = ["Check #", "Amount", "Payee"]
+
+
+def _parse(header, lines):
+    """Parse CSV lines (without header) into Check #/Amount Cents/Payee rows tagged with their raw line."""
+    data = b"\n".join([header, *lines])
+    df = pd.read_csv(io.BytesIO(data), dtype=dict.fromkeys(KEY_COLUMNS, str), usecols=KEY_COLUMNS)
+    df = pd.DataFrame({
+        "Check #": df["Check #"].str.strip(),
+        "Amount Cents": to_cents(df["Amount"].str.strip()),
+        "Payee": df["Payee"],
+    })
+    df["_line"] = pd.Series(lines, dtype=object, index=df.index)
+    return df
+
+
+def _split(data):
+    lines = data.splitlines() or [b""]
+    return lines[0], list(filter(None, lines[1:]))
+
+
+def _multiset(lines):
+    """Distinct lines plus the counts of lines that occur more than once."""
+    distinct = set(lines)
+    if len(distinct) == len(lines):
+        return distinct, {}
+    return distinct, {line: n for line, n in Counter(lines).items() if n > 1}
+
+
+class UploadVersion:
+    """One uploaded file: header, raw-line multiset and parsed rows."""
+
+    def __init__(self, data):
+        self.data = data
+        self.header, lines = _split(data)
+        self.lines, self.repeats = _multiset(lines)
+        self.rows = _parse(self.header, lines)
+
+    def count(self, line):
+        return self.repeats.get(line, 1 if line in self.lines else 0)
+
+    def apply(self, data):
+        """Move to a new version of the file; returns the check numbers whose rows changed.
+
+        Returns None (and keeps the current version) when the header changed,
+        or when a changed line's check number occurs more than once: re-added
+        lines go after the unchanged ones, and for repeated check numbers
+        (first register row wins, later presentments are duplicates) that
+        order matters, so the caller must start over.
+        """
+        if data == self.data:
+            return pd.Index([])
+        header, lines = _split(data)
+        if header != self.header:
+            return None
+        new_lines, new_repeats = _multiset(lines)
+
+        def new_count(line):
+            return new_repeats.get(line, 1 if line in new_lines else 0)
+
+        changed = new_lines ^ self.lines
+        changed.update(line for line in self.repeats.keys() | new_repeats.keys() if new_count(line) != self.count(line))
+        if not changed:
+            self.data, self.lines, self.repeats = data, new_lines, new_repeats
+            return pd.Index([])
+
+        changed = list(changed)
+        changed_checks = pd.Index(_parse(header, changed)["Check #"].unique())
+        # Drop every copy of a changed line, then add back as many copies as the new file has.
+        readd = [line for line in changed for _ in range(new_count(line))]
+        kept = self.rows[~self.rows["_line"].isin(changed).to_numpy()]
+        rows = pd.concat([kept, _parse(header, readd)] if readd else [kept], ignore_index=True)
+        touched = self.rows["Check #"].isin(changed_checks).to_numpy()
+        if self.rows["Check #"][touched].duplicated().any() or rows["Check #"][rows["Check #"].isin(changed_checks)].duplicated().any():
+            return None
+        self.data, self.lines, self.repeats, self.rows = data, new_lines, new_repeats, rows
+        return changed_checks
+
+
+class IncrementalReconciler:
+    """Holds the last reconciled version of both files for one review session."""
+
+    def __init__(self):
+        self.register = None
+        self.exceptions = None
+        self.last_affected = pd.Index([])
+        self._cust = None
+        self._bank = None
+        # Updates may run on a background job thread while a newer upload is submitted.
+        self._lock = threading.Lock()
+
+    @property
+    def presented(self):
+        """Parsed rows of the current paid-file version."""
+        return self._bank.rows
+
+    def update_bytes(self, cust_bytes, bank_bytes, on_chunk=None, chunksize=100_000, correction=False):
+        """Reconcile uploads; returns unstatused exceptions.
+
+        Only a `correction` (the analyst says these files are corrected
+        versions of the previous ones) is diffed against the previous
+        version; anything else is a full run. After the call,
+        `last_affected` holds the check numbers that were re-evaluated
+        (empty on a full run). A full run matches the paid file `chunksize`
+        rows at a time and calls `on_chunk(exceptions, rows, rows_total)`
+        after each chunk, e.g. to publish progress from a job.
+        """
+        with self._lock:
+            if not correction:
+                return self._full(cust_bytes, bank_bytes, on_chunk, chunksize)
+            return self._update(cust_bytes, bank_bytes, on_chunk, chunksize)
+
+    def _update(self, cust_bytes, bank_bytes, on_chunk, chunksize):
+        register_changes = self._cust.apply(cust_bytes) if self._cust else None
+        paid_changes = self._bank.apply(bank_bytes) if self._bank else None
+        if register_changes is None or paid_changes is None:
+            return self._full(cust_bytes, bank_bytes, on_chunk, chunksize)
+
+        affected = register_changes.union(paid_changes)
+        if len(register_changes):
+            self._patch_register(register_changes)
+        if len(affected):
+            bank_rows = self._bank.rows
+            presented = bank_rows[bank_rows["Check #"].isin(affected).to_numpy()]
+            kept = self.exceptions[~self.exceptions["Check #"].isin(affected).to_numpy()]
+            self.exceptions = pd.concat([kept, find_exceptions(self.register, presented)], ignore_index=True)
+        self.last_affected = affected
+        return self.exceptions
+
+    def _full(self, cust_bytes, bank_bytes, on_chunk=None, chunksize=100_000):
+        # Start from scratch so an interrupted run (e.g. a cancelled job) never leaves a half-updated state.
+        self._cust = self._bank = None
+        cust, bank = UploadVersion(cust_bytes), UploadVersion(bank_bytes)
+        register = prepare_register(cust.rows)
+        if on_chunk is None:
+            exceptions = find_exceptions(register, bank.rows)
+        else:
+            parts = []
+            for start in range(0, max(len(bank.rows), 1), chunksize):
+                parts.append(find_exceptions(register, bank.rows.iloc[start:start + chunksize]))
+                on_chunk(parts[-1], min(chunksize, len(bank.rows) - start), len(bank.rows))
+            exceptions = pd.concat(parts, ignore_index=True)
+        self._cust, self._bank, self.register, self.exceptions = cust, bank, register, exceptions
+        self.last_affected = pd.Index([])
+        return self.exceptions
+
+    def _patch_register(self, checks):
+        # The earliest surviving row for a check number wins, as in prepare_register.
+        rows = self._cust.rows
+        replacement = prepare_register(rows[rows["Check #"].isin(checks).to_numpy()])
+        kept = self.register[~self.register.index.isin(checks)]
+        self.register = pd.concat([kept, replacement])
+
+
+def changed_items(previous, current):
+    """Item ids of `previous` exceptions that are gone from `current` or whose reason or amount changed.
+
+    Both frames must be tagged with the same presentment, as a corrected
+    upload is; items whose row is unchanged keep their decisions.
+    """
+    before = pd.DataFrame({"Reason": previous["Reason"].to_numpy(dtype=object),
+                           "Amount Cents": previous["Amount Cents"].to_numpy()}, index=item_ids(previous))
+    after = pd.DataFrame({"Reason": current["Reason"].to_numpy(dtype=object),
+                          "Amount Cents": current["Amount Cents"].to_numpy()}, index=item_ids(current))
+    after = after.reindex(before.index)
+    differs = (before["Reason"] != after["Reason"]) | (before["Amount Cents"] != after["Amount Cents"])
+    return before.index[differs.to_numpy()]
@@ -0,0 +1,81 @@
+"""Streaming, compact-dtype ingestion of bank paid files.
+
+The paid file is read in fixed-size chunks with explicit dtypes
+(string Check #, categorical Payee, int64 cents) and each chunk is
+reconciled against a register that was indexed once up front, so peak
+memory is bounded by the chunk size rather than the file size. BAI2 and
+X9.37 paid files are detected and read natively (see bank_formats).
+"""
+import pandas as pd
+
+from bank_formats import DEFAULT_CHUNKSIZE, PAID_READERS, detect_format
+from money import to_cents
+from reconciliation import ACCOUNT_COLUMN, find_exceptions, prepare_register
+
+CSV_DTYPES = {"Check #": "string", "Amount": "string", "Payee": "string"}
+# Optional in CSV inputs: multi-client files tag each row with the client account.
+OPTIONAL_DTYPES = {ACCOUNT_COLUMN: "string"}
+
+
+def _compact(chunk):
+    """Convert a raw chunk to Check # (string), Payee (category), Amount Cents (int64)
+    and, when the file has one, Account (category)."""
+    df = pd.DataFrame({
+        "Check #": chunk["Check #"].str.strip(),
+        "Payee": chunk["Payee"].astype("category"),
+        "Amount Cents": to_cents(chunk["Amount"].str.strip()),
+    })
+    if ACCOUNT_COLUMN in chunk:
+        df[ACCOUNT_COLUMN] = chunk[ACCOUNT_COLUMN].str.strip().astype("category")
+    return df
+
+
+def read_bank_chunks(source, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield compact frames of at most `chunksize` presented checks."""
+    file_format = detect_format(source)
+    if file_format == "nacha":
+        raise ValueError("NACHA files hold ACH entries, not presented checks; use bank_formats.read_nacha")
+    if file_format in PAID_READERS:
+        yield from PAID_READERS[file_format](source, chunksize)
+        return
+    dtypes = {**CSV_DTYPES, **OPTIONAL_DTYPES}
+    reader = pd.read_csv(source, dtype=dtypes, usecols=lambda column: column in dtypes, chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            yield _compact(chunk)
+
+
+def load_register(source, chunksize=DEFAULT_CHUNKSIZE):
+    """Read an issued-check register in chunks and return it indexed by check number."""
+    parts = []
+    for chunk in read_bank_chunks(source, chunksize):
+        parts.append(chunk[["Check #", "Amount Cents", "Payee"]])
+    if not parts:
+        parts.append(empty_presented())
+    df_cust = pd.concat(parts, ignore_index=True)
+    return prepare_register(df_cust)
+
+
+def reconcile_stream(register, source, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield the exceptions for each chunk of the paid file as it is read."""
+    for chunk in read_bank_chunks(source, chunksize):
+        exceptions = find_exceptions(register, chunk)
+        if len(exceptions):
+            yield exceptions
+
+
+def reconcile_file(register, source, chunksize=DEFAULT_CHUNKSIZE):
+    """Reconcile a whole paid file chunk by chunk; only exceptions are kept in memory."""
+    parts = list(reconcile_stream(register, source, chunksize))
+    if not parts:
+        return find_exceptions(register, empty_presented())
+    return pd.concat(parts, ignore_index=True)
+
+
+def empty_presented():
+    """A compact frame with no presented checks."""
+    return _compact(_empty_chunk())
+
+
+def _empty_chunk():
+    return pd.DataFrame({column: pd.Series([], dtype=dtype) for column, dtype in CSV_DTYPES.items()})
@@ -0,0 +1,214 @@
+"""Low-overhead stage timing for app reruns and batch runs.
+
+A trace covers one unit of work (a Streamlit rerun, a batch account) and
+holds the stages run inside it, each timed with perf_counter and tagged
+with the rows it processed and the change in resident memory. Finished
+traces go into a bounded history shared by all sessions, which can be
+summarised per stage (p50 / p95) or exported as JSON or Prometheus text.
+A stage costs two clock reads and two pread()s of /proc/self/statm, about
+ten microseconds, so instrumentation stays on in production.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+HISTORY_COLUMNS = ["Trace", "Started", "Stage", "Seconds", "Rows", "RSS Delta"]
+
+_statm = {}
+
+
+def rss_bytes():
+    """Current resident set size; peak RSS where /proc is unavailable, 0 where neither is."""
+    try:
+        # One descriptor per process (a forked worker must not read its parent's statm).
+        fd = _statm.get(os.getpid())
+        if fd is None:
+            fd = _statm[os.getpid()] = os.open("/proc/self/statm", os.O_RDONLY)
+        return int(os.pread(fd, 64, 0).split()[1]) * _PAGE_SIZE
+    except (OSError, AttributeError):
+        if resource is None:
+            return 0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Stage:
+    """One timed stage; set `rows` inside the block when the count is only known afterwards."""
+
+    __slots__ = ("name", "seconds", "rows", "rss_delta")
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.seconds = 0.0
+        self.rows = rows
+        self.rss_delta = 0
+
+    def as_dict(self):
+        return {"stage": self.name, "seconds": self.seconds, "rows": self.rows, "rss_delta": self.rss_delta}
+
+
+class Trace:
+    __slots__ = ("name", "started", "stages", "seconds", "rss", "_clock")
+
+    def __init__(self, name):
+        self.name = name
+        self.started = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        self.stages = []
+        self.seconds = 0.0
+        self.rss = 0
+        self._clock = time.perf_counter()
+
+    def as_dict(self):
+        return {
+            "trace": self.name, "started": self.started, "seconds": self.seconds, "rss": self.rss,
+            "stages": [stage.as_dict() for stage in self.stages],
+        }
+
+
+class Instrumentation:
+    """Thread-safe trace recorder; each thread (Streamlit session) has its own open trace."""
+
+    def __init__(self, history=500, enabled=True):
+        self.enabled = enabled
+        self._history = deque(maxlen=history)
+        # Cumulative per-stage [count, seconds, rows] since start-up, for Prometheus counters.
+        self._totals = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    # --- RECORDING ---
+    def start_trace(self, name):
+        """Open a trace for this thread, closing any trace an interrupted run left open."""
+        if not self.enabled:
+            return None
+        self.finish_trace()
+        self._local.trace = Trace(name)
+        return self._local.trace
+
+    def finish_trace(self):
+        trace = getattr(self._local, "trace", None)
+        if trace is None:
+            return None
+        self._local.trace = None
+        trace.seconds = time.perf_counter() - trace._clock
+        trace.rss = rss_bytes()
+        with self._lock:
+            self._history.append(trace)
+        return trace
+
+    @contextmanager
+    def trace(self, name):
+        trace = self.start_trace(name)
+        try:
+            yield trace
+        finally:
+            if trace is not None:
+                self.finish_trace()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Time a block as one stage of this thread's trace (or of a trace of its own)."""
+        stage = Stage(name, rows)
+        if not self.enabled:
+            yield stage
+            return
+        standalone = getattr(self._local, "trace", None) is None
+        if standalone:
+            self.start_trace(name)
+        trace = self._local.trace
+        rss = rss_bytes()
+        start = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            stage.seconds = time.perf_counter() - start
+            stage.rss_delta = rss_bytes() - rss
+            trace.stages.append(stage)
+            with self._lock:
+                totals = self._totals.setdefault(name, [0, 0.0, 0])
+                totals[0] += 1
+                totals[1] += stage.seconds
+                totals[2] += stage.rows or 0
+            if standalone:
+                self.finish_trace()
+
+    def clear(self):
+        with self._lock:
+            self._history.clear()
+            self._totals.clear()
+
+    # --- READS ---
+    def traces(self, last=None):
+        with self._lock:
+            traces = list(self._history)
+        return traces[-last:] if last else traces
+
+    def history(self, last=None):
+        """One row per stage of the retained traces, newest trace first."""
+        rows = [
+            (trace.name, trace.started, stage.name, stage.seconds, stage.rows, stage.rss_delta)
+            for trace in reversed(self.traces(last)) for stage in trace.stages
+        ]
+        frame = pd.DataFrame(rows, columns=HISTORY_COLUMNS)
+        return frame.astype({"Rows": "Int64", "RSS Delta": "int64"})
+
+    def summary(self):
+        """Per-stage count, mean / p50 / p95 / max seconds and rows per second over the history."""
+        history = self.history()
+        grouped = history.groupby("Stage", sort=True)
+        summary = grouped["Seconds"].agg(
+            Count="count", Mean="mean", P50="median", P95=lambda s: s.quantile(0.95), Max="max",
+        )
+        rows = grouped["Rows"].sum()
+        summary["Rows/s"] = (rows / grouped["Seconds"].sum()).where(rows > 0)
+        summary["RSS Delta"] = grouped["RSS Delta"].sum()
+        return summary.reset_index()
+
+    # --- EXPORT ---
+    def to_json(self, last=None):
+        return json.dumps([trace.as_dict() for trace in self.traces(last)], indent=1)
+
+    def to_prometheus(self, prefix="positive_pay"):
+        """Prometheus text exposition: cumulative stage counters plus quantiles over the history."""
+        with self._lock:
+            totals = {name: list(values) for name, values in self._totals.items()}
+        summary = self.summary().set_index("Stage")
+        lines = [
+            f"# HELP {prefix}_stage_seconds Time spent per stage (quantiles over the retained history).",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for name, (count, seconds, _) in sorted(totals.items()):
+            label = _label(name)
+            if name in summary.index:
+                for quantile, column in (("0.5", "P50"), ("0.95", "P95")):
+                    lines.append(f'{prefix}_stage_seconds{{stage="{label}",quantile="{quantile}"}} '
+                                 f"{summary.at[name, column]:.6f}")
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{label}"}} {seconds:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{label}"}} {count}')
+        lines += [
+            f"# HELP {prefix}_stage_rows_total Rows processed per stage.",
+            f"# TYPE {prefix}_stage_rows_total counter",
+            *(f'{prefix}_stage_rows_total{{stage="{_label(name)}"}} {rows}' for name, (_, _, rows) in sorted(totals.items())),
+            f"# HELP {prefix}_resident_memory_bytes Resident set size of this process.",
+            f"# TYPE {prefix}_resident_memory_bytes gauge",
+            f"{prefix}_resident_memory_bytes {rss_bytes()}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,201 @@
+"""Background reconciliation jobs.
+
+Heavy work is queued on a small thread pool shared by every session, so a
+Streamlit rerun only submits a job and polls it. A job function receives
+its Job and calls `job.report(...)` between chunks to publish partial
+exceptions and progress; the same call raises JobCancelled once the job
+has been cancelled, so work stops at the next chunk boundary. Jobs are
+keyed by content (e.g. recon_cache.content_key): submitting a key that is
+already queued, running or finished returns the existing job instead of
+starting the same work twice. A finished job only keeps a weak reference
+to its result: job functions store results where they are looked up
+(e.g. the ReconciliationCache), which decides how long they are kept.
+"""
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from bank_formats import DEFAULT_CHUNKSIZE, detect_format
+from ingest import empty_presented, read_bank_chunks
+from reconciliation import find_exceptions
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function when its job has been cancelled."""
+
+
+class Job:
+    def __init__(self, key, label=None):
+        self.key = key
+        self.label = label or key
+        self.status = QUEUED
+        self.message = ""
+        self.rows_done = 0
+        self.rows_total = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self._result = None
+        self._parts = []
+        self._partial = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    # --- CALLED FROM THE JOB FUNCTION ---
+    def report(self, partial=None, rows=0, rows_total=None, message=None):
+        """Publish a chunk's exceptions and progress; raises JobCancelled if the job was cancelled."""
+        if self._cancel.is_set():
+            raise JobCancelled(self.key)
+        with self._lock:
+            if partial is not None and len(partial):
+                self._parts.append(partial)
+                self._partial = None
+            self.rows_done += rows
+            if rows_total is not None:
+                self.rows_total = rows_total
+            if message is not None:
+                self.message = message
+
+    # --- CALLED FROM THE UI ---
+    @property
+    def done(self):
+        return self.status in FINISHED
+
+    @property
+    def result(self):
+        """The job function's return value while its owner still holds it, else None."""
+        return self._result() if self._result is not None else None
+
+    @property
+    def progress(self):
+        """Fraction complete, or None while the total is unknown."""
+        if self.status == DONE:
+            return 1.0
+        if not self.rows_total:
+            return None
+        return min(self.rows_done / self.rows_total, 1.0)
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def partial(self):
+        """Exceptions reported so far, as one frame (None before the first chunk)."""
+        with self._lock:
+            if self._partial is None and self._parts:
+                self._parts = [pd.concat(self._parts, ignore_index=True)]
+                self._partial = self._parts[0]
+            return self._partial
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+
+class JobManager:
+    """Shared worker pool plus a registry of jobs by key (the most recent `keep` finished jobs are retained)."""
+
+    def __init__(self, workers=2, keep=32):
+        self.keep = keep
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="recon-jobs")
+
+    def submit(self, key, fn, *args, label=None, retry=False):
+        """Queue `fn(job, *args)` unless a job with this key already exists.
+
+        An existing job is returned while it is in flight, while its result
+        is still held, and after it failed or was cancelled, so a rerun
+        reports the failure instead of repeating it; `retry=True` queues a
+        failed or cancelled job again.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and (job.status in (QUEUED, RUNNING) or job.result is not None
+                                    or job.status in (FAILED, CANCELLED) and not retry):
+                return job
+            job = self._jobs[key] = Job(key, label)
+            self._trim()
+        self._pool.submit(self._run, job, fn, args)
+        return job
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def cancel(self, key):
+        job = self.get(key)
+        if job is not None:
+            job.cancel()
+        return job
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def stats(self):
+        jobs = self.jobs()
+        return {status: sum(job.status == status for job in jobs) for status in (QUEUED, RUNNING, *FINISHED)}
+
+    @staticmethod
+    def _run(job, fn, args):
+        if job.cancelled:
+            job.status, job.finished = CANCELLED, time.time()
+            return
+        job.status, job.started = RUNNING, time.time()
+        try:
+            job._result = weakref.ref(fn(job, *args))
+            job.status = DONE
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            job.error = repr(e)
+            job.status = FAILED
+        finally:
+            # Partial chunks are only shown while the job runs.
+            with job._lock:
+                job._parts, job._partial = [], None
+            job.finished = time.time()
+
+    def _trim(self):
+        finished = [key for key, job in self._jobs.items() if job.done]
+        for key in finished[:max(len(finished) - self.keep, 0)]:
+            del self._jobs[key]
+
+
+# --- JOB FUNCTIONS ---
+def estimate_rows(bank_bytes):
+    """Presented checks in a paid file, counted without parsing (None when the format has no cheap count)."""
+    file_format = detect_format(bank_bytes)
+    if file_format == "csv":
+        lines = bank_bytes.count(b"\n") + (0 if bank_bytes.endswith(b"\n") else 1)
+        return max(lines - 1, 0)
+    if file_format == "bai2":
+        return bank_bytes.count(b"\n16,")
+    return None
+
+
+def reconcile_job(job, register, bank_source, rows_total=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Stream a paid file against an indexed register, reporting each chunk's exceptions."""
+    job.report(rows_total=rows_total, message="Reconciling")
+    parts = []
+    for chunk in read_bank_chunks(bank_source, chunksize):
+        exceptions = find_exceptions(register, chunk)
+        parts.append(exceptions)
+        job.report(exceptions, rows=len(chunk))
+    if not parts:
+        return find_exceptions(register, empty_presented())
+    return pd.concat(parts, ignore_index=True)
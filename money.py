@@ -0,0 +1,34 @@
+"""Fixed-point money helpers: amounts are carried as int64 cents.
+
+Dollar amounts are parsed once, where a file is read, into an
+"Amount Cents" column; matching, limit checks and totals then run on
+integers, and dollars only reappear when an amount is displayed.
+"""
+import pandas as pd
+
+
+def to_cents(amounts):
+    """Parse a column of dollar amounts ("45.82", 45.82) into int64 cents."""
+    dollars = pd.to_numeric(amounts, errors="raise")
+    if dollars.isna().any():
+        raise ValueError(f"{int(dollars.isna().sum())} amount(s) are blank or unparseable")
+    return (dollars * 100).round().astype("int64")
+
+
+def amount_cents(df, column="Amount"):
+    """A frame's amounts as an int64 array: its pre-parsed "<column> Cents" column, else parsed dollars."""
+    if f"{column} Cents" in df:
+        return df[f"{column} Cents"].to_numpy(dtype="int64")
+    return to_cents(df[column]).to_numpy()
+
+
+def format_cents(cents):
+    """Display cents as "$1,234.56"; accepts a scalar or a Series (formatted once per distinct value)."""
+    if isinstance(cents, pd.Series):
+        labels = {value: format_cents(value) for value in cents.dropna().unique()}
+        return cents.map(labels).astype(object)
+    cents = int(cents)
+    sign = "-" if cents < 0 else ""
+    dollars, remainder = divmod(abs(cents), 100)
+    return f"{sign}${dollars:,}.{remainder:02d}"
+
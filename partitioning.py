@@ -0,0 +1,207 @@
+"""Account-partitioned reconciliation for multi-client files.
+
+Register and paid files may carry an "Account" column naming the client;
+rows without one belong to DEFAULT_ACCOUNT. Each account's presented
+checks are matched only against that account's register. Work is cut
+into units of at most `max_rows` presented checks: large accounts are
+sliced and small accounts are packed together (matched in one pass on an
+account-qualified check number). Units run on a process pool with every
+account's first slice ahead of anyone's second, so one very large client
+never holds back the small ones: they finish early while the large
+client's remaining slices keep the other cores busy. Exceptions come back
+as one queue with an Account column, plus per-account timings.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from reconciliation import ACCOUNT_COLUMN, EXCEPTION_COLUMNS, ISSUED_COLUMN, find_exceptions, prepare_register
+from register_store import DEFAULT_ACCOUNT
+
+DEFAULT_MAX_ROWS = 250_000
+
+TIMING_COLUMNS = ["Account", "Presented", "Exceptions", "Slices", "Seconds", "Finished"]
+
+# Joins account and check number into one match key for units that pack several accounts.
+KEY_SEPARATOR = "\x1f"
+
+
+# --- PARTITIONING ---
+def account_keys(df):
+    """The account of every row; blank or missing accounts map to DEFAULT_ACCOUNT."""
+    if ACCOUNT_COLUMN not in df:
+        return pd.Series(DEFAULT_ACCOUNT, index=df.index, dtype=str)
+    keys = df[ACCOUNT_COLUMN].astype("string").str.strip()
+    return keys.mask(keys == "").fillna(DEFAULT_ACCOUNT).astype(str)
+
+
+def partition(df):
+    """Split a frame into {account: rows}, in order of first appearance."""
+    rows = df.drop(columns=ACCOUNT_COLUMN, errors="ignore")
+    return {account: part for account, part in rows.groupby(account_keys(df), sort=False)}
+
+
+def has_accounts(source):
+    """True when a CSV file's header includes the Account column."""
+    if hasattr(source, "seek"):
+        position = source.tell()
+        header = pd.read_csv(source, nrows=0).columns
+        source.seek(position)
+    else:
+        header = pd.read_csv(source, nrows=0).columns
+    return ACCOUNT_COLUMN in header
+
+
+def qualified_checks(df, accounts=None):
+    """Check numbers prefixed with their account, unique across a multi-client book."""
+    accounts = account_keys(df) if accounts is None else accounts
+    return accounts + KEY_SEPARATOR + df["Check #"].astype(str)
+
+
+def plan_units(df_cust, df_bank, max_rows=DEFAULT_MAX_ROWS):
+    """Work units (issued register rows, presented rows) of at most `max_rows` presented checks.
+
+    Large accounts are cut into slices and small accounts are packed
+    together, so every unit costs about the same; units holding every
+    account's first slice come before anyone's second, small before large.
+    Presented rows are keyed by qualified check number and each unit carries
+    only the register rows for its own checks.
+    """
+    register = prepare_register(df_cust.assign(**{"Check #": qualified_checks(df_cust)}))
+    accounts = account_keys(df_bank)
+    presented = df_bank.drop(columns=ACCOUNT_COLUMN, errors="ignore").assign(**{
+        "Check #": qualified_checks(df_bank, accounts), ACCOUNT_COLUMN: accounts,
+    })
+
+    codes, _ = pd.factorize(accounts)
+    slice_no = pd.Series(codes).groupby(codes).cumcount().to_numpy() // max_rows
+    slices = pd.DataFrame({"code": codes, "slice": slice_no}).value_counts(sort=False).rename("rows").reset_index()
+    slices = slices.sort_values(["slice", "rows"], kind="stable")
+    # Greedy packing in that order: a unit closes when the next slice would overflow it.
+    unit_ids, unit, unit_rows = [], 0, 0
+    for rows in slices["rows"].to_numpy():
+        if unit_rows and unit_rows + rows > max_rows:
+            unit, unit_rows = unit + 1, 0
+        unit_ids.append(unit)
+        unit_rows += rows
+    lookup = np.zeros((codes.max() + 1 if len(codes) else 0, slice_no.max() + 1 if len(codes) else 0), dtype=np.int64)
+    lookup[slices["code"].to_numpy(), slices["slice"].to_numpy()] = unit_ids
+
+    row_units = lookup[codes, slice_no]
+    order = np.argsort(row_units, kind="stable")
+    bounds = np.searchsorted(row_units[order], np.arange(unit + 2))
+    units = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        if start == stop:
+            continue
+        unit_rows = presented.iloc[order[start:stop]]
+        positions = register.index.get_indexer(unit_rows["Check #"].unique())
+        units.append((register.iloc[positions[positions >= 0]], unit_rows))
+    return units
+
+
+# --- RECONCILIATION ---
+def reconcile_unit(register, presented):
+    """Reconcile one work unit in a single pass; runs inside a worker process.
+
+    Returns (account, exceptions, presented rows, seconds) per account in
+    the unit, with the unit's time shared out by presented rows.
+    """
+    start = time.perf_counter()
+    exceptions = find_exceptions(register, presented)
+    keys = exceptions["Check #"].str.split(KEY_SEPARATOR, n=1)
+    exceptions["Check #"] = keys.str[1]
+    exceptions.insert(0, ACCOUNT_COLUMN, keys.str[0])
+    seconds = time.perf_counter() - start
+
+    rows = presented[ACCOUNT_COLUMN].value_counts(sort=False)
+    by_account = dict(iter(exceptions.groupby(ACCOUNT_COLUMN, sort=False)))
+    return [
+        (account, by_account.get(account, exceptions.iloc[:0]), int(n), seconds * n / len(presented))
+        for account, n in rows.items()
+    ]
+
+
+def iter_accounts(df_cust, df_bank, workers=None, max_rows=DEFAULT_MAX_ROWS):
+    """Yield (account, exceptions, timing) as each account's last slice completes.
+
+    `timing` holds presented rows, exceptions, slices, worker seconds and
+    the wall-clock seconds from the start of the run until the account
+    finished. `workers=1` (or a single unit) runs in this process.
+    """
+    started = time.perf_counter()
+    units = plan_units(df_cust, df_bank, max_rows)
+    remaining = {}
+    for _, presented in units:
+        for account in presented[ACCOUNT_COLUMN].unique():
+            remaining[account] = remaining.get(account, 0) + 1
+    parts = {account: [] for account in remaining}
+    timings = {account: {"Presented": 0, "Slices": 0, "Seconds": 0.0} for account in remaining}
+
+    def collect(results):
+        for account, exceptions, rows, seconds in results:
+            parts[account].append(exceptions)
+            timing = timings[account]
+            timing["Presented"] += rows
+            timing["Slices"] += 1
+            timing["Seconds"] += seconds
+            remaining[account] -= 1
+            if not remaining[account]:
+                merged = pd.concat(parts.pop(account), ignore_index=True)
+                timing.update(Exceptions=len(merged), Finished=time.perf_counter() - started)
+                yield account, merged, timing
+
+    if workers == 1 or len(units) <= 1:
+        for unit in units:
+            yield from collect(reconcile_unit(*unit))
+        return
+
+    workers = min(workers or os.cpu_count() or 1, len(units))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(reconcile_unit, *unit) for unit in units]
+        del units
+        try:
+            for future in as_completed(futures):
+                yield from collect(future.result())
+        finally:
+            # A consumer that stops early (e.g. a cancelled job) should not wait for queued units.
+            for future in futures:
+                future.cancel()
+
+
+def reconcile_accounts(df_cust, df_bank, workers=None, max_rows=DEFAULT_MAX_ROWS, on_account=None):
+    """Reconcile every account; returns (exceptions with an Account column, per-account timings).
+
+    `on_account(exceptions, rows, rows_total)` is called as each account
+    finishes, e.g. to publish progress from a background job.
+    """
+    exceptions, timings = [], []
+    for account, account_exceptions, timing in iter_accounts(df_cust, df_bank, workers, max_rows):
+        exceptions.append(account_exceptions)
+        timings.append({"Account": account, **timing})
+        if on_account is not None:
+            on_account(account_exceptions, timing["Presented"], len(df_bank))
+    if not exceptions:
+        empty = find_exceptions(prepare_register(df_cust.iloc[:0]), df_bank.iloc[:0])
+        exceptions.append(empty.assign(**{ACCOUNT_COLUMN: pd.Series([], dtype=object)}))
+    queue = pd.concat(exceptions, ignore_index=True)
+    queue = queue[[ACCOUNT_COLUMN, *queue.columns.drop(ACCOUNT_COLUMN)]]
+    return queue, pd.DataFrame(timings, columns=TIMING_COLUMNS)
+
+
+# --- PRESENTMENT SCREENING ---
+def screen_accounts(index, df_bank, df_cust, presented_on=None, source=None):
+    """Screen and record a multi-client paid file in a PresentmentIndex, account by account."""
+    registers = partition(df_cust)
+    anomalies = []
+    for account, presented in partition(df_bank).items():
+        register = prepare_register(registers.get(account, df_cust.iloc[:0]))
+        found = index.screen(presented, register, account=account, presented_on=presented_on, source=source)
+        index.record(presented, account=account, presented_on=presented_on, source=source)
+        anomalies.append(found.assign(**{ACCOUNT_COLUMN: account}))
+    if not anomalies:
+        return pd.DataFrame(columns=[ACCOUNT_COLUMN, *EXCEPTION_COLUMNS[:-1], ISSUED_COLUMN])
+    return pd.concat(anomalies, ignore_index=True)
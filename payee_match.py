@@ -0,0 +1,104 @@
+"""Payee name normalization and similarity scoring.
+
+Names are normalized once per distinct value (lower-case, punctuation,
+trailing legal-entity suffixes and a leading "the" stripped) and their character trigrams are
+cached, so scoring a large batch only does set work for each distinct
+(issued, presented) pair rather than for every row.
+"""
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Stripped only from the end of a name: "PC Richard & Son" is not "Richard & Son".
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "llp", "lp", "ltd", "limited", "corp", "corporation",
+    "co", "company", "plc", "pc", "pllc", "na",
+}
+
+# Stripped only from the start of a name.
+LEADING_ARTICLES = {"the"}
+
+LIKELY_SAME = "LIKELY SAME"
+NEEDS_REVIEW = "NEEDS REVIEW"
+DIFFERENT = "DIFFERENT"
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+class PayeeMatcher:
+    """Scores payee pairs in [0, 1]; 1.0 means identical after normalization."""
+
+    def __init__(self, match_threshold=0.85, review_threshold=0.5, max_cache=500_000):
+        self.match_threshold = match_threshold
+        self.review_threshold = review_threshold
+        self.max_cache = max_cache
+        self._normalized = {}
+        self._trigrams = {}
+        self._lock = threading.Lock()
+
+    # --- NORMALIZATION ---
+    def normalize(self, names):
+        """Normalized form of each name, computed once per distinct value."""
+        names = pd.Series(names, copy=False).astype(str)
+        codes, uniques = pd.factorize(names)
+        normalized = np.array([self._normalize_one(name) for name in uniques], dtype=object)
+        return pd.Series(normalized[codes] if len(uniques) else [], index=names.index, dtype=object)
+
+    def _normalize_one(self, name):
+        cached = self._normalized.get(name)
+        if cached is None:
+            tokens = _PUNCTUATION.sub(" ", name.lower()).split()
+            start, end = 0, len(tokens)
+            if end > 1 and tokens[0] in LEADING_ARTICLES:
+                start = 1
+            while end - start > 1 and tokens[end - 1] in LEGAL_SUFFIXES:
+                end -= 1
+            cached = " ".join(tokens[start:end])
+            with self._lock:
+                if len(self._normalized) >= self.max_cache:
+                    self._normalized.clear()
+                    self._trigrams.clear()
+                self._normalized[name] = cached
+        return cached
+
+    def _grams(self, normalized):
+        grams = self._trigrams.get(normalized)
+        if grams is None:
+            padded = f"  {normalized} "
+            grams = frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+            self._trigrams[normalized] = grams
+        return grams
+
+    # --- SCORING ---
+    def score(self, issued, presented):
+        """Trigram Dice similarity of normalized names, evaluated once per distinct pair."""
+        left = self.normalize(issued).to_numpy()
+        right = self.normalize(presented).to_numpy()
+        scores = np.ones(len(left))
+        differs = left != right
+        if differs.any():
+            pairs = pd.MultiIndex.from_arrays([left[differs], right[differs]])
+            codes, unique_pairs = pd.factorize(pairs)
+            unique_scores = np.array([self._dice(a, b) for a, b in unique_pairs])
+            scores[differs] = unique_scores[codes]
+        return scores
+
+    def _dice(self, a, b):
+        grams_a, grams_b = self._grams(a), self._grams(b)
+        if not grams_a or not grams_b:
+            return 0.0
+        return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+    def triage(self, scores):
+        """Bucket similarity scores into LIKELY SAME / NEEDS REVIEW / DIFFERENT."""
+        scores = np.asarray(scores, dtype=float)
+        return np.select(
+            [scores >= self.match_threshold, scores >= self.review_threshold],
+            [LIKELY_SAME, NEEDS_REVIEW],
+            default=DIFFERENT,
+        )
+
+
+default_matcher = PayeeMatcher()
@@ -0,0 +1,163 @@
+"""Persistent index of presented checks for duplicate and serial-anomaly detection.
+
+Every paid file is recorded per account and check number in SQLite. Each
+account's history is loaded once per process into a pandas hash index,
+so screening a new file is one O(1)-per-item membership pass with no
+rescan of old files. Screening flags:
+
+    DUPLICATE       check presented earlier in the same file or in another paid file
+    FORGERY         numeric serial outside the register's issued range
+"""
+import os
+import sqlite3
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from config import DATA_DIR
+from money import amount_cents
+from reconciliation import ACCOUNT_COLUMN, ISSUED_COLUMN, exception_columns
+from register_store import DEFAULT_ACCOUNT
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS presented (
+    account      TEXT NOT NULL,
+    check_num    TEXT NOT NULL,
+    presented_on TEXT NOT NULL,
+    source       TEXT,
+    PRIMARY KEY (account, check_num)
+) WITHOUT ROWID;
+"""
+
+
+class PresentmentIndex:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(DATA_DIR, "presentments.db")
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._history = {}
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def history(self, account=DEFAULT_ACCOUNT):
+        """First presentment (date, source file hash) per check number, indexed by Check #."""
+        with self._lock:
+            if account not in self._history:
+                with self._connect() as conn:
+                    frame = pd.read_sql_query(
+                        "SELECT check_num, presented_on, source FROM presented WHERE account = ?",
+                        conn, params=(account,),
+                    )
+                self._history[account] = frame.set_index("check_num")
+            return self._history[account]
+
+    # --- SCREENING ---
+    def screen(self, df_bank, register, account=DEFAULT_ACCOUNT, presented_on=None, source=None):
+        """Exceptions for duplicate presentments and out-of-range serials in one paid file.
+
+        `source` identifies the file as in record(): presentments recorded
+        from the same source are not duplicates, so re-screening a file (or
+        a corrected version of it, which keeps its source) is idempotent,
+        while another file presenting the check, even the same day, is
+        flagged. Presentments recorded after `presented_on` are ignored.
+        """
+        presented_on = (presented_on or date.today()).isoformat()
+        checks = df_bank["Check #"].astype(str).str.strip()
+        history = self.history(account)
+
+        positions = history.index.get_indexer(checks)
+        first = np.maximum(positions, 0)
+        first_date = history["presented_on"].to_numpy(dtype=object)[first] if len(history) else ""
+        first_source = history["source"].to_numpy(dtype=object)[first] if len(history) else None
+        seen = (positions >= 0) & (first_date <= presented_on) & (first_source != source)
+        earlier_date = np.where(seen, first_date, "")
+
+        in_file = checks.duplicated(keep="first").to_numpy()
+        out_of_range = self._out_of_range(checks, register)
+
+        reason = np.select(
+            [in_file, seen, out_of_range],
+            [
+                "DUPLICATE: Presented earlier in this file",
+                ("DUPLICATE: Previously presented on " + pd.Series(earlier_date, dtype=object)).to_numpy(),
+                "FORGERY: Serial out of issued range",
+            ],
+            default="",
+        )
+        flagged = in_file | seen | out_of_range
+        issued = register["Issued Cents"].reindex(checks[flagged])
+        return pd.DataFrame({
+            "Check #": checks.to_numpy()[flagged],
+            "Payee": df_bank["Payee"].to_numpy()[flagged],
+            "Amount Cents": amount_cents(df_bank)[flagged],
+            "Reason": reason[flagged],
+            "Payee Score": np.nan,
+            ISSUED_COLUMN: pd.arrays.IntegerArray(
+                issued.fillna(0).to_numpy(dtype="int64"), issued.isna().to_numpy()
+            ),
+        })
+
+    @staticmethod
+    def _out_of_range(checks, register):
+        issued = pd.to_numeric(pd.Series(register.index, dtype=object), errors="coerce").dropna()
+        if issued.empty:
+            return np.zeros(len(checks), dtype=bool)
+        serial = pd.to_numeric(checks, errors="coerce").to_numpy(dtype=float)
+        return ~np.isnan(serial) & ((serial < issued.min()) | (serial > issued.max()))
+
+    # --- RECORDING ---
+    def record(self, df_bank, account=DEFAULT_ACCOUNT, presented_on=None, source=None):
+        """Add a paid file's check numbers to the index (first presentment wins).
+
+        `source` identifies the file (reconciliation.paid_file_key) for
+        audit and for screen()'s same-file check.
+        """
+        presented_on = (presented_on or date.today()).isoformat()
+        checks = pd.Index(df_bank["Check #"].astype(str).str.strip().unique())
+        history = self.history(account)
+        new = checks[history.index.get_indexer(checks) < 0]
+        if not len(new):
+            return 0
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO presented (account, check_num, presented_on, source) VALUES (?, ?, ?, ?)",
+                ((account, check, presented_on, source) for check in new),
+            )
+        added = pd.DataFrame({"presented_on": presented_on, "source": source}, index=new.rename("check_num"))
+        with self._lock:
+            self._history[account] = pd.concat([self._history[account], added])
+        return len(new)
+
+
+def merge_anomalies(exceptions, anomalies):
+    """Replace the reconciliation exceptions of anomalous presentments with the anomalies.
+
+    Each anomaly replaces at most one exception: the next one for the same
+    presentment (account, check number, amount and payee). Other
+    presentments of the check keep their exceptions, e.g. an amount
+    mismatch on the first one when a later one is a duplicate.
+    """
+    if anomalies.empty:
+        return exceptions
+    candidates = exceptions["Check #"].astype(str).isin(anomalies["Check #"].astype(str)).to_numpy()
+    replaced = np.zeros(len(exceptions), dtype=bool)
+    replaced[candidates] = _presentments(exceptions[candidates]).isin(_presentments(anomalies))
+    kept = exceptions[~replaced]
+    columns = [c for c in exception_columns(exceptions) if c in exceptions]
+    return pd.concat([anomalies[columns], kept[columns]], ignore_index=True)
+
+
+def _presentments(df):
+    """(account, check, amount, payee, n) per row: the n-th row with those fields in `df`."""
+    keys = [c for c in (ACCOUNT_COLUMN, "Check #", "Amount Cents", "Payee") if c in df]
+    fields = pd.DataFrame({c: df[c].astype(str).to_numpy(dtype=object) for c in keys})
+    fields["n"] = fields.groupby(keys, sort=False).cumcount()
+    return pd.MultiIndex.from_frame(fields)
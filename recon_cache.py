@@ -0,0 +1,88 @@
+"""Content-addressed cache of reconciliation results.
+
+Streamlit reruns the whole script on every button click. Keying the
+unstatused exceptions by a hash of both uploaded files (plus the rule
+version) lets a rerun skip parsing and matching and only re-apply the
+current decisions.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+from reconciliation import RULE_VERSION
+
+
+def content_key(cust_bytes, bank_bytes, rule_version=RULE_VERSION, presentment=None):
+    """Cache key of two files; a corrected upload also carries the presentment it corrects."""
+    digest = hashlib.sha256()
+    for part in (cust_bytes, bank_bytes):
+        digest.update(hashlib.sha256(part).digest())
+    digest.update(rule_version.encode())
+    if presentment is not None:
+        digest.update(b"corrects:" + presentment.encode())
+    return digest.hexdigest()
+
+
+class ReconciliationCache:
+    """Thread-safe LRU of exception frames, bounded by entry count and total bytes."""
+
+    def __init__(self, max_entries=16, max_bytes=512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, key):
+        """Cached exceptions for a content_key, or None (never computes)."""
+        return self._get(key)
+
+    def put(self, key, exceptions):
+        size = int(exceptions.memory_usage(deep=True).sum())
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = exceptions
+            self._sizes[key] = size
+            while self._entries and (len(self._entries) > self.max_entries or self.nbytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                if oldest == key and len(self._entries) == 1:
+                    break
+                self._drop(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+
+    @property
+    def nbytes(self):
+        return sum(self._sizes.values())
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def _drop(self, key):
+        del self._entries[key]
+        del self._sizes[key]
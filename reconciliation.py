@@ -0,0 +1,191 @@
+"""Vectorized Positive Pay reconciliation engine.
+
+Matches the bank paid file against the customer register with one keyed
+join instead of scanning the register once per presented check.
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from money import amount_cents, format_cents
+from payee_match import default_matcher
+
+# Bump whenever classification rules change so cached results are invalidated.
+RULE_VERSION = "9"
+
+# Register rows issued to this payee are voided checks; any presentment is an exception.
+VOID_PAYEE_KEY = "void"
+
+EXCEPTION_COLUMNS = ["Check #", "Payee", "Amount Cents", "Reason", "Payee Score", "Status"]
+
+# Optional client-account column on multi-client inputs and their exceptions (see partitioning).
+ACCOUNT_COLUMN = "Account"
+
+# Optional column with the register's amount for the check (missing when it was never issued);
+# risk scoring measures amount mismatches against it.
+ISSUED_COLUMN = "Issued Cents"
+
+# Optional column naming the presentment an exception came from (see tag_presentments): the
+# paid file's key, plus ".<n>" for the n-th repeat of a check within that file. Decisions are
+# keyed by it, so a decision on one paid file never carries over to a re-presentment in another.
+PRESENTMENT_COLUMN = "Presentment"
+
+# Optional column added by the scoring stage (see risk_scoring); the review queue is ordered by it.
+RISK_COLUMN = "Risk Score"
+
+
+# --- REGISTER PREPARATION ---
+def prepare_register(df_cust):
+    """Index the issued register by check number (first row wins on duplicates)."""
+    register = pd.DataFrame({
+        "Check #": df_cust["Check #"].astype(str).to_numpy(),
+        "Issued Cents": amount_cents(df_cust),
+        "Issued Payee": df_cust["Payee"].to_numpy(),
+    })
+    register = register.drop_duplicates("Check #", keep="first")
+    register["Issued Payee Key"] = payee_keys(register["Issued Payee"])
+    return register.set_index("Check #")
+
+
+def payee_keys(payees):
+    """Lower-cased payee names; categoricals are lowered once per category, not per row."""
+    if isinstance(payees.dtype, pd.CategoricalDtype):
+        lowered = np.append(payees.cat.categories.astype(str).str.lower().to_numpy(dtype=object), "nan")
+        return pd.Series(lowered[payees.cat.codes.to_numpy()], index=payees.index)
+    return payees.astype(str).str.lower()
+
+
+# --- MATCHING ---
+def find_exceptions(register, df_bank):
+    """Classify every presented check in one pass; returns exceptions (with Issued Cents) without Status."""
+    check_nums = df_bank["Check #"].astype(str)
+    matched = register.reindex(check_nums)
+
+    presented_cents = amount_cents(df_bank)
+    bank_payee_key = payee_keys(df_bank["Payee"]).to_numpy()
+    # BAI2 and X9.37 paid files carry no payee; those items are matched on amount only.
+    has_payee = df_bank["Payee"].notna().to_numpy()
+
+    issued_payee = matched["Issued Payee"].to_numpy()
+    missing = matched["Issued Cents"].isna().to_numpy()
+    issued_cents = matched["Issued Cents"].fillna(0).to_numpy(dtype="int64")
+    voided = ~missing & (matched["Issued Payee Key"].to_numpy() == VOID_PAYEE_KEY)
+    amt_mismatch = ~missing & ~voided & (presented_cents != issued_cents)
+    payee_mismatch = ~missing & ~voided & ~amt_mismatch & has_payee & (bank_payee_key != matched["Issued Payee Key"].to_numpy())
+
+    reason = np.select(
+        [missing, voided],
+        ["FORGERY: Not in Register", "VOID PRESENTED: (Voided in Register)"],
+        default="",
+    ).astype(object)
+    # Reason text that quotes the register is only built for the rows that need it.
+    issued_amount_txt = format_cents(pd.Series(issued_cents[amt_mismatch]))
+    reason[amt_mismatch] = ("AMT MISMATCH: (Issued " + issued_amount_txt + ")").to_numpy()
+    issued_payee_txt = pd.Series(issued_payee[payee_mismatch], dtype=object).astype(str)
+    reason[payee_mismatch] = ("PAYEE MISMATCH: (Issued to " + issued_payee_txt + ")").to_numpy()
+
+    # Similarity is only needed to triage payee mismatches, so score just those rows.
+    payee_score = np.full(len(df_bank), np.nan)
+    if payee_mismatch.any():
+        payee_score[payee_mismatch] = default_matcher.score(
+            issued_payee[payee_mismatch], df_bank["Payee"].to_numpy()[payee_mismatch]
+        )
+
+    flagged = missing | voided | amt_mismatch | payee_mismatch
+    return pd.DataFrame({
+        "Check #": check_nums.to_numpy()[flagged],
+        "Payee": df_bank["Payee"].to_numpy()[flagged],
+        "Amount Cents": presented_cents[flagged],
+        "Reason": reason[flagged],
+        "Payee Score": payee_score[flagged],
+        ISSUED_COLUMN: pd.arrays.IntegerArray(issued_cents[flagged], missing[flagged]),
+    })
+
+
+def exception_columns(df_exceptions):
+    """EXCEPTION_COLUMNS, led by Account when present and followed by Issued Cents, Presentment and Risk Score when present."""
+    optional = [column for column in (ISSUED_COLUMN, PRESENTMENT_COLUMN, RISK_COLUMN) if column in df_exceptions]
+    return ([ACCOUNT_COLUMN] if ACCOUNT_COLUMN in df_exceptions else []) + EXCEPTION_COLUMNS + optional
+
+
+def check_ids(df_exceptions):
+    """Check numbers qualified by account (`<account>_<check #>`) when the exceptions have one.
+
+    Check numbers are only unique within an account.
+    """
+    if ACCOUNT_COLUMN in df_exceptions:
+        return df_exceptions[ACCOUNT_COLUMN].astype(str) + "_" + df_exceptions["Check #"].astype(str)
+    return df_exceptions["Check #"].astype(str)
+
+
+def item_ids(df_exceptions):
+    """Decision-store keys for check exceptions.
+
+    The same check can be presented again in a later file, so ids carry the
+    presentment, as well as the account (see check_ids), when the
+    exceptions have them.
+    """
+    ids = "recon_" + check_ids(df_exceptions)
+    if PRESENTMENT_COLUMN in df_exceptions:
+        ids = ids + "@" + df_exceptions[PRESENTMENT_COLUMN].astype(str)
+    return ids
+
+
+def paid_file_key(bank_bytes):
+    """Short content key of a paid file, used as its presentment."""
+    return hashlib.sha256(bank_bytes).hexdigest()[:16]
+
+
+def tag_presentments(df_exceptions, paid_key):
+    """Add the Presentment column: `paid_key`, with ".<n>" on the n-th repeat of a check (in row order)."""
+    checks = [df_exceptions[ACCOUNT_COLUMN].astype(str)] if ACCOUNT_COLUMN in df_exceptions else []
+    repeat = df_exceptions.groupby([*checks, df_exceptions["Check #"].astype(str)], sort=False).cumcount()
+    suffix = np.where(repeat.to_numpy() > 0, "." + (repeat + 1).astype(str).to_numpy(dtype=object), "")
+    return df_exceptions.assign(**{PRESENTMENT_COLUMN: paid_key + pd.Series(suffix, index=df_exceptions.index)})
+
+
+def apply_decisions(df_exceptions, decisions):
+    """Attach the analyst decision (or PENDING) to each exception.
+
+    `decisions` maps item id to decision: a dict or a Series from DecisionStore.
+    """
+    df = df_exceptions.copy()
+    df["Status"] = item_ids(df).map(decisions).fillna("PENDING")
+    return df[exception_columns(df)]
+
+
+def process_reconciliation(df_cust, df_bank, decisions=None):
+    register = prepare_register(df_cust)
+    return apply_decisions(find_exceptions(register, df_bank), decisions or {})
+
+
+# --- REFERENCE IMPLEMENTATION ---
+def process_reconciliation_loop(df_cust, df_bank, decisions=None):
+    """Original row-by-row matcher, kept for benchmarking and parity checks."""
+    decisions = decisions or {}
+    exceptions = []
+    df_cust = df_cust.assign(**{"Check #": df_cust["Check #"].astype(str)})
+    df_bank = df_bank.assign(**{"Check #": df_bank["Check #"].astype(str)})
+
+    for _, bank_row in df_bank.iterrows():
+        check_num = bank_row['Check #']
+        match = df_cust[df_cust['Check #'] == check_num]
+
+        reason = None
+        if match.empty:
+            reason = "FORGERY: Not in Register"
+        elif float(bank_row['Amount']) != float(match.iloc[0]['Amount']):
+            reason = f"AMT MISMATCH: (Issued ${match.iloc[0]['Amount']})"
+        elif str(bank_row['Payee']).lower() != str(match.iloc[0]['Payee']).lower():
+            reason = f"PAYEE MISMATCH: (Issued to {match.iloc[0]['Payee']})"
+
+        if reason:
+            exceptions.append({
+                "Check #": check_num,
+                "Payee": bank_row['Payee'],
+                "Amount Cents": round(float(bank_row['Amount']) * 100),
+                "Reason": reason,
+                "Status": decisions.get(f"recon_{check_num}", "PENDING")
+            })
+    return pd.DataFrame(exceptions, columns=EXCEPTION_COLUMNS)
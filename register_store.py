@@ -0,0 +1,108 @@
+"""Persistent Parquet store for issued-check registers.
+
+Daily issue files are appended as Parquet partitions laid out as
+``<root>/account=<id>/issue_date=<YYYY-MM-DD>/part-*.parquet``. Each
+account's check-number index is built once per process from the
+columnar files and then extended in place on every append, so
+reconciliation never re-parses the register CSV.
+"""
+import os
+import threading
+import uuid
+from datetime import date
+
+import pandas as pd
+
+from config import DATA_DIR
+from money import amount_cents
+from reconciliation import prepare_register
+
+DEFAULT_ACCOUNT = "DEFAULT"
+
+STORE_COLUMNS = ["Check #", "Amount Cents", "Payee"]
+
+
+class RegisterStore:
+    def __init__(self, root=None):
+        self.root = root or os.path.join(DATA_DIR, "registers")
+        self._indexes = {}
+        self._versions = {}
+        self._disk_tokens = {}
+        self._lock = threading.Lock()
+
+    # --- WRITES ---
+    def append(self, df_issues, account=DEFAULT_ACCOUNT, issue_date=None):
+        """Persist one day's issued checks and fold them into the in-memory index."""
+        issue_date = (issue_date or date.today()).isoformat()
+        df = pd.DataFrame({
+            "Check #": df_issues["Check #"].astype(str),
+            "Amount Cents": amount_cents(df_issues),
+            "Payee": df_issues["Payee"].astype(str),
+        })
+        partition = os.path.join(self._account_dir(account), f"issue_date={issue_date}")
+        os.makedirs(partition, exist_ok=True)
+        df.to_parquet(os.path.join(partition, f"part-{uuid.uuid4().hex}.parquet"), index=False)
+
+        with self._lock:
+            if account in self._indexes:
+                # Earlier issues win on duplicate check numbers, matching prepare_register.
+                new = prepare_register(df)
+                new = new[~new.index.isin(self._indexes[account].index)]
+                self._indexes[account] = pd.concat([self._indexes[account], new])
+            self._versions[account] = self._versions.get(account, 0) + 1
+        return len(df)
+
+    # --- READS ---
+    def accounts(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(d.split("=", 1)[1] for d in os.listdir(self.root) if d.startswith("account="))
+
+    def register(self, account=DEFAULT_ACCOUNT):
+        """The account's register indexed by Check #, loaded from Parquet on first use."""
+        with self._lock:
+            if account not in self._indexes:
+                self._indexes[account] = prepare_register(self._read_partitions(account))
+            return self._indexes[account]
+
+    def lookup(self, check_numbers, account=DEFAULT_ACCOUNT):
+        """Issued rows for the given check numbers (NaN where never issued)."""
+        return self.register(account).reindex(pd.Index(check_numbers).astype(str))
+
+    def version(self, account=DEFAULT_ACCOUNT):
+        """Token that changes whenever the account's register changes (for cache keys).
+
+        The partitions are scanned once per process (so a restart after
+        appends never reuses an old token); appends then bump a counter.
+        """
+        with self._lock:
+            if account not in self._disk_tokens:
+                files = self._partition_files(account)
+                latest = max((os.path.getmtime(f) for f in files), default=0)
+                self._disk_tokens[account] = f"{len(files)}:{latest}"
+            return f"{account}:{self._disk_tokens[account]}:{self._versions.get(account, 0)}"
+
+    def _read_partitions(self, account):
+        files = self._partition_files(account)
+        if not files:
+            return pd.DataFrame({"Check #": pd.Series([], dtype="str"), "Amount Cents": pd.Series([], dtype="int64"),
+                                 "Payee": pd.Series([], dtype="str")})
+        # Issue-date directories sort chronologically, so the earliest issue is kept on duplicates.
+        return pd.concat([pd.read_parquet(f, columns=STORE_COLUMNS) for f in files], ignore_index=True)
+
+    def _partition_files(self, account):
+        account_dir = self._account_dir(account)
+        if not os.path.isdir(account_dir):
+            return []
+        files = []
+        for partition in sorted(os.listdir(account_dir)):
+            partition_dir = os.path.join(account_dir, partition)
+            files.extend(
+                os.path.join(partition_dir, name)
+                for name in sorted(os.listdir(partition_dir), key=lambda n: os.path.getmtime(os.path.join(partition_dir, n)))
+                if name.endswith(".parquet")
+            )
+        return files
+
+    def _account_dir(self, account):
+        return os.path.join(self.root, f"account={account}")
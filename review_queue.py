@@ -0,0 +1,62 @@
+"""Server-side filtering, ranking and pagination for the exception review queue.
+
+Only the current page is handed to the renderer, so widget count per
+rerun is bounded by the page size rather than the number of exceptions.
+Ranking selects just the rows up to the requested page instead of
+sorting the whole queue.
+"""
+import math
+
+import numpy as np
+
+from reconciliation import RISK_COLUMN
+
+PAGE_SIZES = [10, 25, 50, 100]
+
+
+def reason_type(reasons):
+    """Collapse detailed reasons ("AMT MISMATCH: (Issued $120.0)") to their category."""
+    # One regex replace runs inside Arrow; split().str[0] builds a Python list per row.
+    return reasons.astype(str).str.replace(r":.*", "", regex=True).str.strip()
+
+
+def filter_exceptions(df_exceptions, reasons=None, statuses=None, accounts=None):
+    """Keep rows whose reason category, status and account are in the selected sets (empty = all)."""
+    mask = None
+    if reasons:
+        mask = reason_type(df_exceptions["Reason"]).isin(reasons)
+    if statuses:
+        status_mask = df_exceptions["Status"].isin(statuses)
+        mask = status_mask if mask is None else mask & status_mask
+    if accounts:
+        account_mask = df_exceptions["Account"].isin(accounts)
+        mask = account_mask if mask is None else mask & account_mask
+    return df_exceptions if mask is None else df_exceptions[mask]
+
+
+def top_k(df_exceptions, k, column=RISK_COLUMN):
+    """The k highest-scoring rows, highest first; equal scores keep queue order (as a stable sort would).
+
+    A partial selection finds the k-th score in O(n); only the rows at or
+    above it are sorted. Missing scores rank last.
+    """
+    scores = np.nan_to_num(df_exceptions[column].to_numpy(dtype=float), nan=-np.inf)
+    k = max(0, min(k, len(scores)))
+    if k < len(scores):
+        threshold = np.partition(scores, len(scores) - k)[len(scores) - k] if k else np.inf
+        above = np.flatnonzero(scores > threshold)
+        rows = np.union1d(above, np.flatnonzero(scores == threshold)[:k - len(above)])
+    else:
+        rows = np.arange(len(scores))
+    return df_exceptions.iloc[rows[np.argsort(-scores[rows], kind="stable")]]
+
+
+def page_count(n_rows, page_size):
+    return max(1, math.ceil(n_rows / page_size))
+
+
+def paginate(df_exceptions, page, page_size):
+    """Return the rows for a 1-based page number, clamped to the valid range."""
+    page = min(max(1, page), page_count(len(df_exceptions), page_size))
+    start = (page - 1) * page_size
+    return df_exceptions.iloc[start:start + page_size]
@@ -0,0 +1,105 @@
+"""Demo inputs for the Streamlit apps: sample files, ACH rules and debits.
+
+Each sample is built on first use and kept for the life of the process,
+so a rerun neither rebuilds DataFrames nor re-serializes CSV. Cached
+frames are shared by every session and must not be modified in place.
+"""
+from functools import lru_cache
+
+import pandas as pd
+
+# 20 fraud scenarios: the customer register (the truth) ...
+FRAUD_REGISTER_CSV = """Check #,Amount,Payee
+1010,120.00,Vendor Alpha
+1011,45.82,Service Beta
+1012,5000.00,Equipment Gamma
+1013,150.00,Repair Delta
+1014,2300.00,Consulting Epsilon
+2010,1000.00,ACME Corp
+2011,500.00,Internal Revenue Service
+2012,150.00,Staples
+2013,2500.00,City of New York
+2014,800.00,Delta Airlines
+4010,0.00,VOID
+4011,100.00,Old Vendor
+4012,500.00,Stopped Payee
+4013,25.00,Duplicate Test
+4014,10.00,Small Payment
+1001,500.00,Valid Match 1
+1002,750.00,Valid Match 2
+1003,1200.00,Valid Match 3
+1004,30.00,Valid Match 4
+1005,95.00,Valid Match 5"""
+
+# ... and the bank paid file (the reality, including the fraud).
+FRAUD_PAID_CSV = """Check #,Amount,Payee
+1010,1200.00,Vendor Alpha
+1011,45.28,Service Beta
+1012,5000.80,Equipment Gamma
+1013,750.00,Repair Delta
+1014,3200.00,Consulting Epsilon
+2010,1000.00,ACME Corporation
+2011,500.00,John Doe
+2012,150.00,Cash
+2013,2500.00,City of New York Inc
+2014,800.00,Deltas Air
+3010,8500.00,Luxury Rentals LLC
+3011,12.50,Local Gas Station
+3012,1000.00,Payroll Service
+3013,55.00,Generic Retailer
+3014,15000.00,Wire Transfer Co
+4010,50.00,Voided User
+4011,100.00,Old Vendor
+4012,500.00,Stopped Payee
+4013,25.00,Duplicate Test
+4014,100.00,Small Payment"""
+
+# Small check samples by name (see checks() / csv_text()).
+CHECKS = {
+    "register": [
+        {"Check #": "5001", "Amount": 1000.00, "Payee": "Office Depot"},
+        {"Check #": "5002", "Amount": 50.00, "Payee": "Local Cafe"},
+    ],
+    "customer": [
+        {"Check #": "5001", "Amount": 1000.00, "Payee": "Office Depot"},
+        {"Check #": "5002", "Amount": 50.00, "Payee": "Local Cafe"},
+        {"Check #": "5003", "Amount": 5010.00, "Payee": "Local Restaurant"},
+    ],
+    "presented": [
+        {"Check #": "5001", "Amount": 1000.00, "Payee": "Office Depot"},  # Match
+        {"Check #": "5002", "Amount": 500.00, "Payee": "Local Cafe"},     # Amount mismatch
+        {"Check #": "5003", "Amount": 2400.00, "Payee": "Unknown LLC"},   # Not in register
+    ],
+}
+
+ACH_RULES = [
+    {"Vendor": "AWS Cloud", "Company ID": "98765", "Max Amount": 1500.00},
+    {"Vendor": "Verizon", "Company ID": "54321", "Max Amount": 250.00},
+]
+
+INCOMING_ACH = [
+    {"Vendor": "Verizon", "ID": "54321", "Amount": 280.00},
+    {"Vendor": "Suspicious Inc", "ID": "99999", "Amount": 500.00},
+]
+
+
+@lru_cache(maxsize=None)
+def checks(name):
+    """A check sample as a DataFrame (Check #, Amount, Payee)."""
+    return pd.DataFrame(CHECKS[name])
+
+
+@lru_cache(maxsize=None)
+def csv_text(name):
+    """A check sample as CSV text, as offered by the download buttons."""
+    return checks(name).to_csv(index=False)
+
+
+@lru_cache(maxsize=None)
+def ach_rules():
+    return pd.DataFrame(ACH_RULES)
+
+
+@lru_cache(maxsize=None)
+def incoming_ach():
+    return pd.DataFrame(INCOMING_ACH)
@@ -0,0 +1,78 @@
+"""Process-wide singletons for the Streamlit apps.
+
+Each store, cache and compiled rule set is built once per server process
+(st.cache_resource) and shared by every session, rerun and page module.
+Each factory imports its module itself, so a page only loads the stores it
+asks for.
+"""
+import streamlit as st
+
+
+# --- INSTRUMENTATION (stage timings of every rerun; see the ?admin=1 sidebar panel) ---
+@st.cache_resource
+def get_instrumentation():
+    from instrumentation import Instrumentation
+    return Instrumentation()
+
+
+# --- RECONCILIATION CACHE (shared across sessions and reruns) ---
+@st.cache_resource
+def get_recon_cache():
+    from recon_cache import ReconciliationCache
+    return ReconciliationCache()
+
+
+@st.cache_resource
+def get_register_store():
+    from register_store import RegisterStore
+    return RegisterStore()
+
+
+# --- DECISION STORE (durable, shared by all analyst sessions) ---
+@st.cache_resource
+def get_decision_store():
+    from decision_store import DecisionStore
+    return DecisionStore()
+
+
+# Exposure aggregates live in the decision database; triggers keep them in step with decisions.
+@st.cache_resource
+def get_exposure_summary():
+    from exposure_summary import ExposureSummary
+    return ExposureSummary(get_decision_store().path)
+
+
+# --- EXCEPTION SNAPSHOTS (Arrow IPC per reconciliation, memory-mapped by other sessions and tools) ---
+@st.cache_resource
+def get_snapshot_store():
+    from snapshot_store import SnapshotStore
+    return SnapshotStore()
+
+
+# --- CHECK IMAGES (thumbnails cached on disk and in memory) ---
+@st.cache_resource
+def get_check_images():
+    from check_images import CheckImageService
+    return CheckImageService()
+
+
+# --- PRESENTED-ITEMS INDEX (duplicate presentments across days) ---
+@st.cache_resource
+def get_presentment_index():
+    from presentment_index import PresentmentIndex
+    return PresentmentIndex()
+
+
+# --- BACKGROUND JOBS (shared worker pool; identical uploads share one job) ---
+@st.cache_resource
+def get_job_manager():
+    from jobs import JobManager
+    return JobManager()
+
+
+# --- ACH RULES (compiled once; the demo rules are the same for every session) ---
+@st.cache_resource
+def get_ach_engine():
+    import sample_data
+    from ach_filter import AchRuleSet
+    return AchRuleSet(sample_data.ach_rules())
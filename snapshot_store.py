@@ -0,0 +1,161 @@
+"""Arrow IPC snapshots of reconciled exceptions, with decisions and notes.
+
+One reconciliation is written once, as an uncompressed Arrow IPC file
+named by its content key, holding every exception with its item id,
+status and note. Readers memory-map the file: columns are used in place
+from the page cache, so another session, the batch tools or the return
+file generator open a snapshot of any size in milliseconds and share the
+same bytes instead of re-running matching or re-parsing CSV. Files are
+written to a temporary name and renamed, so a reader never sees a
+partial snapshot.
+"""
+import os
+import uuid
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+
+from config import DATA_DIR
+from reconciliation import ACCOUNT_COLUMN, PRESENTMENT_COLUMN, RULE_VERSION, exception_columns, item_ids
+
+SNAPSHOT_COLUMNS = ["Note"]
+
+# Repetitive text columns are stored dictionary-encoded (Reason quotes the register, so it is mostly unique).
+DICTIONARY_COLUMNS = [ACCOUNT_COLUMN, "Payee", "Status", PRESENTMENT_COLUMN]
+
+SUFFIX = ".arrow"
+
+LISTING_COLUMNS = ["Key", "Rows", "Bytes", "Created", "Rule Version"]
+
+
+def to_table(df_exceptions, decisions=None, notes=None, metadata=None):
+    """Exceptions plus Status and Note as an Arrow table.
+
+    `decisions` and `notes` map item id to value (dicts or DecisionStore
+    Series); an existing Status column is kept when no decisions are given.
+    Item ids are not stored: item_ids() derives them from the snapshot.
+    """
+    ids = item_ids(df_exceptions)
+    df = df_exceptions.copy()
+    df.attrs = {}  # e.g. account timings: run details, not part of the snapshot
+    if decisions is not None or "Status" not in df:
+        df["Status"] = ids.map(decisions if decisions is not None else {}).fillna("PENDING").to_numpy()
+    df["Note"] = ids.map(notes if notes is not None else {}).to_numpy()
+    df = df[exception_columns(df) + SNAPSHOT_COLUMNS]
+    for column in DICTIONARY_COLUMNS:
+        if column in df:
+            df[column] = df[column].astype("category").cat.remove_unused_categories()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # pandas text converts to large_string; 32-bit offsets halve the offset buffers.
+    table = table.cast(pa.schema(
+        [field.with_type(_narrow(field.type)) for field in table.schema], metadata=table.schema.metadata,
+    ))
+    meta = {
+        "rule_version": RULE_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "rows": table.num_rows,
+        **(metadata or {}),
+    }
+    return table.replace_schema_metadata({
+        **(table.schema.metadata or {}), **{f"positive_pay.{k}": str(v) for k, v in meta.items()},
+    })
+
+
+def _narrow(arrow_type):
+    # All-null columns (no notes, no payees in a BAI2 file) are still typed as text.
+    if pa.types.is_large_string(arrow_type) or pa.types.is_null(arrow_type):
+        return pa.string()
+    if pa.types.is_dictionary(arrow_type):
+        return pa.dictionary(arrow_type.index_type, _narrow(arrow_type.value_type))
+    return arrow_type
+
+
+def to_bytes(table):
+    """A table as Arrow IPC file bytes (for downloads)."""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def read_table(path):
+    """Memory-map an Arrow IPC snapshot; the columns are not copied into process memory."""
+    with pa.memory_map(path, "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def to_frame(table):
+    """A snapshot table as a DataFrame with the usual exception columns (text as Arrow-backed str)."""
+    df = table.to_pandas()
+    for column in DICTIONARY_COLUMNS + SNAPSHOT_COLUMNS:
+        if column in df:
+            df[column] = df[column].astype("str")
+    return df
+
+
+def metadata(table_or_schema):
+    """The positive_pay.* metadata written with a snapshot, without the prefix."""
+    schema = getattr(table_or_schema, "schema", table_or_schema)
+    return {
+        key.decode()[len("positive_pay."):]: value.decode()
+        for key, value in (schema.metadata or {}).items() if key.startswith(b"positive_pay.")
+    }
+
+
+class SnapshotStore:
+    """Snapshots on disk, one file per reconciliation content key."""
+
+    def __init__(self, root=None):
+        self.root = root or os.path.join(DATA_DIR, "snapshots")
+
+    # --- WRITES ---
+    def write(self, key, df_exceptions, decisions=None, notes=None, metadata=None):
+        """Write (or replace) the snapshot for `key`; returns its path."""
+        os.makedirs(self.root, exist_ok=True)
+        table = to_table(df_exceptions, decisions, notes, {"key": key, **(metadata or {})})
+        path = self.path(key)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, path)
+        return path
+
+    def delete(self, key):
+        if self.exists(key):
+            os.remove(self.path(key))
+
+    # --- READS ---
+    def path(self, key):
+        return os.path.join(self.root, f"{key}{SUFFIX}")
+
+    def exists(self, key):
+        return os.path.isfile(self.path(key))
+
+    def table(self, key):
+        """The memory-mapped snapshot for `key`, or None if none was written."""
+        return read_table(self.path(key)) if self.exists(key) else None
+
+    def exceptions(self, key, statused=True):
+        """Exceptions as written (with Status and Note; without them if not `statused`), or None."""
+        table = self.table(key)
+        if table is None:
+            return None
+        if not statused:
+            table = table.drop_columns(["Status", *SNAPSHOT_COLUMNS])
+        return to_frame(table)
+
+    def listing(self):
+        """Key, rows, size, creation time and rule version of each snapshot, newest first (footers only)."""
+        rows = []
+        if os.path.isdir(self.root):
+            for name in os.listdir(self.root):
+                if not name.endswith(SUFFIX):
+                    continue
+                path = os.path.join(self.root, name)
+                with pa.memory_map(path, "r") as source:
+                    meta = metadata(pa.ipc.open_file(source).schema)
+                rows.append((name[:-len(SUFFIX)], int(meta.get("rows", 0)), os.path.getsize(path),
+                             meta.get("created_at"), meta.get("rule_version")))
+        frame = pd.DataFrame(rows, columns=LISTING_COLUMNS)
+        return frame.sort_values("Created", ascending=False, ignore_index=True)
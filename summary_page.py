@@ -0,0 +1,60 @@
+"""Executive Summary page: exposure totals, charts and drill-down for a period.
+
+Imported by app.py only when the page is first shown.
+"""
+from datetime import date, timedelta
+
+import streamlit as st
+
+import services
+from money import format_cents
+
+instrumentation = services.get_instrumentation()
+decision_store = services.get_decision_store()
+exposure_summary = services.get_exposure_summary()
+
+
+def render(analyst):
+    st.title("📊 Executive Exception Summary")
+
+    d1, d2 = st.columns([2, 1])
+    period = d1.date_input("Period", value=(date.today() - timedelta(days=27), date.today()))
+    start, end = period if len(period) == 2 else (period[0], period[0])
+    accounts = exposure_summary.totals("Account")["Account"].tolist()
+    account = d2.selectbox("Account", ["All accounts", *accounts])
+    account = None if account == "All accounts" else account
+
+    with instrumentation.stage("exposure overview"):
+        overview = exposure_summary.overview(start, end, account)
+    if not overview["items"]:
+        st.info("No exceptions recorded for this period. Reconcile files on the 'Processing Dashboard' first.")
+    else:
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Total Exceptions", overview["items"])
+        m2.metric("Fraud Exposure", format_cents(overview["cents"]))
+        m3.metric("Pending Decisions", overview["pending"])
+
+        st.divider()
+        by_reason = exposure_summary.totals("Reason", start, end, account)
+        by_status = exposure_summary.totals("Status", start, end, account)
+        c1, c2 = st.columns(2)
+        c1.subheader("Exposure by Reason")
+        c1.bar_chart(by_reason.set_index("Reason")["Exposure Cents"] / 100)
+        c2.subheader("Exposure by Status")
+        c2.bar_chart(by_status.set_index("Status")["Exposure Cents"] / 100)
+        st.subheader("Exposure by Day")
+        st.bar_chart(exposure_summary.totals("Day", start, end, account).set_index("Day")["Exposure Cents"] / 100)
+
+        st.divider()
+        st.subheader("Drill-down")
+        f1, f2 = st.columns(2)
+        reason = f1.selectbox("Reason", ["All", *by_reason["Reason"]])
+        status = f2.selectbox("Status", ["All", *by_status["Status"]])
+        with instrumentation.stage("drill-down") as stage:
+            drill = exposure_summary.items(
+                start, end, account, reason=None if reason == "All" else reason, status=None if status == "All" else status
+            )
+            drill.insert(4, "Amount", format_cents(drill.pop("Amount Cents")))
+            drill["User Notes"] = drill["Item"].map(decision_store.notes(drill["Item"])).fillna("")
+            stage.rows = len(drill)
+        st.dataframe(drill, use_container_width=True, hide_index=True)
@@ -0,0 +1,180 @@
+"""Reproducible synthetic register / paid-file pairs at any volume.
+
+Scales the fraud scenario types from the demo files (FRAUD_REGISTER_CSV /
+FRAUD_PAID_CSV in sample_data.py) to arbitrary row counts. Every presented check is tagged with
+the scenario that produced it so benchmark runs can be checked for recall.
+"""
+import numpy as np
+import pandas as pd
+
+from money import to_cents
+
+# Share of presented checks per scenario; the remainder are clean matches.
+DEFAULT_MIX = {
+    "forgery": 0.010,           # 3010-3014: presented check never issued
+    "transposition": 0.004,     # 1011: 45.82 -> 45.28
+    "inflation": 0.004,         # 1010: 120.00 -> 1200.00
+    "cents_drift": 0.003,       # 1012: 5000.00 -> 5000.80
+    "digit_swap": 0.003,        # 1014: 2300.00 -> 3200.00
+    "payee_swap": 0.004,        # 2011: Internal Revenue Service -> John Doe
+    "payee_suffix": 0.006,      # 2010: ACME Corp -> ACME Corporation
+    "payee_typo": 0.003,        # 2014: Delta Airlines -> Deltas Air
+    "void_presented": 0.002,    # 4010: issued as VOID for 0.00, presented for 50.00
+}
+
+VENDOR_WORDS = [
+    "Acme", "Beta", "Gamma", "Delta", "Epsilon", "Summit", "Harbor", "Pioneer", "Atlas", "Keystone",
+    "Northwind", "Bluebird", "Granite", "Meridian", "Sterling", "Cobalt", "Evergreen", "Falcon",
+]
+VENDOR_KINDS = ["Supply", "Services", "Consulting", "Repair", "Equipment", "Logistics", "Foods", "Airlines"]
+SUFFIXES = ["Inc", "LLC", "Corp", "Corporation", "Co"]
+SWAP_PAYEES = ["John Doe", "Cash", "Jane Smith", "Bearer", "Unknown Party"]
+
+
+def vendor_names(n_vendors, rng):
+    first = rng.choice(VENDOR_WORDS, n_vendors)
+    kind = rng.choice(VENDOR_KINDS, n_vendors)
+    return pd.Series(first, dtype=object) + " " + kind + " " + pd.Series(np.arange(n_vendors) % 997, dtype=str)
+
+
+def _transpose_cents(cents):
+    """Swap the last two digits of the cents; nudge by 9 cents when they are equal."""
+    tens, ones = (cents // 10) % 10, cents % 10
+    swapped = cents - tens * 10 - ones + ones * 10 + tens
+    return np.where(tens == ones, cents + 9, swapped)
+
+
+def _swap_leading_digits(cents):
+    """Swap the first two digits of the dollar amount (2300.00 -> 3200.00)."""
+    dollars = cents // 100
+    digits = np.floor(np.log10(np.maximum(dollars, 1))).astype(int)
+    scale = 10 ** np.maximum(digits - 1, 0)
+    lead, second = dollars // (scale * 10), (dollars // scale) % 10
+    swapped = (second * 10 + lead) * scale + dollars % scale
+    changed = (digits >= 1) & (lead != second)
+    return np.where(changed, swapped * 100 + cents % 100, cents + 100_00)
+
+
+def account_names(n_accounts):
+    return np.array([f"ACCT{i:05d}" for i in range(n_accounts)])
+
+
+def generate_files(n_rows, seed=0, mix=None, n_vendors=None, n_accounts=None, account_skew=1.2):
+    """Return (df_cust, df_bank, scenarios) with about `n_rows` presented checks.
+
+    `scenarios` is aligned with df_bank and names the scenario of each row
+    ("match" for clean items). With `n_accounts`, both files get an Account
+    column; account sizes follow a Zipf-like law (`account_skew`), so the
+    first account is much larger than the last, as in a commercial book.
+    """
+    rng = np.random.default_rng(seed)
+    mix = DEFAULT_MIX if mix is None else mix
+    vendors = vendor_names(n_vendors or max(10, n_rows // 20), rng).to_numpy()
+
+    checks = 100_000 + np.arange(n_rows)
+    cents = np.clip((np.exp(rng.normal(4.5, 1.5, n_rows)) * 100).astype(np.int64), 100, 5_000_000)
+    payees = vendors[rng.integers(0, len(vendors), n_rows)]
+
+    names = np.array(["match", *mix])
+    probs = np.array([1 - sum(mix.values()), *mix.values()])
+    scenario = names[rng.choice(len(names), n_rows, p=probs)]
+
+    issued_cents, issued_payee = cents.copy(), payees.copy()
+    paid_checks, paid_cents, paid_payee = checks.copy(), cents.copy(), payees.copy()
+
+    def pick(name):
+        return scenario == name
+
+    forged = pick("forgery")
+    paid_checks[forged] += 50_000_000
+    paid_payee[forged] = vendors[rng.integers(0, len(vendors), forged.sum())]
+
+    paid_cents[pick("transposition")] = _transpose_cents(cents[pick("transposition")])
+    paid_cents[pick("inflation")] = cents[pick("inflation")] * 10
+    drift = pick("cents_drift")
+    paid_cents[drift] = cents[drift] + rng.integers(1, 100, drift.sum())
+    paid_cents[pick("digit_swap")] = _swap_leading_digits(cents[pick("digit_swap")])
+
+    swap = pick("payee_swap")
+    paid_payee[swap] = rng.choice(SWAP_PAYEES, swap.sum())
+    suffix = pick("payee_suffix")
+    issued_payee[suffix] = issued_payee[suffix] + " " + rng.choice(SUFFIXES[:3], suffix.sum())
+    paid_payee[suffix] = payees[suffix] + " " + rng.choice(SUFFIXES[3:], suffix.sum())
+    typo = pick("payee_typo")
+    paid_payee[typo] = pd.Series(payees[typo], dtype=object).str.replace(" ", "s ", n=1).str.slice(0, -2).to_numpy()
+
+    void = pick("void_presented")
+    issued_cents[void] = 0
+    issued_payee[void] = "VOID"
+
+    df_cust = pd.DataFrame({"Check #": checks, "Amount": issued_cents / 100, "Payee": issued_payee})
+    # Forged checks have no register entry for their (shifted) number; keep the original issued row.
+    df_bank = pd.DataFrame({"Check #": paid_checks, "Amount": paid_cents / 100, "Payee": paid_payee})
+    if n_accounts:
+        weights = 1.0 / np.arange(1, n_accounts + 1) ** account_skew
+        accounts = account_names(n_accounts)[rng.choice(n_accounts, n_rows, p=weights / weights.sum())]
+        df_cust.insert(0, "Account", accounts)
+        df_bank.insert(0, "Account", accounts)
+    order = rng.permutation(n_rows)
+    return df_cust, df_bank.iloc[order].reset_index(drop=True), pd.Series(scenario[order], name="Scenario")
+
+
+# --- NATIVE BANK FORMATS (inputs for bank_formats readers) ---
+def to_bai2(df_bank, account="000123456789", as_of="261017"):
+    """A BAI2 file with one 16 record (type 475, check paid) per presented check."""
+    details = ("16,475," + to_cents(df_bank["Amount"]).astype(str) + ",0,"
+               + pd.Series(np.arange(len(df_bank)), dtype=str) + "," + df_bank["Check #"].astype(str) + ",/")
+    lines = [
+        f"01,BANK,CUSTOMER,{as_of},0600,1,,,2/",
+        f"02,CUSTOMER,BANK,1,{as_of},0600,USD,2/",
+        f"03,{account},USD,/",
+        *details,
+        f"49,{to_cents(df_bank['Amount']).sum()},{len(details) + 2}/",
+        "98,0,1,0/",
+        "99,0,1,0/",
+    ]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _x937_record(text, encoding):
+    body = text.encode(encoding) if isinstance(text, str) else text
+    return len(body).to_bytes(4, "big") + body
+
+
+def to_x937(df_bank, image_bytes=2048, encoding="ascii"):
+    """An X9.37 cash letter: file header, then a type 25 record and a front image (52) per check."""
+    image = b"\x00" * image_bytes
+    parts = [_x937_record("01" + " " * 78, encoding)]
+    for check, cents in zip(df_bank["Check #"].astype(str), to_cents(df_bank["Amount"])):
+        parts.append(_x937_record(
+            f"25{check:>15}1{'01100001':8}5{'123456789/':>20}{cents:010d}{'':15}G11Y01B0", encoding))
+        header = f"52{'011000015':9}{'20261017':8}01{'':15}{'':48}0{'':16}{0:04d}{0:05d}{image_bytes:07d}"
+        parts.append(_x937_record(header.encode(encoding) + image, encoding))
+    return b"".join(parts)
+
+
+def to_issue_file(df_cust, account="123456789012", issue_date="20261017"):
+    """A fixed-width issue file in bank_formats.ISSUE_LAYOUT."""
+    voided = df_cust["Payee"].astype(str).str.upper().eq("VOID")
+    lines = (account[:12].rjust(12, "0")
+             + df_cust["Check #"].astype(str).str.zfill(10)
+             + to_cents(df_cust["Amount"]).astype(str).str.zfill(10)
+             + issue_date
+             + np.where(voided, "V", " ")
+             + df_cust["Payee"].astype(str).str.slice(0, 50).str.ljust(50))
+    return ("\n".join(lines) + "\n").encode()
+
+
+def to_nacha(debits, effective="261017"):
+    """A NACHA file with one batch per (Vendor, ID, SEC Code) and a debit entry (27) per row."""
+    lines = ["101 011000015 1234567892610170600A094101BANK                   CUSTOMER               ".ljust(94)]
+    sec = debits["SEC Code"] if "SEC Code" in debits else pd.Series("PPD", index=debits.index)
+    for batch, ((vendor, company_id, code), group) in enumerate(debits.groupby(["Vendor", "ID", sec], sort=False), 1):
+        lines.append(f"5225{vendor[:16]:<16}{'':20}{company_id[:10]:<10}{code:<3}{'DEBIT':<10}{'':6}{effective}{'':3}"
+                     f"1{'01100001':8}{batch:07d}".ljust(94))
+        for sequence, cents in enumerate(to_cents(group["Amount"])):
+            lines.append(f"627{'01100001':8}1{'123456789':<17}{cents:010d}{sequence:<15}{'RECEIVER':<22}  0"
+                         f"{'01100001':8}{sequence:07d}")
+        lines.append(f"8225{len(group):06d}".ljust(94))
+    lines.append("9".ljust(94, "9"))
+    return ("\n".join(lines) + "\n").encode()
@@ -0,0 +1,26 @@
+from bank_formats import read_x937_chunks
+
+
+def record(text):
+    body = text.encode("ascii") if isinstance(text, str) else text
+    return len(body).to_bytes(4, "big") + body
+
+
+def test_x937_image_is_located_from_a_spec_layout_type_52_record():
+    image = b"\xff\xd8IMAGE\xff\xd9"
+    check_detail = ("25" + "1001".rjust(15) + "1" + "01100001" + "5" + "123456789/".rjust(20)
+                    + "0000012500" + "000000000000042" + "G11Y01B0")
+    image_view = (
+        "52" + "011000015" + "20261017" + "01" + "000000000000042"  # fields 1-5
+        + " " * 48 + "0" + " " * 16                                 # fields 6-13: security, clipping
+        + "0003" + "KEY"                                            # fields 14-15: 4-digit key length, key
+        + "00002" + "SG"                                            # fields 16-17: signature length, signature
+        + f"{len(image):07d}"                                       # field 18: image data length
+    ).encode("ascii") + image
+    data = record("01" + " " * 78) + record(check_detail) + record(image_view)
+
+    (chunk,) = read_x937_chunks(data)
+    assert chunk["Check #"].tolist() == ["1001"]
+    assert chunk["Amount Cents"].tolist() == [12_500]
+    offset, length = int(chunk["Image Offset"][0]), int(chunk["Image Length"][0])
+    assert data[offset:offset + length] == image
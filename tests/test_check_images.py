@@ -0,0 +1,34 @@
+import io
+
+import pandas as pd
+from PIL import Image
+
+from check_images import CheckImageService
+from reconciliation import check_ids
+
+
+def test_colour_jpeg_thumbnails_keep_their_colour(tmp_path):
+    Image.new("RGB", (2400, 1100), (200, 30, 30)).save(tmp_path / "1001_front.jpg", quality=90)
+    service = CheckImageService(str(tmp_path), thumb_width=300)
+
+    with Image.open(io.BytesIO(service.thumbnail("1001"))) as thumb:
+        assert thumb.mode == "RGB"
+        assert thumb.width == 300
+        red, green, blue = thumb.getpixel((150, 60))
+    assert red > 150 and green < 80 and blue < 80
+
+
+def test_accounts_with_the_same_check_number_keep_their_own_images(tmp_path):
+    Image.new("RGB", (600, 300), (200, 30, 30)).save(tmp_path / "ACCT1_1001_front.png")
+    Image.new("RGB", (600, 300), (30, 30, 200)).save(tmp_path / "ACCT2_1001_front.png")
+    service = CheckImageService(str(tmp_path), thumb_width=300)
+    df_page = pd.DataFrame({"Account": ["ACCT1", "ACCT2"], "Check #": ["1001", "1001"]})
+
+    assert service.prefetch(check_ids(df_page), sides=("front",)) == 2
+    service._pool.shutdown(wait=True)
+    assert service.stats()["entries"] == 2
+    colours = []
+    for check_id in check_ids(df_page):
+        with Image.open(io.BytesIO(service.thumbnail(check_id))) as thumb:
+            colours.append(thumb.getpixel((150, 75)))
+    assert colours[0][0] > 150 and colours[1][2] > 150
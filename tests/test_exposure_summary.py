@@ -0,0 +1,21 @@
+import pandas as pd
+
+from exposure_summary import ExposureSummary
+from reconciliation import tag_presentments
+
+
+def exceptions(checks, paid_key, cents=100):
+    df = pd.DataFrame({"Check #": checks, "Amount Cents": cents, "Reason": "FORGERY: Not in Register"})
+    return tag_presentments(df, paid_key)
+
+
+def test_a_second_paid_file_on_the_same_day_keeps_the_first(tmp_path):
+    summary = ExposureSummary(str(tmp_path / "decisions.db"))
+    summary.record_exceptions(exceptions(["1", "2"], "morning"), "morning")
+    summary.record_exceptions(exceptions(["3"], "afternoon"), "afternoon")
+    assert summary.overview()["items"] == 3
+
+    # A corrected morning file only replaces the morning items.
+    summary.record_exceptions(exceptions(["1"], "morning"), "morning")
+    assert sorted(summary.items()["Item"]) == ["recon_1@morning", "recon_3@afternoon"]
+
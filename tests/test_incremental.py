@@ -0,0 +1,64 @@
+import random
+
+import pandas as pd
+
+from incremental import IncrementalReconciler, changed_items
+from reconciliation import tag_presentments
+
+HEADER = "Check #,Amount,Payee"
+
+
+def csv(rows):
+    return "\n".join([HEADER, *(f"{check},{amount},{payee}" for check, amount, payee in rows)]).encode()
+
+
+def book(rng, n):
+    # Few check numbers and payees, so duplicates and repeated lines are common.
+    return [(str(rng.randrange(n)), f"{rng.randrange(1, 4)}.00", rng.choice(["Acme", "Globex"])) for _ in range(n)]
+
+
+def edit(rng, rows):
+    rows = list(rows)
+    for _ in range(rng.randrange(1, 4)):
+        op = rng.randrange(3)
+        if op == 0 and rows:
+            rows.pop(rng.randrange(len(rows)))
+        elif op == 1:
+            rows.insert(rng.randrange(len(rows) + 1), book(rng, 1)[0])
+        elif rows:
+            check, _, payee = rows.pop(rng.randrange(len(rows)))
+            rows.insert(rng.randrange(len(rows) + 1), (check, f"{rng.randrange(1, 4)}.50", payee))
+    return rows
+
+
+def ordered(exceptions):
+    tagged = tag_presentments(exceptions, "key")
+    return tagged.sort_values(["Check #", "Presentment"]).reset_index(drop=True)[
+        ["Check #", "Payee", "Amount Cents", "Reason", "Presentment"]
+    ]
+
+
+def test_corrections_match_a_full_run():
+    rng = random.Random(7)
+    for _ in range(30):
+        cust, bank = book(rng, 12), book(rng, 12)
+        reconciler = IncrementalReconciler()
+        reconciler.update_bytes(csv(cust), csv(bank))
+        cust, bank = edit(rng, cust), edit(rng, bank)
+        incremental = reconciler.update_bytes(csv(cust), csv(bank), correction=True)
+        full = IncrementalReconciler().update_bytes(csv(cust), csv(bank))
+        pd.testing.assert_frame_equal(ordered(incremental), ordered(full))
+
+
+def test_a_new_upload_is_reconciled_in_full():
+    reconciler = IncrementalReconciler()
+    reconciler.update_bytes(csv([("1", "1.00", "Acme")]), csv([("1", "1.00", "Acme")]))
+    reconciler.update_bytes(csv([("1", "1.00", "Acme")]), csv([("1", "2.00", "Acme")]))
+    assert len(reconciler.last_affected) == 0
+
+
+def test_only_changed_items_are_forgotten():
+    previous = pd.DataFrame({"Check #": ["1", "2", "3"], "Amount Cents": [100, 200, 300],
+                             "Reason": ["FORGERY: Not in Register"] * 3, "Presentment": "key"})
+    current = previous.iloc[[0, 1]].assign(**{"Amount Cents": [100, 250]})
+    assert changed_items(previous, current).tolist() == ["recon_2@key", "recon_3@key"]
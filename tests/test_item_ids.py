@@ -0,0 +1,24 @@
+import pandas as pd
+
+from reconciliation import item_ids, paid_file_key, tag_presentments
+
+
+def exceptions(checks, accounts=None):
+    df = pd.DataFrame({"Check #": checks, "Amount Cents": range(len(checks))})
+    return df if accounts is None else df.assign(Account=accounts)
+
+
+def test_a_check_presented_in_another_paid_file_gets_a_new_id():
+    first = item_ids(tag_presentments(exceptions(["1010"]), paid_file_key(b"monday")))
+    again = item_ids(tag_presentments(exceptions(["1010"]), paid_file_key(b"tuesday")))
+    assert first[0] != again[0]
+
+
+def test_repeats_within_one_paid_file_get_distinct_ids():
+    ids = item_ids(tag_presentments(exceptions(["1", "2", "1", "1"]), "key"))
+    assert ids.tolist() == ["recon_1@key", "recon_2@key", "recon_1@key.2", "recon_1@key.3"]
+
+
+def test_ids_are_qualified_by_account():
+    ids = item_ids(tag_presentments(exceptions(["1", "1"], accounts=["A", "B"]), "key"))
+    assert ids.tolist() == ["recon_A_1@key", "recon_B_1@key"]
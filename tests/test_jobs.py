@@ -0,0 +1,36 @@
+import time
+
+import pandas as pd
+
+from jobs import DONE, FAILED, JobManager
+
+
+def wait(job):
+    while not job.done:
+        time.sleep(0.01)
+    return job
+
+
+def test_a_failed_job_is_reported_until_it_is_retried():
+    calls = []
+
+    def fail(job):
+        calls.append(job)
+        raise ValueError("blank Amount")
+
+    manager = JobManager(workers=1)
+    job = wait(manager.submit("key", fail))
+    assert job.status == FAILED
+    assert manager.submit("key", fail) is job
+    assert len(calls) == 1
+
+    retried = wait(manager.submit("key", fail, retry=True))
+    assert retried is not job and len(calls) == 2
+
+
+def test_a_retry_does_not_repeat_a_finished_job():
+    result = pd.DataFrame({"Check #": ["1"]})
+    manager = JobManager(workers=1)
+    job = wait(manager.submit("key", lambda job: result))
+    assert job.status == DONE
+    assert manager.submit("key", lambda job: result, retry=True) is job
@@ -0,0 +1,30 @@
+import pytest
+
+from payee_match import PayeeMatcher
+
+
+@pytest.mark.parametrize("issued, presented", [
+    ("Acme Corp", "ACME, Inc."),
+    ("The Home Depot", "Home Depot"),
+    ("Smith & Co", "Smith"),
+    ("Widget Co Inc", "Widget"),
+])
+def test_suffix_only_differences_score_one(issued, presented):
+    assert PayeeMatcher().score([issued], [presented])[0] == 1.0
+
+
+@pytest.mark.parametrize("issued, presented", [
+    ("PC Richard & Son", "Richard & Son"),
+    ("Company Store", "Store"),
+    ("Co-Op Bank", "Op Bank"),
+    ("The Limited Store", "Store"),
+    ("NA Holdings", "Holdings"),
+])
+def test_suffix_tokens_inside_a_name_are_kept(issued, presented):
+    assert PayeeMatcher().score([issued], [presented])[0] < 1.0
+
+
+def test_a_name_made_only_of_suffix_tokens_is_kept():
+    matcher = PayeeMatcher()
+    assert matcher.normalize(["The Company"]).tolist() == ["company"]
+    assert matcher.normalize(["Co"]).tolist() == ["co"]
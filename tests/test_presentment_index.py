@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from presentment_index import PresentmentIndex, merge_anomalies
+from reconciliation import find_exceptions, prepare_register
+
+
+def test_a_duplicate_keeps_the_first_presentments_amount_mismatch(tmp_path):
+    register = prepare_register(pd.DataFrame({"Check #": ["1001"], "Amount": ["90.00"], "Payee": ["Acme"]}))
+    presented = pd.DataFrame({"Check #": ["1001", "1001"], "Amount Cents": [10_000, 10_000], "Payee": ["Acme", "Acme"]})
+    exceptions = find_exceptions(register, presented)
+    anomalies = PresentmentIndex(str(tmp_path / "presentments.db")).screen(presented, register)
+
+    merged = merge_anomalies(exceptions, anomalies)
+    assert sorted(merged["Reason"]) == ["AMT MISMATCH: (Issued $90.00)", "DUPLICATE: Presented earlier in this file"]
+
+
+def test_an_anomaly_replaces_the_exception_of_its_own_presentment():
+    exceptions = pd.DataFrame({"Check #": ["7", "7"], "Payee": ["Acme", "Bob"], "Amount Cents": [500, 700],
+                               "Reason": ["AMT MISMATCH: (Issued $4.00)"] * 2, "Payee Score": np.nan})
+    anomalies = exceptions.iloc[[1]].assign(Reason="DUPLICATE: Presented earlier in this file")
+    merged = merge_anomalies(exceptions, anomalies)
+    assert merged[["Payee", "Reason"]].values.tolist() == [
+        ["Bob", "DUPLICATE: Presented earlier in this file"], ["Acme", "AMT MISMATCH: (Issued $4.00)"],
+    ]
+
+
+def test_a_check_in_two_paid_files_on_the_same_day_is_a_duplicate(tmp_path):
+    index = PresentmentIndex(str(tmp_path / "presentments.db"))
+    register = prepare_register(pd.DataFrame({"Check #": ["1001"], "Amount": ["100.00"], "Payee": ["Acme"]}))
+    presented = pd.DataFrame({"Check #": ["1001"], "Amount Cents": [10_000], "Payee": ["Acme"]})
+    assert index.screen(presented, register, source="morning").empty
+    index.record(presented, source="morning")
+
+    # Re-screening the same file is idempotent; another file the same day is flagged.
+    assert index.screen(presented, register, source="morning").empty
+    afternoon = index.screen(presented, register, source="afternoon")
+    assert afternoon["Reason"].str.startswith("DUPLICATE: Previously presented on").tolist() == [True]
@@ -0,0 +1,23 @@
+import pandas as pd
+
+from reconciliation import find_exceptions, prepare_register
+from risk_scoring import risk_scores
+
+
+def test_amount_deviation_comes_from_the_issued_amount_not_the_reason_text():
+    register = prepare_register(pd.DataFrame({"Check #": ["1", "2"], "Amount": ["100.00", "100.00"], "Payee": ["Acme"] * 2}))
+    exceptions = find_exceptions(register, pd.DataFrame({
+        "Check #": ["1", "2"], "Amount Cents": [10_100, 100_000], "Payee": ["Acme"] * 2,
+    }))
+    reworded = exceptions.assign(Reason="AMT MISMATCH: register disagrees")
+    assert risk_scores(reworded).tolist() == risk_scores(exceptions).tolist()
+    small, tenfold = risk_scores(exceptions)
+    assert small < tenfold
+
+
+def test_a_negative_issued_amount_counts_as_a_full_deviation():
+    register = prepare_register(pd.DataFrame({"Check #": ["1"], "Amount": ["-50.00"], "Payee": ["Acme"]}))
+    exceptions = find_exceptions(register, pd.DataFrame({"Check #": ["1"], "Amount Cents": [5_000], "Payee": ["Acme"]}))
+    assert exceptions["Issued Cents"].tolist() == [-5_000]
+    full = exceptions.assign(**{"Issued Cents": pd.array([500], dtype="Int64")})
+    assert risk_scores(exceptions).tolist() == risk_scores(full).tolist()